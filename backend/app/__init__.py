@@ -1,4 +1,78 @@
+from importlib import import_module
+import os
+from time import perf_counter
+from typing import Optional
 
+# Cold-start budget for create_app(), measured in a fresh interpreter and including the
+# import of Flask. Model modules, pymongo and the views are imported on first request
+# and the Mongo client is created on first use, so they are not part of the budget.
+# tests/test_app.py keeps create_app() under it.
+COLD_START_BUDGET_SECONDS = 1.0
 
-def create_app():
-    pass
+
+def _import(module_name: str, profile: Optional[dict]):
+    '''
+    Imports a module, recording its import time in the startup profile if there is one.
+    '''
+    start = perf_counter()
+    module = import_module(module_name)
+    if profile is not None:
+        profile[module_name] = perf_counter() - start
+    return module
+
+
+def create_app(config: Optional[dict] = None):
+    '''
+    Creates the Flask application.
+
+    Set PROFILE_STARTUP in the config (or the DISH_DASH_PROFILE_STARTUP environment
+    variable) to record the import time of each module loaded during start-up and on
+    the first requests in app.extensions['startup_profile'].
+
+    Set API_MODE (or DISH_DASH_API_MODE) to 'async' to serve the api with async views,
+    which await database calls on a thread pool of DB_THREADS threads. Serve them from
+    an ASGI server with app.asgi.create_asgi_app, so requests waiting on the database
+    hold no worker. Under a WSGI server Flask runs each async view to completion in an
+    event loop of its own, holding the request's worker while the view awaits.
+
+    Set METRICS (or DISH_DASH_METRICS) to time the model operations and the requests,
+    served for Prometheus on /metrics. When it is not set nothing is timed.
+
+    Args:
+        config (dict): Config values overriding the defaults.
+
+    Returns:
+        Flask: The application.
+    '''
+    start = perf_counter()
+    profile = {} if (config or {}).get('PROFILE_STARTUP', os.environ.get('DISH_DASH_PROFILE_STARTUP')) else None
+    flask = _import('flask', profile)
+
+    app = flask.Flask(__name__)
+    app.config.update(
+        # A database object to use instead of the shared client, e.g. for tests
+        MONGO_DATABASE=None,
+        PROFILE_STARTUP=profile is not None,
+        API_MODE=os.environ.get('DISH_DASH_API_MODE', 'sync'),
+        DB_THREADS=int(os.environ.get('DISH_DASH_DB_THREADS', '32')),
+        METRICS=bool(os.environ.get('DISH_DASH_METRICS')),
+        # Signs the session tokens, sessions are unavailable without it
+        SECRET_KEY=os.environ.get('DISH_DASH_SECRET_KEY'),
+        SESSION_MAX_AGE=int(os.environ.get('DISH_DASH_SESSION_MAX_AGE', '3600')),
+        SESSION_CACHE_SIZE=10000,
+    )
+    app.config.update(config or {})
+    app.extensions['startup_profile'] = profile
+
+    if app.config['API_MODE'] not in ('sync', 'async'):
+        raise ValueError(f'Invalid API_MODE: {app.config["API_MODE"]}')
+    api = _import('app.api', profile)
+    app.register_blueprint(api.async_api if app.config['API_MODE'] == 'async' else api.api)
+    if app.config['METRICS']:
+        _import('app.metrics', profile).init_app(app)
+
+    if profile is not None:
+        profile['create_app'] = perf_counter() - start
+        app.logger.info('Startup profile: %s', ', '.join(f'{name}={seconds * 1000:.1f}ms'
+                                                        for name, seconds in profile.items()))
+    return app
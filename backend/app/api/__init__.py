@@ -0,0 +1,69 @@
+from importlib import import_module
+from time import perf_counter
+from flask import Blueprint, current_app
+
+
+class LazyView:
+    '''
+    This class is a view that imports its module on the first request it handles.
+
+    Attributes:
+        import_name (str): The dotted path of the view function.
+    '''
+
+    def __init__(self, import_name: str) -> None:
+        self.import_name = import_name
+        self.module_name = import_name.rsplit('.', 1)[0]
+        self.import_seconds = 0.0
+        self._view = None
+
+    @property
+    def view(self):
+        if self._view is None:
+            start = perf_counter()
+            module = import_module(self.module_name)
+            self.import_seconds = perf_counter() - start
+            self._view = getattr(module, self.import_name.rsplit('.', 1)[1])
+        return self._view
+
+    def __call__(self, *args, **kwargs):
+        view = self.view
+        # Views are shared by all apps in the process, record the import time in each app's profile
+        profile = current_app.extensions.get('startup_profile')
+        if profile is not None and self.module_name not in profile:
+            profile[self.module_name] = self.import_seconds
+        return current_app.ensure_sync(view)(*args, **kwargs)
+
+
+# Rules with the dotted paths of their sync and async views, and their url rule options
+ROUTES = [
+    ('/health', 'app.api.health.health', 'app.api.health.health'),
+    ('/recipes/<recipe_id>', 'app.api.recipes.get_recipe', 'app.api.async_views.get_recipe'),
+    ('/users/<user_id>/recipes', 'app.api.recipes.list_recipes', 'app.api.async_views.list_recipes'),
+    ('/users/<user_id>/menus', 'app.api.menus.list_menus', 'app.api.async_views.list_menus'),
+    ('/users/<user_id>/menus/<menu_date>', 'app.api.menus.get_menu', 'app.api.async_views.get_menu'),
+    ('/users/<user_id>/menus/<menu_date>/changes', 'app.api.menus.get_menu_changes',
+     'app.api.async_views.get_menu_changes'),
+    ('/users/<user_id>/overview', 'app.api.menus.overview', 'app.api.async_views.overview'),
+    # Logging in is bound by bcrypt, the async api serves the sessions with the same views
+    ('/sessions', 'app.api.sessions.login', 'app.api.sessions.login', {'methods': ['POST']}),
+    ('/sessions', 'app.api.sessions.logout', 'app.api.sessions.logout', {'methods': ['DELETE']}),
+    ('/me', 'app.api.sessions.me', 'app.api.sessions.me'),
+]
+
+# The sync api runs database calls in the request's worker, the async api awaits
+# them on a bounded thread pool (see app.db.run_db), served without workers by app.asgi
+api = Blueprint('api', __name__)
+async_api = Blueprint('async_api', __name__)
+
+
+def add_lazy_url_rule(blueprint: Blueprint, rule: str, import_name: str, **options) -> None:
+    '''
+    Registers a view on a blueprint without importing it.
+    '''
+    blueprint.add_url_rule(rule, endpoint=import_name.rsplit('.', 1)[1], view_func=LazyView(import_name), **options)
+
+
+for _rule, _sync_view, _async_view, *_options in ROUTES:
+    add_lazy_url_rule(api, _rule, _sync_view, **dict(*_options))
+    add_lazy_url_rule(async_api, _rule, _async_view, **dict(*_options))
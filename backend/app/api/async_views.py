@@ -0,0 +1,78 @@
+import asyncio
+from bson import ObjectId
+from flask import abort, request
+from app.api.menus import _changes_response, _menu_response, _parse_date, _parse_version
+from app.db import get_db, run_db, to_json
+from app.repositories.menu import MenuRepository
+from app.repositories.recipe import RecipeRepository
+
+
+async def get_recipe(recipe_id: str):
+    '''
+    Returns the full recipe with the given id.
+    '''
+    if not ObjectId.is_valid(recipe_id):
+        abort(404)
+    recipe = await run_db(RecipeRepository(get_db()).find_by_id, recipe_id)
+    if recipe is None:
+        abort(404)
+    return to_json(recipe)
+
+
+async def list_recipes(user_id: str):
+    '''
+    Returns a summary of the user's recipes.
+    '''
+    recipes = await run_db(RecipeRepository(get_db()).list_by_user, user_id)
+    return [to_json(recipe) for recipe in recipes]
+
+
+async def list_menus(user_id: str):
+    '''
+    Returns a summary of the user's menus, optionally between the start and end query dates.
+    '''
+    start, end = request.args.get('start'), request.args.get('end')
+    menus = await run_db(
+        MenuRepository(get_db()).list_for_user,
+        user_id,
+        _parse_date(start) if start else None,
+        _parse_date(end) if end else None
+    )
+    return [to_json(menu) for menu in menus]
+
+
+async def get_menu(user_id: str, menu_date: str):
+    '''
+    Returns the user's full menu for the date.
+    '''
+    menu = await run_db(MenuRepository(get_db()).find, user_id, _parse_date(menu_date))
+    if menu is None:
+        abort(404)
+    return _menu_response(menu)
+
+
+async def get_menu_changes(user_id: str, menu_date: str):
+    '''
+    Returns the JSON Patch from the version in the since query argument to the current
+    version of the menu, or the full menu if the patch is no longer kept.
+    '''
+    since = _parse_version(request.args.get('since'))
+    changes = await run_db(MenuRepository(get_db()).changes_since, user_id, _parse_date(menu_date), since)
+    if changes is None:
+        abort(404)
+    return _changes_response(changes)
+
+
+async def overview(user_id: str):
+    '''
+    Returns a summary of the user's recipes and menus, reading both at the same time.
+    '''
+    database = get_db()
+    recipes, menus = await asyncio.gather(
+        run_db(RecipeRepository(database).list_by_user, user_id),
+        run_db(MenuRepository(database).list_for_user, user_id)
+    )
+    return {
+        'recipes': [to_json(recipe) for recipe in recipes],
+        'menus': [to_json(menu) for menu in menus],
+    }
@@ -0,0 +1,5 @@
+def health():
+    '''
+    Reports that the application is up, without touching the database.
+    '''
+    return {'status': 'ok'}
@@ -0,0 +1,90 @@
+from datetime import date
+from flask import abort, jsonify, make_response, request
+from app.db import get_db, to_json
+from app.repositories.menu import MenuRepository
+from app.repositories.recipe import RecipeRepository
+
+
+def _parse_date(value: str) -> date:
+    '''
+    Parses an ISO date from the request, responding with 400 if it is invalid.
+    '''
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        abort(400, f'Invalid date: {value}')
+
+
+def list_menus(user_id: str):
+    '''
+    Returns a summary of the user's menus, optionally between the start and end query dates.
+    '''
+    start, end = request.args.get('start'), request.args.get('end')
+    menus = MenuRepository(get_db()).list_for_user(
+        user_id,
+        _parse_date(start) if start else None,
+        _parse_date(end) if end else None
+    )
+    return [to_json(menu) for menu in menus]
+
+
+def _parse_version(value) -> int:
+    '''
+    Parses the since query argument, responding with 400 if it is missing or invalid.
+    '''
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        abort(400, f'Invalid version: {value}')
+
+
+def _menu_response(menu: dict):
+    '''
+    Returns the menu with its version as the ETag, or 304 if the client already has that version.
+    '''
+    etag = str(menu.get('version', 0))
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = jsonify(to_json(menu))
+    response.set_etag(etag)
+    return response
+
+
+def _changes_response(changes: dict) -> dict:
+    if 'menu' in changes:
+        changes['menu'] = to_json(changes['menu'])
+    return changes
+
+
+def get_menu(user_id: str, menu_date: str):
+    '''
+    Returns the user's full menu for the date.
+    '''
+    menu = MenuRepository(get_db()).find(user_id, _parse_date(menu_date))
+    if menu is None:
+        abort(404)
+    return _menu_response(menu)
+
+
+def get_menu_changes(user_id: str, menu_date: str):
+    '''
+    Returns the JSON Patch from the version in the since query argument to the current
+    version of the menu, or the full menu if the patch is no longer kept.
+    '''
+    since = _parse_version(request.args.get('since'))
+    changes = MenuRepository(get_db()).changes_since(user_id, _parse_date(menu_date), since)
+    if changes is None:
+        abort(404)
+    return _changes_response(changes)
+
+
+def overview(user_id: str):
+    '''
+    Returns a summary of the user's recipes and menus, reading one after the other.
+    '''
+    database = get_db()
+    return {
+        'recipes': [to_json(recipe) for recipe in RecipeRepository(database).list_by_user(user_id)],
+        'menus': [to_json(menu) for menu in MenuRepository(database).list_for_user(user_id)],
+    }
@@ -0,0 +1,23 @@
+from bson import ObjectId
+from flask import abort
+from app.db import get_db, to_json
+from app.repositories.recipe import RecipeRepository
+
+
+def get_recipe(recipe_id: str):
+    '''
+    Returns the full recipe with the given id.
+    '''
+    if not ObjectId.is_valid(recipe_id):
+        abort(404)
+    recipe = RecipeRepository(get_db()).find_by_id(recipe_id)
+    if recipe is None:
+        abort(404)
+    return to_json(recipe)
+
+
+def list_recipes(user_id: str):
+    '''
+    Returns a summary of the user's recipes.
+    '''
+    return [to_json(recipe) for recipe in RecipeRepository(get_db()).list_by_user(user_id)]
@@ -0,0 +1,77 @@
+from functools import wraps
+import threading
+from flask import abort, current_app, g, request
+from app.db import get_db, to_json
+from app.models.user import User
+from app.repositories.user import UserRepository
+from app.services.sessions import Session, SessionManager
+
+_sessions_lock = threading.Lock()
+
+
+def get_sessions() -> SessionManager:
+    '''
+    Returns the app's session manager, created on first use from SECRET_KEY and SESSION_MAX_AGE.
+    '''
+    app = current_app._get_current_object()
+    sessions = app.extensions.get('sessions')
+    if sessions is None:
+        with _sessions_lock:
+            sessions = app.extensions.get('sessions')
+            if sessions is None:
+                sessions = app.extensions['sessions'] = SessionManager(
+                    app.config['SECRET_KEY'], max_age=app.config['SESSION_MAX_AGE'],
+                    cache_size=app.config['SESSION_CACHE_SIZE'])
+    return sessions
+
+
+def _bearer_token() -> str:
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    return token if scheme.lower() == 'bearer' else ''
+
+
+def login_required(view):
+    '''
+    Responds with 401 unless the request has a valid session token, and sets g.session.
+    '''
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        session = get_sessions().authenticate(_bearer_token())
+        if session is None:
+            abort(401)
+        g.session = session
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def login():
+    '''
+    Checks the email and password in the JSON body and returns a session token.
+    '''
+    body = request.get_json(silent=True) or {}
+    document = UserRepository(get_db()).find_by_email(body.get('user_email', ''), include_password=True)
+    token = get_sessions().login(User.from_dict(document), body.get('user_password', '')) if document else None
+    if token is None:
+        abort(401)
+    return {'token': token}, 201
+
+
+@login_required
+def logout():
+    '''
+    Revokes the request's session token.
+    '''
+    get_sessions().revoke(_bearer_token())
+    return '', 204
+
+
+@login_required
+def me():
+    '''
+    Returns the logged in user.
+    '''
+    session: Session = g.session
+    document = UserRepository(get_db()).find_by_email(session.user_email)
+    if document is None:
+        abort(401)
+    return to_json(document)
@@ -0,0 +1,139 @@
+import asyncio
+from io import BytesIO
+import sys
+from typing import Optional
+from flask import request_started
+
+
+def _environ(scope: dict, body: bytes) -> dict:
+    '''
+    Builds the WSGI environ Flask reads the request from, out of an ASGI http scope.
+    '''
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': (path[len(root_path):] if path.startswith(root_path) else path).encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'SERVER_NAME': scope['server'][0] if scope.get('server') else 'localhost',
+        'SERVER_PORT': str(scope['server'][1]) if scope.get('server') else '80',
+        'REMOTE_ADDR': scope['client'][0] if scope.get('client') else '',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', ()):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        key = name if name in ('CONTENT_LENGTH', 'CONTENT_TYPE') else f'HTTP_{name}'
+        value = value.decode('latin-1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+class AsgiApp:
+    '''
+    This class serves the async api of a Flask app to an ASGI server, e.g.
+    uvicorn 'app.asgi:create_asgi_app' --factory.
+
+    Under a WSGI server Flask runs each async view to completion in an event loop of
+    its own, holding the worker thread while the view awaits the database. Here the
+    views are awaited on the server's event loop instead, so a request waiting on
+    run_db holds no thread and one process serves many such requests at once. Sync
+    views, e.g. logging in with bcrypt, run on the default executor of the loop.
+
+    Flask's request hooks and error handlers run as they do under WSGI, in the task
+    of the request, as the request context is kept in context variables.
+
+    Attributes:
+        app (Flask): The application, created with API_MODE 'async'.
+    '''
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive, send) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(f'Unsupported ASGI scope type: {scope["type"]}')
+        body = bytearray()
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+        response = await self._respond(_environ(scope, bytes(body)))
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                        for name, value in response.headers.items()],
+        })
+        await send({'type': 'http.response.body', 'body': response.get_data()})
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                executor = self.app.extensions.get('db_executor')
+                if executor is not None:
+                    executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _respond(self, environ: dict):
+        '''
+        Dispatches the request like Flask.full_dispatch_request, awaiting async views.
+        '''
+        app = self.app
+        context = app.request_context(environ)
+        error: Optional[BaseException] = None
+        context.push()
+        try:
+            try:
+                request_started.send(app)
+                result = app.preprocess_request()
+                if result is None:
+                    result = await self._dispatch(context.request)
+            except Exception as exception:
+                result = app.handle_user_exception(exception)
+            return app.finalize_request(result)
+        except Exception as exception:
+            error = exception
+            return app.finalize_request(app.handle_exception(exception), from_error_handler=True)
+        finally:
+            context.pop(error)
+
+    async def _dispatch(self, request):
+        if request.routing_exception is not None:
+            raise request.routing_exception
+        view = self.app.view_functions[request.url_rule.endpoint]
+        # Lazy views wrap the view in ensure_sync, await the view function itself
+        view = getattr(view, 'view', view)
+        if asyncio.iscoroutinefunction(view):
+            return await view(**request.view_args)
+        # to_thread copies the context variables, so the view sees the request context
+        return await asyncio.to_thread(view, **request.view_args)
+
+
+def create_asgi_app(config: Optional[dict] = None) -> AsgiApp:
+    '''
+    Creates the application with the async api and wraps it for an ASGI server.
+
+    Args:
+        config (dict): Config values overriding the defaults, see app.create_app.
+
+    Returns:
+        AsgiApp: The ASGI application.
+    '''
+    from app import create_app
+    return AsgiApp(create_app({**(config or {}), 'API_MODE': 'async'}))
@@ -0,0 +1,52 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import threading
+from typing import Callable
+from flask import current_app
+from pymongo.database import Database
+from app.repositories.client import get_database
+
+
+def get_db() -> Database:
+    '''
+    Returns the database of the current app, the shared Mongo client is created on first use.
+    '''
+    database = current_app.config['MONGO_DATABASE']
+    return database if database is not None else get_database()
+
+
+_executor_lock = threading.Lock()
+
+
+def _db_executor(app) -> ThreadPoolExecutor:
+    executor = app.extensions.get('db_executor')
+    if executor is None:
+        with _executor_lock:
+            executor = app.extensions.get('db_executor')
+            if executor is None:
+                executor = app.extensions['db_executor'] = ThreadPoolExecutor(
+                    max_workers=app.config['DB_THREADS'], thread_name_prefix='dish-dash-db')
+    return executor
+
+
+async def run_db(function: Callable, *args, **kwargs):
+    '''
+    Runs a blocking database call on the app's database thread pool and awaits its result.
+
+    The pool is shared by all requests of the app and bounded by DB_THREADS, so at most
+    that many database calls run at once. Served by app.asgi, the view awaits the call
+    on the server's event loop and holds no thread meanwhile. Under a WSGI server the
+    request's worker stays blocked until the view returns.
+    '''
+    future = _db_executor(current_app._get_current_object()).submit(partial(function, *args, **kwargs))
+    return await asyncio.wrap_future(future)
+
+
+def to_json(document: dict) -> dict:
+    '''
+    Converts a stored document for a JSON response, turning its ObjectId into a string.
+    '''
+    if '_id' in document:
+        document['_id'] = str(document['_id'])
+    return document
@@ -0,0 +1,149 @@
+from functools import wraps
+from importlib import import_module
+import threading
+from time import perf_counter
+from typing import Callable, Dict, Optional, Tuple
+
+# The model operations timed when metrics are enabled, as (module, class, method)
+OPERATIONS = (
+    ('app.models.user', 'User', 'validate'),
+    ('app.models.user', 'User', 'to_dict'),
+    ('app.models.user', 'User', 'hash_password'),
+    ('app.models.user', 'User', 'check_password'),
+    ('app.models.ingredient', 'Ingredient', 'validate'),
+    ('app.models.ingredient', 'Ingredient', 'to_dict'),
+    ('app.models.recipe', 'Recipe', 'validate'),
+    ('app.models.recipe', 'Recipe', 'to_dict'),
+    ('app.models.menu', 'Menu', 'validate'),
+    ('app.models.menu', 'Menu', 'to_dict'),
+    ('app.models.menu', 'Menu', 'add_recipe'),
+    ('app.models.menu', 'Menu', 'remove_recipe'),
+)
+
+# Model operations take microseconds, except bcrypt which takes hundreds of milliseconds
+OPERATION_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2, 0.1, 0.25, 0.5, 1.0)
+
+
+class Metrics:
+    '''
+    This class holds the Prometheus metrics of the app in their own registry.
+
+    Attributes:
+        registry (CollectorRegistry): The registry served on /metrics.
+        operation_seconds (Histogram): The latency of model operations, by operation.
+        operation_calls (Counter): The calls of model operations, by operation and outcome.
+        request_seconds (Histogram): The latency of requests, by endpoint and method.
+        requests (Counter): The requests, by endpoint, method and status code.
+    '''
+
+    def __init__(self) -> None:
+        from prometheus_client import CollectorRegistry, Counter, Histogram
+        self.registry = CollectorRegistry()
+        self.operation_seconds = Histogram('dish_dash_operation_seconds', 'Latency of model operations.',
+                                           ['operation'], buckets=OPERATION_BUCKETS, registry=self.registry)
+        self.operation_calls = Counter('dish_dash_operation_calls', 'Calls of model operations.',
+                                       ['operation', 'outcome'], registry=self.registry)
+        self.request_seconds = Histogram('dish_dash_request_seconds', 'Latency of API requests.',
+                                         ['endpoint', 'method'], registry=self.registry)
+        self.requests = Counter('dish_dash_requests', 'API requests.',
+                                ['endpoint', 'method', 'status'], registry=self.registry)
+
+    def timed(self, operation: str, function: Callable) -> Callable:
+        '''
+        Returns function wrapped to record its latency and outcome under the operation name.
+        '''
+        # Resolve the labelled children once instead of on every call
+        observe = self.operation_seconds.labels(operation).observe
+        succeeded = self.operation_calls.labels(operation, 'ok').inc
+        failed = self.operation_calls.labels(operation, 'error').inc
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except BaseException:
+                failed()
+                raise
+            finally:
+                observe(perf_counter() - start)
+            succeeded()
+            return result
+
+        return wrapper
+
+
+_lock = threading.Lock()
+_metrics: Optional[Metrics] = None
+# The original methods replaced by timed wrappers, to restore them on disable()
+_originals: Dict[Tuple[type, str], Callable] = {}
+
+
+def get_metrics() -> Optional[Metrics]:
+    '''
+    Returns the process's metrics, or None if they are not enabled.
+    '''
+    return _metrics
+
+
+def enable() -> Metrics:
+    '''
+    Enables the metrics, replacing the model operations with timed wrappers.
+
+    While the metrics are disabled the models run their own methods unchanged, so the
+    instrumentation costs nothing. The wrappers are process wide, like the models.
+
+    Returns:
+        Metrics: The metrics, the same ones on every call until disable().
+    '''
+    global _metrics
+    with _lock:
+        if _metrics is None:
+            metrics = Metrics()
+            for module_name, class_name, method_name in OPERATIONS:
+                cls = getattr(import_module(module_name), class_name)
+                original = cls.__dict__[method_name]
+                _originals[cls, method_name] = original
+                setattr(cls, method_name, metrics.timed(f'{class_name}.{method_name}', original))
+            _metrics = metrics
+        return _metrics
+
+
+def disable() -> None:
+    '''
+    Disables the metrics, restoring the original model operations.
+    '''
+    global _metrics
+    with _lock:
+        for (cls, method_name), original in _originals.items():
+            setattr(cls, method_name, original)
+        _originals.clear()
+        _metrics = None
+
+
+def init_app(app) -> Metrics:
+    '''
+    Enables the metrics, times the app's requests and serves the metrics on /metrics.
+    '''
+    from flask import Response, g, request
+    from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+    metrics = enable()
+
+    @app.before_request
+    def start_timer():
+        g.metrics_start = perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        start = g.pop('metrics_start', None)
+        if start is not None:
+            endpoint = request.endpoint or 'unknown'
+            metrics.request_seconds.labels(endpoint, request.method).observe(perf_counter() - start)
+            metrics.requests.labels(endpoint, request.method, str(response.status_code)).inc()
+        return response
+
+    @app.route('/metrics')
+    def serve_metrics():
+        return Response(generate_latest(metrics.registry), mimetype=CONTENT_TYPE_LATEST)
+
+    return metrics
@@ -1,11 +1,30 @@
 from dataclasses import dataclass
+from typing import Iterator, Mapping
+from app.models.validation import raise_first_error
 
 
-@dataclass
+def _ingredient_errors(ingredient) -> Iterator[str]:
+    if not ingredient.name:
+        yield 'Ingredient name cannot be empty.'
+    if not isinstance(ingredient.quantity, str) or not ingredient.quantity:
+        yield 'Ingredient quantity must be a non-empty string.'
+
+
+def _ingredient_dict(ingredient) -> dict:
+    return {
+        'name': ingredient.name,
+        'quantity': ingredient.quantity
+    }
+
+
+@dataclass(slots=True)
 class Ingredient:
     '''
     This class represents an ingredient in a recipe.
 
+    Ingredients are slotted and hash by their content, so they can be used in sets and
+    as dictionary keys. Do not change an ingredient while it is stored in a set or dict.
+
     Attributes:
         name (str): The name of the ingredient.
         quantity (str): The amount of the ingredient.
@@ -13,6 +32,15 @@ class Ingredient:
     name: str
     quantity: str
 
+    def __hash__(self) -> int:
+        return hash((self.name, self.quantity))
+
+    def iter_errors(self) -> Iterator[str]:
+        '''
+        Yields the message of every invalid attribute.
+        '''
+        return _ingredient_errors(self)
+
     def validate(self) -> None:
         '''
         Validates the Ingredient attributes.
@@ -20,10 +48,7 @@ class Ingredient:
         Raises:
             ValueError: If any attribute is invalid.
         '''
-        if not self.name:
-            raise ValueError('Ingredient name cannot be empty.')
-        if not isinstance(self.quantity, str) or not self.quantity:
-            raise ValueError('Ingredient quantity must be a non-empty string.')
+        raise_first_error(self.iter_errors())
 
     def to_dict(self) -> dict:
         '''
@@ -31,7 +56,57 @@ class Ingredient:
         
         Returns:
             dict: A dictionary representation of the ingredient.        '''
-        return {
-            'name': self.name,
-            'quantity': self.quantity
-        }
+        return _ingredient_dict(self)
+
+    @classmethod
+    def from_dict(cls, document: Mapping) -> 'Ingredient':
+        '''
+        Creates an Ingredient from a dictionary made by to_dict.
+        '''
+        return cls(name=document['name'], quantity=document['quantity'])
+
+    def freeze(self) -> 'FrozenIngredient':
+        '''
+        Returns a read-only copy of the ingredient.
+        '''
+        return FrozenIngredient(name=self.name, quantity=self.quantity)
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenIngredient:
+    '''
+    This class represents a read-only ingredient, used for catalog data.
+
+    Attributes:
+        name (str): The name of the ingredient.
+        quantity (str): The amount of the ingredient.
+    '''
+    name: str
+    quantity: str
+
+    def iter_errors(self) -> Iterator[str]:
+        '''
+        Yields the message of every invalid attribute.
+        '''
+        return _ingredient_errors(self)
+
+    def validate(self) -> None:
+        '''
+        Validates the FrozenIngredient attributes.
+
+        Raises:
+            ValueError: If any attribute is invalid.
+        '''
+        raise_first_error(self.iter_errors())
+
+    def to_dict(self) -> dict:
+        '''
+        Converts the FrozenIngredient object to the same dictionary as Ingredient.to_dict.
+        '''
+        return _ingredient_dict(self)
+
+    def thaw(self) -> Ingredient:
+        '''
+        Returns an editable copy of the ingredient.
+        '''
+        return Ingredient(name=self.name, quantity=self.quantity)
@@ -1,8 +1,12 @@
-from datetime import date
+from collections import deque
+from datetime import date, datetime
 from dataclasses import dataclass, field
-from typing import List
+from typing import Callable, Deque, Dict, Iterator, List, Mapping, Optional, Tuple
 from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
 from app.models.recipe import Recipe
+from app.models.signals import menu_changed
+from app.models.validation import is_valid_object_id, raise_first_error, to_object_id
 
 
 @dataclass
@@ -10,34 +14,105 @@ class Menu:
     '''
     This class represents a menu.
 
+    The recipes list is the ordered view of the menu. Alongside it the menu keeps
+    an index from recipe title to the recipes with that title, so that adding,
+    removing and looking up recipes does not have to compare every recipe in the list.
+
+    The index is the source of truth for lookups: change the recipes through add_recipe
+    and remove_recipe, or assign a new list, which rebuilds the index. A recipe's title
+    must not change while it is in a menu, and changes made to the list in place are
+    not seen until the list is assigned again (menu.recipes += [...] does this).
+
+    The menu also records the recipes added and removed since it was last saved, so
+    they can be stored as a patch instead of rewriting the whole menu (see to_update
+    and to_json_patch). Assigning a list is recorded as a replacement of the list.
+
     Attributes:
         user_id (ObjectId): The id of the user who this menu belongs to.
         date (date): The date for which this menu is created.
         recipes (List[Recipe]): List of recipes in the menu.
+        version (int): The stored version the menu was read at, 0 if it is not stored.
     '''
     user_id: ObjectId
     date: date
     recipes: List[Recipe] = field(default_factory=list)
+    version: int = field(default=0, compare=False)
+    # The ('add', recipe), ('remove', recipe, position) and ('replace',) changes since the last save
+    _changes: List[tuple] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value) -> None:
+        super().__setattr__(name, value)
+        # Assigning a new recipes list invalidates the title index
+        if name == 'recipes':
+            self._reindex()
+            # The list assigned by __init__ is not a change, _changes does not exist yet then
+            changes = self.__dict__.get('_changes')
+            if changes is not None:
+                changes.append(('replace',))
+
+    def __getstate__(self) -> dict:
+        # The positions are keyed by id(), which does not survive pickling, the index is rebuilt instead
+        state = dict(self.__dict__)
+        del state['_by_title'], state['_positions']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        '''
+        Rebuilds the title index and the recipe positions from the recipes list.
+        '''
+        by_title: Dict[str, Deque[Recipe]] = {}
+        positions: Dict[int, int] = {}
+        for position, recipe in enumerate(self.recipes):
+            by_title.setdefault(recipe.title, deque()).append(recipe)
+            positions[id(recipe)] = position
+        object.__setattr__(self, '_by_title', by_title)
+        # The last known position of each recipe, by identity. Removals before a recipe
+        # shift it left, so it is at or before that position (see _position).
+        object.__setattr__(self, '_positions', positions)
+
+    def _position(self, recipe: Recipe) -> int:
+        '''
+        Returns the position of the recipe in the list, searching back from its last known position.
+        '''
+        recipes = self.recipes
+        start = min(self._positions[id(recipe)], len(recipes) - 1)
+        position = next(i for i in range(start, -1, -1) if recipes[i] is recipe)
+        self._positions[id(recipe)] = position
+        return position
+
+    def iter_errors(self) -> Iterator[str]:
+        '''
+        Yields the message of every invalid attribute.
+        '''
+        # Check if the user_id is valid, the check of ObjectId strings is cached
+        if not is_valid_object_id(self.user_id):
+            yield f'Invalid ObjectId: {self.user_id}'
+
+        # Check that the date is a date, from_dict leaves other values as they were read
+        if not isinstance(self.date, date):
+            yield f'Invalid date: {self.date!r}'
+
+        # Ensure the recipes list is not empty
+        if not self.recipes:
+            yield 'Menu must have at least one recipe.'
 
     def validate(self) -> None:
         '''
         Validates the Menu attributes.
-        
+
         Raises:
             ValueError: If any attribute is invalid.
         '''
-        # Check if the user_id is valid
-        if not ObjectId.is_valid(self.user_id):
-            raise ValueError(f'Invalid ObjectId: {self.user_id}')
-        
-        # Ensure the recipes list is not empty
-        if not self.recipes:
-            raise ValueError('Menu must have at least one recipe.')
-            
+        raise_first_error(self.iter_errors())
+
     def to_dict(self) -> dict:
         '''
         Converts the Menu object to a dictionary.
-        
+
         Returns:
             dict: A dictionary representation of the menu.
         '''
@@ -47,21 +122,179 @@ class Menu:
             'recipes': [recipe.to_dict() for recipe in self.recipes]
         }
 
+    @classmethod
+    def from_dict(cls, document: Mapping, lazy: bool = False) -> 'Menu':
+        '''
+        Creates a Menu from a dictionary made by to_dict, or a document read from MongoDB.
+
+        Args:
+            document (Mapping): The stored menu.
+            lazy (bool): Whether the recipes only decode their ingredients and steps when
+                they are first accessed.
+
+        Returns:
+            Menu: The menu.
+        '''
+        menu_date = document['date']
+        if isinstance(menu_date, datetime):
+            menu_date = menu_date.date()
+        elif isinstance(menu_date, str):
+            menu_date = date.fromisoformat(menu_date)
+        return cls(
+            user_id=to_object_id(document['user_id']),
+            date=menu_date,
+            recipes=[Recipe.from_dict(recipe, lazy=lazy) for recipe in document.get('recipes', ())],
+            version=document.get('version', 0)
+        )
+
+    @classmethod
+    def from_bson(cls, data: bytes) -> 'Menu':
+        '''
+        Creates a Menu from raw BSON, the recipes' ingredients and steps are only decoded on access.
+        '''
+        return cls.from_dict(RawBSONDocument(data), lazy=True)
+
+    def __contains__(self, recipe: Recipe) -> bool:
+        '''
+        Checks if the recipe is in the menu, only comparing it to recipes with the same title.
+        '''
+        if id(recipe) in self._positions:
+            return True
+        return any(candidate == recipe for candidate in self._by_title.get(recipe.title, ()))
+
+    def has_recipe(self, recipe_title: str) -> bool:
+        '''
+        Checks if the menu has a recipe with the given title.
+        '''
+        return recipe_title in self._by_title
+
+    def get_recipe(self, recipe_title: str) -> Optional[Recipe]:
+        '''
+        Returns the first recipe in the menu with the given title, or None if there is none.
+        '''
+        candidates = self._by_title.get(recipe_title)
+        return candidates[0] if candidates else None
+
     def add_recipe(self, recipe: Recipe):
         '''
         Adds a recipe to the menu, ensures that the recipe is not already in the menu.
         '''
-        if recipe in self.recipes:
+        if recipe in self:
             raise ValueError(f'Recipe "{recipe.title}" is already in the menu.')
 
+        self._positions[id(recipe)] = len(self.recipes)
         self.recipes.append(recipe)
+        self._by_title.setdefault(recipe.title, deque()).append(recipe)
+        self._changes.append(('add', recipe))
+        menu_changed.send(self)
 
     def remove_recipe(self, recipe_title: str):
         '''
         Removes a recipe from the menu by its title, raises an error if the recipe is not found.
         '''
-        recipe_to_remove = next((recipe for recipe in self.recipes if recipe.title == recipe_title), None)
-        if recipe_to_remove:
-            self.recipes.remove(recipe_to_remove)
-        else:
-            raise ValueError(f'Recipe with title "{recipe_title}" not found in menu.')
\ No newline at end of file
+        candidates = self._by_title.get(recipe_title)
+        if not candidates:
+            raise ValueError(f'Recipe with title "{recipe_title}" not found in menu.')
+
+        recipe_to_remove = candidates.popleft()
+        if not candidates:
+            del self._by_title[recipe_title]
+        position = self._position(recipe_to_remove)
+        del self._positions[id(recipe_to_remove)]
+        del self.recipes[position]
+        self._changes.append(('remove', recipe_to_remove, position))
+        menu_changed.send(self)
+
+    @property
+    def has_changes(self) -> bool:
+        '''
+        Whether recipes were added, removed or replaced since the menu was last saved.
+        '''
+        return bool(self._changes)
+
+    def mark_saved(self, version: Optional[int] = None) -> None:
+        '''
+        Forgets the recorded changes once they are stored, and sets the stored version.
+        '''
+        self._changes.clear()
+        if version is not None:
+            self.version = version
+
+    def _net_changes(self) -> Optional[Tuple[List[Recipe], List[Recipe]]]:
+        '''
+        Returns the recipes added and the recipes removed by the recorded changes, leaving
+        out recipes that were added and removed again, or None if the list was replaced.
+        '''
+        added: List[Recipe] = []
+        removed: List[Recipe] = []
+        for change in self._changes:
+            if change[0] == 'replace':
+                return None
+            recipe = change[1]
+            if change[0] == 'add':
+                added.append(recipe)
+                continue
+            position = next((i for i, candidate in enumerate(added) if candidate is recipe), None)
+            if position is None:
+                removed.append(recipe)
+            else:
+                del added[position]
+        return added, removed
+
+    def saved_positions(self) -> Optional[List[Optional[int]]]:
+        '''
+        Returns, for each recipe of the list as it was last read or saved, its position in
+        the list now, or None if it was removed since. None if the list was replaced.
+        '''
+        if any(change[0] == 'replace' for change in self._changes):
+            return None
+        removed = sum(change[0] == 'remove' for change in self._changes)
+        saved_length = len(self.recipes) - (len(self._changes) - removed) + removed
+        # The saved position of each recipe in the list, None for the added ones
+        current: List[Optional[int]] = list(range(saved_length))
+        for change in self._changes:
+            if change[0] == 'add':
+                current.append(None)
+            else:
+                del current[change[2]]
+        saved: List[Optional[int]] = [None] * saved_length
+        for position, saved_position in enumerate(current):
+            if saved_position is not None:
+                saved[saved_position] = position
+        return saved
+
+    def to_update(self, encode: Callable[[Recipe], dict] = Recipe.to_dict) -> Optional[dict]:
+        '''
+        Returns a MongoDB update applying the recorded changes to the stored menu.
+
+        Added recipes are pushed and removed recipes are pulled. MongoDB cannot push and
+        pull the same array in one update, so when both happened, or the recipes list was
+        replaced, the update sets the whole list. It also does when the menu still has a
+        copy of a removed recipe, which a pull would remove too.
+
+        Args:
+            encode (Callable[[Recipe], dict]): Converts a recipe to its stored form.
+
+        Returns:
+            Optional[dict]: The update, or None if there are no changes or they cancel out.
+        '''
+        net = self._net_changes()
+        if net is not None:
+            added, removed = net
+            if not removed:
+                return {'$push': {'recipes': {'$each': [encode(recipe) for recipe in added]}}} if added else None
+            if not added and not any(recipe in self for recipe in removed):
+                return {'$pull': {'recipes': {'$in': [encode(recipe) for recipe in removed]}}}
+        return {'$set': {'recipes': [encode(recipe) for recipe in self.recipes]}}
+
+    def to_json_patch(self, encode: Callable[[Recipe], dict] = Recipe.to_dict) -> List[dict]:
+        '''
+        Returns the recorded changes as a JSON Patch (RFC 6902) of the menu's to_dict form.
+        '''
+        if any(change[0] == 'replace' for change in self._changes):
+            return [{'op': 'replace', 'path': '/recipes', 'value': [encode(recipe) for recipe in self.recipes]}]
+        return [
+            {'op': 'add', 'path': '/recipes/-', 'value': encode(change[1])} if change[0] == 'add'
+            else {'op': 'remove', 'path': f'/recipes/{change[2]}'}
+            for change in self._changes
+        ]
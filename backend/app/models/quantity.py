@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from functools import lru_cache
+import re
+from typing import Optional
+
+# Units converted to a base unit, with the factor to the base unit
+_UNITS = {
+    'gram': ('gram', 1.0), 'grams': ('gram', 1.0), 'g': ('gram', 1.0), 'gr': ('gram', 1.0),
+    'kg': ('gram', 1000.0), 'kilogram': ('gram', 1000.0), 'kilograms': ('gram', 1000.0),
+    'mg': ('gram', 0.001), 'oz': ('gram', 28.3495), 'ounce': ('gram', 28.3495), 'ounces': ('gram', 28.3495),
+    'lb': ('gram', 453.592), 'lbs': ('gram', 453.592), 'pound': ('gram', 453.592), 'pounds': ('gram', 453.592),
+    'ml': ('ml', 1.0), 'milliliter': ('ml', 1.0), 'milliliters': ('ml', 1.0),
+    'l': ('ml', 1000.0), 'liter': ('ml', 1000.0), 'liters': ('ml', 1000.0), 'litre': ('ml', 1000.0),
+    'litres': ('ml', 1000.0), 'cup': ('ml', 240.0), 'cups': ('ml', 240.0),
+    'tbs': ('ml', 15.0), 'tbsp': ('ml', 15.0), 'tablespoon': ('ml', 15.0), 'tablespoons': ('ml', 15.0),
+    'tsp': ('ml', 5.0), 'teaspoon': ('ml', 5.0), 'teaspoons': ('ml', 5.0),
+    's': ('minute', 1 / 60), 'sec': ('minute', 1 / 60), 'second': ('minute', 1 / 60), 'seconds': ('minute', 1 / 60),
+    'min': ('minute', 1.0), 'mins': ('minute', 1.0), 'minute': ('minute', 1.0), 'minutes': ('minute', 1.0),
+    'h': ('minute', 60.0), 'hr': ('minute', 60.0), 'hrs': ('minute', 60.0), 'hour': ('minute', 60.0),
+    'hours': ('minute', 60.0),
+}
+
+_QUANTITY_PATTERN = re.compile(r'\s*(?P<amount>\d+/\d+|\d+(?:[.,]\d+)?(?:\s+\d+/\d+)?)\s*(?P<unit>.*?)\.?\s*')
+
+
+@dataclass(frozen=True, slots=True)
+class Quantity:
+    '''
+    This class represents a parsed quantity, converted to its base unit.
+
+    Attributes:
+        amount (float): The amount in the base unit.
+        unit (str): The base unit ('gram', 'ml' or 'minute'), another unit such as
+            'slice' as written (lower case and singular), or '' for a plain count.
+    '''
+    amount: float
+    unit: str
+
+
+def _parse_amount(text: str) -> float:
+    amount = 0.0
+    for part in text.split():
+        if '/' in part:
+            numerator, denominator = part.split('/')
+            amount += int(numerator) / int(denominator)
+        else:
+            amount += float(part.replace(',', '.'))
+    return amount
+
+
+def _normalize_unit(unit: str) -> str:
+    unit = ' '.join(unit.casefold().split())
+    # Treat other units in the plural as the singular, e.g. slices -> slice
+    if len(unit) > 3 and unit.endswith('s') and not unit.endswith('ss'):
+        unit = unit[:-1]
+    return unit
+
+
+@lru_cache(maxsize=4096)
+def parse_quantity(text: str) -> Optional[Quantity]:
+    '''
+    Parses a free-form quantity such as '100 gram', '2 cups', '1 1/2 tsp' or '10 minutes'.
+
+    Quantities are cached, as the same strings come up in many ingredients.
+
+    Returns:
+        Quantity: The parsed quantity, or None if the text does not start with an amount.
+    '''
+    match = _QUANTITY_PATTERN.fullmatch(text)
+    if match is None:
+        return None
+    try:
+        amount = _parse_amount(match['amount'])
+    except ZeroDivisionError:
+        return None
+    unit = match['unit'].casefold()
+    if unit in _UNITS:
+        base_unit, factor = _UNITS[unit]
+        return Quantity(amount * factor, base_unit)
+    return Quantity(amount, _normalize_unit(unit))
+
+
+def parse_prep_time(text: str) -> Optional[float]:
+    '''
+    Parses a recipe prep time such as '10 minutes' or '1 hour' into minutes.
+
+    Returns:
+        float: The prep time in minutes, or None if it is not a time.
+    '''
+    quantity = parse_quantity(text)
+    return quantity.amount if quantity is not None and quantity.unit == 'minute' else None
@@ -1,14 +1,30 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import Iterator, List, Mapping, Optional, Tuple
 from bson import ObjectId
-from app.models.ingredient import Ingredient
+from bson.raw_bson import RawBSONDocument
+from app.models.ingredient import FrozenIngredient, Ingredient
+from app.models.validation import CATEGORIES, is_valid_object_id, raise_first_error, to_object_id
 
 
-@dataclass
+def _recipe_errors(recipe) -> Iterator[str]:
+    if not is_valid_object_id(recipe.user_id):
+        yield f'Invalid ObjectId: {recipe.user_id}'
+    if not recipe.title:
+        yield 'Title cannot be empty.'
+    if recipe.category not in CATEGORIES:
+        yield f'Invalid category: {recipe.category}'
+    if not recipe.ingredients:
+        yield 'Ingredients list cannot be empty.'
+
+
+@dataclass(slots=True)
 class Recipe:
     '''
     This class represents a recipe.
 
+    Recipes are slotted and hash by their content, so they can be used in sets and
+    as dictionary keys. Do not change a recipe while it is stored in a set or dict.
+
     Attributes:
         user_id (ObjectId): The user who created the recipe.
         title (string): The title of the recipe.
@@ -26,6 +42,16 @@ class Recipe:
     prep_time: str = ''
     category: str = 'unknown'
 
+    def __hash__(self) -> int:
+        return hash((self.user_id, self.title, self.description, tuple(self.ingredients),
+                     tuple(self.steps), self.prep_time, self.category))
+
+    def iter_errors(self) -> Iterator[str]:
+        '''
+        Yields the message of every invalid attribute.
+        '''
+        return _recipe_errors(self)
+
     def validate(self) -> None:
         '''
         Validates the Recipe attributes.
@@ -33,14 +59,7 @@ class Recipe:
         Raises:
             ValueError: If any attribute is invalid.
         '''
-        if not ObjectId.is_valid(self.user_id):
-            raise ValueError(f'Invalid ObjectId: {self.user_id}')
-        if not self.title:
-            raise ValueError('Title cannot be empty.')
-        if self.category not in {'dairy', 'meat', 'parve', 'unknown'}:
-            raise ValueError(f'Invalid category: {self.category}')
-        if not self.ingredients:
-            raise ValueError('Ingredients list cannot be empty.')
+        raise_first_error(self.iter_errors())
 
     def to_dict(self) -> dict:
         '''
@@ -59,3 +78,181 @@ class Recipe:
             'prep_time': self.prep_time,
             'category': self.category
         }
+
+    @classmethod
+    def from_dict(cls, document: Mapping, lazy: bool = False) -> 'Recipe':
+        '''
+        Creates a Recipe from a dictionary made by to_dict, or a document read from MongoDB.
+
+        Args:
+            document (Mapping): The stored recipe.
+            lazy (bool): Whether to only decode ingredients and steps when they are first
+                accessed, e.g. for listings that only show titles.
+
+        Returns:
+            Recipe: The recipe, a LazyRecipe if lazy is set.
+        '''
+        if lazy:
+            return LazyRecipe(document)
+        return cls(
+            user_id=to_object_id(document['user_id']),
+            title=document['title'],
+            description=document.get('description', ''),
+            ingredients=[Ingredient.from_dict(ingredient) for ingredient in document.get('ingredients', ())],
+            steps=list(document.get('steps', ())),
+            prep_time=document.get('prep_time', ''),
+            category=document.get('category', 'unknown')
+        )
+
+    @classmethod
+    def from_bson(cls, data: bytes) -> 'Recipe':
+        '''
+        Creates a LazyRecipe from raw BSON, nested documents are only decoded on access.
+        '''
+        return LazyRecipe(RawBSONDocument(data))
+
+    def freeze(self) -> 'FrozenRecipe':
+        '''
+        Returns a read-only copy of the recipe, with its ingredients frozen as well.
+        '''
+        return FrozenRecipe(
+            user_id=self.user_id,
+            title=self.title,
+            description=self.description,
+            ingredients=tuple(ingredient.freeze() for ingredient in self.ingredients),
+            steps=tuple(self.steps),
+            prep_time=self.prep_time,
+            category=self.category
+        )
+
+
+_ingredients_slot = Recipe.__dict__['ingredients']
+_steps_slot = Recipe.__dict__['steps']
+
+
+class LazyRecipe(Recipe):
+    '''
+    This class represents a recipe read from storage whose ingredients and steps are only
+    decoded from the stored document when they are first accessed.
+
+    It behaves like a Recipe and compares equal to a Recipe with the same content. It can
+    also be created from the Recipe fields, as dataclasses.replace does, and is then
+    already decoded.
+    '''
+    __slots__ = ('_document',)
+
+    def __init__(self, document: Optional[Mapping] = None, **fields) -> None:
+        if document is None:
+            self._document = {}
+            super().__init__(**fields)
+            return
+        self._document = document
+        self.user_id = to_object_id(document['user_id'])
+        self.title = document['title']
+        self.description = document.get('description', '')
+        self.prep_time = document.get('prep_time', '')
+        self.category = document.get('category', 'unknown')
+
+    @property
+    def ingredients(self) -> List[Ingredient]:
+        try:
+            return _ingredients_slot.__get__(self)
+        except AttributeError:
+            ingredients = [Ingredient.from_dict(ingredient) for ingredient in self._document.get('ingredients', ())]
+            _ingredients_slot.__set__(self, ingredients)
+            return ingredients
+
+    @ingredients.setter
+    def ingredients(self, ingredients: List[Ingredient]) -> None:
+        _ingredients_slot.__set__(self, ingredients)
+
+    @property
+    def steps(self) -> List[str]:
+        try:
+            return _steps_slot.__get__(self)
+        except AttributeError:
+            steps = list(self._document.get('steps', ()))
+            _steps_slot.__set__(self, steps)
+            return steps
+
+    @steps.setter
+    def steps(self, steps: List[str]) -> None:
+        _steps_slot.__set__(self, steps)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Recipe):
+            return NotImplemented
+        return (self.user_id, self.title, self.description, self.ingredients, self.steps, self.prep_time,
+                self.category) == (other.user_id, other.title, other.description, other.ingredients, other.steps,
+                                   other.prep_time, other.category)
+
+    __hash__ = Recipe.__hash__
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenRecipe:
+    '''
+    This class represents a read-only recipe, used for catalog data.
+
+    Attributes:
+        user_id (ObjectId): The user who created the recipe.
+        title (string): The title of the recipe.
+        description (string): A description of the recipe.
+        ingredients (Tuple[FrozenIngredient, ...]): Tuple of ingredients.
+        steps (Tuple[str, ...]): Tuple of the steps.
+        prep_time (int): The time it takes to prepare
+        category (str): The category of the recipe (dairy, meat, parve)
+    '''
+    user_id: ObjectId
+    title: str
+    description: str = ''
+    ingredients: Tuple[FrozenIngredient, ...] = ()
+    steps: Tuple[str, ...] = ()
+    prep_time: str = ''
+    category: str = 'unknown'
+
+    def iter_errors(self) -> Iterator[str]:
+        '''
+        Yields the message of every invalid attribute.
+        '''
+        return _recipe_errors(self)
+
+    def validate(self) -> None:
+        '''
+        Validates the FrozenRecipe attributes.
+
+        Raises:
+            ValueError: If any attribute is invalid.
+        '''
+        raise_first_error(self.iter_errors())
+
+    def to_dict(self) -> dict:
+        '''
+        Converts the FrozenRecipe object to the same dictionary as Recipe.to_dict.
+
+        Returns:
+            dict: A dictionary representation of the recipe.
+        '''
+        return {
+            'user_id': str(self.user_id),
+            'title': self.title,
+            'description': self.description,
+            'ingredients': [ingredient.to_dict() for ingredient in self.ingredients],
+            'steps': list(self.steps),
+            'prep_time': self.prep_time,
+            'category': self.category
+        }
+
+    def thaw(self) -> Recipe:
+        '''
+        Returns an editable copy of the recipe.
+        '''
+        return Recipe(
+            user_id=self.user_id,
+            title=self.title,
+            description=self.description,
+            ingredients=[ingredient.thaw() for ingredient in self.ingredients],
+            steps=list(self.steps),
+            prep_time=self.prep_time,
+            category=self.category
+        )
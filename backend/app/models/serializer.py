@@ -0,0 +1,106 @@
+import json
+from typing import Dict, IO, Iterable, Iterator, List
+from app.models.menu import Menu
+
+_encode = json.JSONEncoder().encode
+
+
+class _BatchSerializer:
+    '''
+    Serializes menus in one pass, converting each ObjectId and recipe only once.
+
+    Recipes are converted with their own to_dict, so the layout is the one of the models.
+    The caches are keyed by object identity and only live for one batch, because the
+    models are mutable and may change between batches. The converted recipes are kept,
+    so an id is not reused by another recipe while the batch runs, e.g. when the menus
+    come from a generator and are freed after they are written.
+    '''
+
+    def __init__(self) -> None:
+        self.ids: Dict[object, str] = {}
+        self.ids_json: Dict[object, str] = {}
+        self.recipes: Dict[int, dict] = {}
+        self.recipe_json: Dict[int, str] = {}
+        self.converted: List[object] = []
+
+    def object_id(self, object_id) -> str:
+        converted = self.ids.get(object_id)
+        if converted is None:
+            converted = self.ids[object_id] = str(object_id)
+        return converted
+
+    def object_id_to_json(self, object_id) -> str:
+        converted = self.ids_json.get(object_id)
+        if converted is None:
+            converted = self.ids_json[object_id] = _encode(self.object_id(object_id))
+        return converted
+
+    def recipe(self, recipe) -> dict:
+        converted = self.recipes.get(id(recipe))
+        if converted is None:
+            converted = self.recipes[id(recipe)] = recipe.to_dict()
+            self.converted.append(recipe)
+        return converted
+
+    def menu(self, menu: Menu) -> dict:
+        convert = self.recipe
+        return {
+            'user_id': self.object_id(menu.user_id),
+            'date': menu.date.isoformat(),
+            'recipes': [convert(recipe) for recipe in menu.recipes]
+        }
+
+    def recipe_to_json(self, recipe) -> str:
+        converted = self.recipe_json.get(id(recipe))
+        if converted is None:
+            converted = self.recipe_json[id(recipe)] = _encode(self.recipe(recipe))
+        return converted
+
+    def menu_to_json(self, menu: Menu) -> str:
+        # Same layout and separators as json.dumps(menu.to_dict())
+        convert = self.recipe_to_json
+        recipes = ', '.join([convert(recipe) for recipe in menu.recipes])
+        return (f'{{"user_id": {self.object_id_to_json(menu.user_id)}, '
+                f'"date": "{menu.date.isoformat()}", '
+                f'"recipes": [{recipes}]}}')
+
+
+def serialize_many(menus: Iterable[Menu]) -> List[dict]:
+    '''
+    Converts menus to the same dictionaries as Menu.to_dict, ready for MongoDB storage.
+
+    A recipe that appears in several menus is converted once and its dictionary is
+    shared between those menus, so copy a result before changing it.
+
+    Returns:
+        List[dict]: A dictionary representation of each menu.
+    '''
+    serializer = _BatchSerializer()
+    return [serializer.menu(menu) for menu in menus]
+
+
+def iter_json(menus: Iterable[Menu]) -> Iterator[str]:
+    '''
+    Encodes menus as a JSON array, one menu at a time.
+
+    The concatenated chunks are identical to json.dumps([menu.to_dict() for menu in menus]),
+    but the menus are never held as one dictionary tree, so this can stream a response.
+
+    Returns:
+        Iterator[str]: Chunks of the JSON text.
+    '''
+    serializer = _BatchSerializer()
+    yield '['
+    separator = ''
+    for menu in menus:
+        yield separator + serializer.menu_to_json(menu)
+        separator = ', '
+    yield ']'
+
+
+def dump_many(menus: Iterable[Menu], fp: IO[str]) -> None:
+    '''
+    Writes menus as a JSON array to a text file object.
+    '''
+    for chunk in iter_json(menus):
+        fp.write(chunk)
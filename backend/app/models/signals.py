@@ -0,0 +1,11 @@
+from blinker import Namespace
+
+_signals = Namespace()
+
+# Sent with the menu as sender when recipes are added to or removed from it,
+# or when it is saved to storage
+menu_changed = _signals.signal('menu-changed')
+
+# Sent when a stored recipe is updated, replaced or deleted, with the keyword
+# arguments recipe_id (None if unknown), user_id and title
+recipe_changed = _signals.signal('recipe-changed')
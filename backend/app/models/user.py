@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-import re
+from typing import Iterator, Mapping
 import bcrypt
+from app.models.validation import EMAIL_PATTERN, raise_first_error
 
 
 @dataclass
@@ -17,6 +18,36 @@ class User:
     user_password:str
     user_name: str
 
+    def iter_errors(self) -> Iterator[str]:
+        '''
+        Yields the message of every invalid attribute.
+        '''
+        # Validate email format
+        if not EMAIL_PATTERN.match(self.user_email):
+            yield 'Invalid email format.'
+
+        # Validate password strength
+        if len(self.user_password) < 8:
+            yield 'Password must be at least 8 characters long.'
+
+        # Look for a digit and a letter in a single pass over the password
+        has_digit = has_alpha = False
+        for char in self.user_password:
+            if char.isdigit():
+                has_digit = True
+            elif char.isalpha():
+                has_alpha = True
+            else:
+                continue
+            if has_digit and has_alpha:
+                break
+
+        if not has_digit:
+            yield 'Password must contain at least one number.'
+
+        if not has_alpha:
+            yield 'Password must contain at least one letter.'
+
     def validate(self) -> None:
         '''
         Validates the User attributes.
@@ -24,19 +55,7 @@ class User:
         Raises:
             ValueError: If any attribute is invalid.
         '''
-        # Validate email format
-        if not re.match(r'[^@]+@[^@]+\.[^@]+', self.user_email):
-            raise ValueError('Invalid email format.')
-        
-        # Validate password strength
-        if len(self.user_password) < 8:
-            raise ValueError('Password must be at least 8 characters long.')
-        
-        if not any(char.isdigit() for char in self.user_password):
-            raise ValueError('Password must contain at least one number.')
-        
-        if not any(char.isalpha() for char in self.user_password):
-            raise ValueError('Password must contain at least one letter.')
+        raise_first_error(self.iter_errors())
 
     def hash_password(self) -> None:
         '''
@@ -65,4 +84,15 @@ class User:
         if not exclude_password:
             user_dict['user_password'] = self.user_password  # Include password if needed
         
-        return user_dict
\ No newline at end of file
+        return user_dict
+
+    @classmethod
+    def from_dict(cls, document: Mapping) -> 'User':
+        '''
+        Creates a User from a dictionary made by to_dict, the password is empty if it was excluded.
+        '''
+        return cls(
+            user_email=document['user_email'],
+            user_password=document.get('user_password', ''),
+            user_name=document['user_name']
+        )
@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from functools import lru_cache
+import re
+from typing import Iterable, List
+from bson import ObjectId
+
+# Rules shared by the models' validate methods, compiled once
+EMAIL_PATTERN = re.compile(r'[^@]+@[^@]+\.[^@]+')
+CATEGORIES = frozenset({'dairy', 'meat', 'parve', 'unknown'})
+
+
+@lru_cache(maxsize=65536)
+def _is_valid_object_id_string(value) -> bool:
+    return ObjectId.is_valid(value)
+
+
+def is_valid_object_id(value) -> bool:
+    '''
+    Checks if value is an ObjectId or a valid ObjectId string, caching the string checks.
+    '''
+    if isinstance(value, ObjectId):
+        return True
+    try:
+        return _is_valid_object_id_string(value)
+    except TypeError:
+        # Unhashable values cannot be cached
+        return ObjectId.is_valid(value)
+
+
+@lru_cache(maxsize=65536)
+def _parse_object_id(value: str) -> ObjectId:
+    return ObjectId(value)
+
+
+def to_object_id(value):
+    '''
+    Converts a stored ObjectId string back to an ObjectId, parsing each distinct string once.
+
+    Values that are already ObjectIds or are not valid ObjectId strings are returned as is,
+    so that validation can report them.
+    '''
+    if isinstance(value, str) and is_valid_object_id(value):
+        return _parse_object_id(value)
+    return value
+
+
+def raise_first_error(errors: Iterable[str]) -> None:
+    '''
+    Raises a ValueError with the first message, if there is one.
+    '''
+    for error in errors:
+        raise ValueError(error)
+
+
+@dataclass
+class ValidationReport:
+    '''
+    This class represents the validation errors of one item in a batch.
+
+    Attributes:
+        index (int): The position of the item in the batch.
+        item (object): The invalid item.
+        errors (List[str]): The messages of every invalid attribute.
+    '''
+    index: int
+    item: object
+    errors: List[str]
+
+
+def validate_many(items: Iterable) -> List[ValidationReport]:
+    '''
+    Validates a batch of models, collecting every error instead of raising on the first.
+
+    Returns:
+        List[ValidationReport]: A report for each invalid item, in batch order.
+    '''
+    reports = []
+    for index, item in enumerate(items):
+        errors = list(item.iter_errors())
+        if errors:
+            reports.append(ValidationReport(index, item, errors))
+    return reports
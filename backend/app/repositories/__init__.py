@@ -0,0 +1,6 @@
+from app.repositories.client import close_client, get_client, get_database
+from app.repositories.menu import MenuRepository
+from app.repositories.recipe import RecipeRepository
+from app.repositories.user import UserRepository
+
+__all__ = ['MenuRepository', 'RecipeRepository', 'UserRepository', 'close_client', 'get_client', 'get_database']
@@ -0,0 +1,68 @@
+from itertools import islice
+from typing import Iterable, List, Optional
+from pymongo import IndexModel
+from pymongo.collection import Collection
+from pymongo.database import Database
+from app.repositories.client import get_database
+
+BATCH_SIZE = 1000
+
+
+class BaseRepository:
+    '''
+    This class is the base of the repositories that store models in a MongoDB collection.
+
+    Attributes:
+        collection_name (str): The name of the collection, set by each repository.
+        indexes (List[IndexModel]): The indexes the repository's queries need.
+    '''
+    collection_name: str = ''
+    indexes: List[IndexModel] = []
+
+    def __init__(self, database: Optional[Database] = None) -> None:
+        '''
+        Uses the given database, or the shared application database if none is given.
+        '''
+        self._database = database
+
+    @property
+    def collection(self) -> Collection:
+        if self._database is None:
+            self._database = get_database()
+        return self._database[self.collection_name]
+
+    def ensure_indexes(self) -> List[str]:
+        '''
+        Creates the repository's indexes if they do not exist yet.
+
+        Returns:
+            List[str]: The names of the indexes.
+        '''
+        return self.collection.create_indexes(self.indexes) if self.indexes else []
+
+    def _insert_documents(self, documents: Iterable[dict], batch_size: int = BATCH_SIZE) -> list:
+        '''
+        Inserts documents with unordered insert_many calls of at most batch_size documents.
+
+        Returns:
+            list: The ids of the inserted documents.
+        '''
+        inserted_ids = []
+        documents = iter(documents)
+        while batch := list(islice(documents, batch_size)):
+            inserted_ids.extend(self.collection.insert_many(batch, ordered=False).inserted_ids)
+        return inserted_ids
+
+    def _bulk_write(self, requests: Iterable, batch_size: int = BATCH_SIZE) -> int:
+        '''
+        Runs write requests with unordered bulk_write calls of at most batch_size requests.
+
+        Returns:
+            int: The number of documents inserted, upserted or modified.
+        '''
+        written = 0
+        requests = iter(requests)
+        while batch := list(islice(requests, batch_size)):
+            result = self.collection.bulk_write(batch, ordered=False)
+            written += result.inserted_count + result.upserted_count + result.modified_count
+        return written
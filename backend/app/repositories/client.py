@@ -0,0 +1,46 @@
+import os
+import threading
+from typing import Optional
+from pymongo import MongoClient
+from pymongo.database import Database
+
+_client: Optional[MongoClient] = None
+_lock = threading.Lock()
+
+
+def get_client() -> MongoClient:
+    '''
+    Returns the MongoClient shared by all repositories, creating it on first use.
+
+    The client holds its own connection pool, so one client is shared by the whole
+    process. It is configured from the MONGO_URI and MONGO_MAX_POOL_SIZE environment
+    variables and only connects when the first operation runs.
+    '''
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = MongoClient(
+                    os.environ.get('MONGO_URI', 'mongodb://localhost:27017'),
+                    maxPoolSize=int(os.environ.get('MONGO_MAX_POOL_SIZE', '100')),
+                    connect=False
+                )
+    return _client
+
+
+def get_database() -> Database:
+    '''
+    Returns the application database, named by the MONGO_DB environment variable.
+    '''
+    return get_client()[os.environ.get('MONGO_DB', 'dish_dash')]
+
+
+def close_client() -> None:
+    '''
+    Closes the shared client, the next get_client call creates a new one.
+    '''
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
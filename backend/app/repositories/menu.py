@@ -0,0 +1,309 @@
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel, ReturnDocument, UpdateOne
+from pymongo.database import Database
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.models.signals import menu_changed
+from app.models.serializer import serialize_many
+from app.repositories.base import BaseRepository
+from app.repositories.recipe import RecipeRepository
+
+# The fields shown when listing menus, leaving out the recipes' ingredients and steps
+SUMMARY_PROJECTION = {
+    'user_id': True,
+    'date': True,
+    'recipes.title': True,
+    'recipes.category': True,
+    'recipes.prep_time': True,
+}
+
+# The number of patches kept in a stored menu, for clients syncing from a recent version
+CHANGE_LOG_SIZE = 20
+
+
+class MenuRepository(BaseRepository):
+    '''
+    This class stores menus in the menus collection, one menu per user and date.
+
+    Dates are stored as ISO strings, so they sort and compare in date order. Every write
+    increments the menu's version, and save_changes also keeps the last CHANGE_LOG_SIZE
+    patches in the menu, so clients can fetch the changes since the version they have.
+
+    By default the recipes are embedded in the menu. With embed_recipes False, the menu
+    stores references to the user's stored recipes, {'recipe_id', 'title'}, which are
+    resolved when the menu is read, and in the patches returned by changes_since. Recipes
+    new to a menu are referenced by their title, the oldest stored recipe of the user with
+    that title is used; the recipes kept by save_changes keep their references. Deleting
+    a referenced recipe leaves it out of the menu without a new version.
+    '''
+    collection_name = 'menus'
+    indexes = [IndexModel([('user_id', ASCENDING), ('date', ASCENDING)], unique=True)]
+
+    def __init__(self, database: Optional[Database] = None, embed_recipes: bool = True) -> None:
+        super().__init__(database)
+        self.embed_recipes = embed_recipes
+        self._recipes = RecipeRepository(database)
+
+    def _encoder(self, user_id) -> Callable[[Recipe], dict]:
+        '''
+        Returns the function converting the user's recipes to their stored form.
+        '''
+        if self.embed_recipes:
+            return Recipe.to_dict
+        references: Dict[str, dict] = {}
+
+        def reference(recipe: Recipe) -> dict:
+            if recipe.title not in references:
+                stored = next(self._recipes.collection.find({'user_id': str(user_id), 'title': recipe.title},
+                                                            {'_id': True}).sort('_id', ASCENDING).limit(1), None)
+                if stored is None:
+                    raise ValueError(f'Recipe "{recipe.title}" is not stored, it cannot be referenced.')
+                references[recipe.title] = {'recipe_id': str(stored['_id']), 'title': recipe.title}
+            return references[recipe.title]
+
+        return reference
+
+    def _reference_update(self, menu: Menu, stored_version) -> Tuple[Callable[[Recipe], dict], Optional[dict]]:
+        '''
+        Returns the recipe encoder and the update storing the menu's changes as references.
+
+        Added recipes are pushed. When recipes were removed, the stored references are read
+        and the kept ones are written back by position, so removing one of two references
+        to the same recipe removes only that one.
+
+        Raises:
+            ValueError: If the stored menu is missing or was changed since the menu's version.
+        '''
+        encode = self._encoder(menu.user_id)
+        saved = menu.saved_positions()
+        if saved is not None and None not in saved:
+            # Nothing read was removed, $push leaves the stored references as they are
+            return encode, menu.to_update(encode)
+        document = self.collection.find_one(
+            {'user_id': str(menu.user_id), 'date': menu.date.isoformat(), 'version': stored_version},
+            {'recipes': True}
+        )
+        if document is None:
+            raise ValueError(f'The menu of {menu.date.isoformat()} is not stored at version {menu.version}.')
+
+        # The menu was read without the references to deleted recipes, see _resolve
+        stored = self._stored_recipes(document.get('recipes', ()))
+        read = [reference for reference in document.get('recipes', ()) if reference.get('recipe_id') in stored]
+        references: Dict[int, dict] = {}
+        if saved is not None:
+            if len(saved) != len(read):
+                raise ValueError(f'The recipes of the menu of {menu.date.isoformat()} were deleted since it was read.')
+            for reference, position in zip(read, saved):
+                if position is not None:
+                    references[id(menu.recipes[position])] = reference
+        else:
+            # The list was replaced, recipes take the first unused reference to a stored recipe with their title
+            unused: Dict[str, List[dict]] = {}
+            for reference in read:
+                unused.setdefault(stored[reference['recipe_id']]['title'], []).append(reference)
+            for recipe in menu.recipes:
+                if unused.get(recipe.title):
+                    references[id(recipe)] = unused[recipe.title].pop(0)
+
+        def reference(recipe: Recipe) -> dict:
+            return references.get(id(recipe)) or encode(recipe)
+
+        return reference, {'$set': {'recipes': [reference(recipe) for recipe in menu.recipes]}}
+
+    def _to_document(self, menu: Menu) -> dict:
+        encode = self._encoder(menu.user_id)
+        return {'user_id': str(menu.user_id), 'date': menu.date.isoformat(),
+                'recipes': [encode(recipe) for recipe in menu.recipes]}
+
+    def _resolve(self, documents: List[dict]) -> List[dict]:
+        '''
+        Replaces the recipe references of the documents with the stored recipes, reading
+        them in one query. References to deleted recipes are left out.
+        '''
+        if self.embed_recipes or not documents:
+            return documents
+        recipes = self._stored_recipes(reference for document in documents for reference in document.get('recipes', ()))
+        for document in documents:
+            document['recipes'] = [recipes[reference['recipe_id']] for reference in document.get('recipes', ())
+                                   if reference.get('recipe_id') in recipes]
+        return documents
+
+    def _stored_recipes(self, references: Iterable[dict]) -> Dict[str, dict]:
+        '''
+        Reads the stored recipes of the references in one query, by their id string.
+        '''
+        ids = {ObjectId(reference['recipe_id']) for reference in references if 'recipe_id' in reference}
+        if not ids:
+            return {}
+        return {str(recipe.pop('_id')): recipe for recipe in self._recipes.collection.find({'_id': {'$in': list(ids)}})}
+
+    def _resolve_patch(self, patch: List[dict], references: List[dict]) -> Optional[List[dict]]:
+        '''
+        Replaces the recipe references in the patch with the stored recipes, or returns None
+        if a reference in the patch or in the menu's references is to a deleted recipe, as
+        then the positions in the patch no longer match the menu that is read.
+        '''
+        values = [operation['value'] for operation in patch if operation['op'] == 'add']
+        values += [reference for operation in patch if operation['op'] == 'replace' for reference in operation['value']]
+        recipes = self._stored_recipes(values + references)
+        if any(reference.get('recipe_id') not in recipes for reference in values + references):
+            return None
+        resolved = []
+        for operation in patch:
+            if operation['op'] == 'add':
+                operation = {**operation, 'value': recipes[operation['value']['recipe_id']]}
+            elif operation['op'] == 'replace':
+                operation = {**operation,
+                             'value': [recipes[reference['recipe_id']] for reference in operation['value']]}
+            resolved.append(operation)
+        return resolved
+
+    @staticmethod
+    def _full_write(document: dict) -> dict:
+        # A full write starts a new change log, older versions can only sync by reading the menu
+        return {'$set': {**document, 'changes': []}, '$inc': {'version': 1}}
+
+    def save(self, menu: Menu) -> None:
+        '''
+        Inserts the menu, or replaces the user's menu for the same date.
+        '''
+        document = self._to_document(menu)
+        stored = self.collection.find_one_and_update(
+            {'user_id': document['user_id'], 'date': document['date']}, self._full_write(document),
+            projection={'version': True}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        menu.mark_saved(stored['version'])
+        menu_changed.send(menu)
+
+    def save_many(self, menus: Iterable[Menu]) -> int:
+        '''
+        Inserts or replaces menus in unordered bulk writes.
+
+        The menus' versions are not read back, read the menus again before save_changes.
+
+        Returns:
+            int: The number of menus inserted or replaced.
+        '''
+        menus = list(menus)
+        documents = serialize_many(menus) if self.embed_recipes else (self._to_document(menu) for menu in menus)
+        written = self._bulk_write(
+            UpdateOne({'user_id': document['user_id'], 'date': document['date']}, self._full_write(document),
+                      upsert=True)
+            for document in documents
+        )
+        for menu in menus:
+            menu.mark_saved()
+            menu_changed.send(menu)
+        return written
+
+    def save_changes(self, menu: Menu) -> bool:
+        '''
+        Stores the recipes added to and removed from the menu since it was read or saved,
+        with a $push or $pull of just those recipes, and logs them as a JSON Patch.
+        Menus of recipe references are written as described in _reference_update.
+
+        The write only applies if the stored menu is still at the menu's version, and the
+        version is only incremented by a write that applies.
+
+        Returns:
+            bool: Whether anything was written.
+
+        Raises:
+            ValueError: If the stored menu is missing or was changed since the menu's version.
+        '''
+        # Menus stored before versioning have no version field
+        stored_version = menu.version if menu.version else {'$in': [0, None]}
+        if self.embed_recipes:
+            encode = Recipe.to_dict
+            update = menu.to_update(encode)
+        else:
+            encode, update = self._reference_update(menu, stored_version)
+        if update is None:
+            menu.mark_saved()
+            return False
+        version = menu.version + 1
+        update['$inc'] = {'version': 1}
+        update.setdefault('$push', {})['changes'] = {
+            '$each': [{'version': version, 'patch': menu.to_json_patch(encode)}],
+            '$slice': -CHANGE_LOG_SIZE,
+        }
+        result = self.collection.update_one(
+            {'user_id': str(menu.user_id), 'date': menu.date.isoformat(), 'version': stored_version}, update
+        )
+        if result.modified_count != 1:
+            raise ValueError(f'The menu of {menu.date.isoformat()} is not stored at version {menu.version}.')
+        menu.mark_saved(version)
+        menu_changed.send(menu)
+        return True
+
+    def find(self, user_id, menu_date: date) -> Optional[dict]:
+        '''
+        Returns the user's full menu for the date, with its version.
+        '''
+        document = self.collection.find_one({'user_id': str(user_id), 'date': menu_date.isoformat()},
+                                            {'changes': False})
+        return self._resolve([document])[0] if document is not None else None
+
+    def changes_since(self, user_id, menu_date: date, version: int) -> Optional[dict]:
+        '''
+        Returns what a client holding the menu at version needs to catch up.
+
+        Returns:
+            Optional[dict]: {'version', 'patch'} with the JSON Patch from version to the
+                current version if the change log covers it, otherwise {'version', 'menu'}
+                with the full menu. None if the menu is not stored.
+        '''
+        projection = {'version': True, 'changes': True}
+        if not self.embed_recipes:
+            projection['recipes'] = True
+        document = self.collection.find_one({'user_id': str(user_id), 'date': menu_date.isoformat()}, projection)
+        if document is None:
+            return None
+        current = document.get('version', 0)
+        patches = [change for change in document.get('changes', ()) if change['version'] > version]
+        patch = [operation for change in patches for operation in change['patch']]
+        if not self.embed_recipes and version <= current and len(patches) == current - version:
+            patch = self._resolve_patch(patch, document.get('recipes', []))
+        if version > current or len(patches) != current - version or patch is None:
+            return {'version': current, 'menu': self.find(user_id, menu_date)}
+        return {'version': current, 'patch': patch}
+
+    def find_menu(self, user_id, menu_date: date, lazy: bool = True) -> Optional[Menu]:
+        '''
+        Returns the user's menu for the date as a Menu, whose recipes decode their
+        ingredients and steps on access unless lazy is False.
+        '''
+        document = self.find(user_id, menu_date)
+        return Menu.from_dict(document, lazy=lazy) if document is not None else None
+
+    @staticmethod
+    def _range_query(user_id, start: Optional[date], end: Optional[date]) -> dict:
+        query = {'user_id': str(user_id)}
+        date_range = {}
+        if start is not None:
+            date_range['$gte'] = start.isoformat()
+        if end is not None:
+            date_range['$lte'] = end.isoformat()
+        if date_range:
+            query['date'] = date_range
+        return query
+
+    def list_for_user(self, user_id, start: Optional[date] = None, end: Optional[date] = None) -> List[dict]:
+        '''
+        Returns a summary of the user's menus between start and end (inclusive), sorted by date.
+
+        Only the title, category and prep time of each recipe are read.
+        '''
+        query = self._range_query(user_id, start, end)
+        return list(self.collection.find(query, SUMMARY_PROJECTION).sort('date', ASCENDING))
+
+    def find_menus(self, user_id, start: Optional[date] = None, end: Optional[date] = None,
+                   lazy: bool = True) -> List[Menu]:
+        '''
+        Returns the user's full menus between start and end (inclusive) as Menus, sorted by date.
+        '''
+        query = self._range_query(user_id, start, end)
+        documents = self._resolve(list(self.collection.find(query, {'changes': False}).sort('date', ASCENDING)))
+        return [Menu.from_dict(document, lazy=lazy) for document in documents]
@@ -0,0 +1,120 @@
+from typing import Iterable, List, Optional, Tuple
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel, ReplaceOne
+from app.models.recipe import Recipe
+from app.models.signals import recipe_changed
+from app.repositories.base import BaseRepository
+
+# The fields shown when listing recipes, leaving out ingredients and steps
+SUMMARY_PROJECTION = {'user_id': True, 'title': True, 'category': True, 'prep_time': True}
+
+
+class RecipeRepository(BaseRepository):
+    '''
+    This class stores recipes in the recipes collection.
+    '''
+    collection_name = 'recipes'
+    indexes = [
+        IndexModel([('user_id', ASCENDING), ('title', ASCENDING)]),
+        IndexModel([('title', ASCENDING)]),
+    ]
+
+    def insert(self, recipe: Recipe) -> ObjectId:
+        '''
+        Inserts a recipe.
+
+        Returns:
+            ObjectId: The id of the inserted recipe.
+        '''
+        return self.collection.insert_one(recipe.to_dict()).inserted_id
+
+    def insert_many(self, recipes: Iterable[Recipe]) -> list:
+        '''
+        Inserts recipes in unordered batches.
+
+        Returns:
+            list: The ids of the inserted recipes.
+        '''
+        return self._insert_documents(recipe.to_dict() for recipe in recipes)
+
+    def upsert_many(self, recipes: Iterable[Recipe]) -> int:
+        '''
+        Inserts or replaces recipes by user and title in unordered bulk writes.
+
+        Returns:
+            int: The number of recipes inserted or replaced.
+        '''
+        recipes = list(recipes)
+        written = self._bulk_write(
+            ReplaceOne({'user_id': str(recipe.user_id), 'title': recipe.title}, recipe.to_dict(), upsert=True)
+            for recipe in recipes
+        )
+        for recipe in recipes:
+            recipe_changed.send(self, recipe_id=None, user_id=str(recipe.user_id), title=recipe.title)
+        return written
+
+    def replace_many(self, recipes: Iterable[Tuple[ObjectId, Recipe]]) -> int:
+        '''
+        Inserts or replaces recipes by id in unordered bulk writes, so writing the same
+        recipes twice stores each of them once.
+
+        Args:
+            recipes (Iterable[Tuple[ObjectId, Recipe]]): The ids with their recipes.
+
+        Returns:
+            int: The number of recipes inserted or replaced.
+        '''
+        recipes = list(recipes)
+        written = self._bulk_write(
+            ReplaceOne({'_id': recipe_id}, recipe.to_dict(), upsert=True) for recipe_id, recipe in recipes
+        )
+        for recipe_id, recipe in recipes:
+            recipe_changed.send(self, recipe_id=str(recipe_id), user_id=str(recipe.user_id), title=recipe.title)
+        return written
+
+    def update(self, recipe_id, recipe: Recipe) -> bool:
+        '''
+        Replaces the stored recipe with the given id.
+
+        Returns:
+            bool: True if a recipe was replaced, False if there is no recipe with the id.
+        '''
+        result = self.collection.replace_one({'_id': ObjectId(recipe_id)}, recipe.to_dict())
+        recipe_changed.send(self, recipe_id=str(recipe_id), user_id=str(recipe.user_id), title=recipe.title)
+        return result.matched_count == 1
+
+    def delete(self, recipe_id) -> bool:
+        '''
+        Deletes the recipe with the given id.
+
+        Returns:
+            bool: True if a recipe was deleted.
+        '''
+        result = self.collection.delete_one({'_id': ObjectId(recipe_id)})
+        recipe_changed.send(self, recipe_id=str(recipe_id), user_id=None, title=None)
+        return result.deleted_count == 1
+
+    def find_by_id(self, recipe_id) -> Optional[dict]:
+        '''
+        Returns the full recipe with the given id.
+        '''
+        return self.collection.find_one({'_id': ObjectId(recipe_id)})
+
+    def find_recipe(self, recipe_id, lazy: bool = False) -> Optional[Recipe]:
+        '''
+        Returns the recipe with the given id as a Recipe, see Recipe.from_dict for lazy.
+        '''
+        document = self.find_by_id(recipe_id)
+        return Recipe.from_dict(document, lazy=lazy) if document is not None else None
+
+    def find_by_title(self, user_id, title: str) -> Optional[dict]:
+        '''
+        Returns the full recipe of the user with the given title.
+        '''
+        return self.collection.find_one({'user_id': str(user_id), 'title': title})
+
+    def list_by_user(self, user_id) -> List[dict]:
+        '''
+        Returns a summary of the user's recipes, without ingredients and steps, sorted by title.
+        '''
+        return list(self.collection.find({'user_id': str(user_id)}, SUMMARY_PROJECTION).sort('title', ASCENDING))
@@ -0,0 +1,43 @@
+from typing import Iterable, List, Optional
+from pymongo import ASCENDING, IndexModel
+from app.models.user import User
+from app.repositories.base import BaseRepository
+
+
+class UserRepository(BaseRepository):
+    '''
+    This class stores users in the users collection, keyed by their unique email.
+    '''
+    collection_name = 'users'
+    indexes = [IndexModel([('user_email', ASCENDING)], unique=True)]
+
+    def insert(self, user: User):
+        '''
+        Inserts a user, including the (hashed) password.
+
+        Returns:
+            ObjectId: The id of the inserted user.
+        '''
+        return self.collection.insert_one(user.to_dict(exclude_password=False)).inserted_id
+
+    def insert_many(self, users: Iterable[User]) -> list:
+        '''
+        Inserts users in unordered batches.
+
+        Returns:
+            list: The ids of the inserted users.
+        '''
+        return self._insert_documents(user.to_dict(exclude_password=False) for user in users)
+
+    def find_by_email(self, user_email: str, include_password: bool = False) -> Optional[dict]:
+        '''
+        Returns the user with the given email, without the password unless it is asked for.
+        '''
+        projection = None if include_password else {'user_password': False}
+        return self.collection.find_one({'user_email': user_email}, projection)
+
+    def list_users(self) -> List[dict]:
+        '''
+        Returns the email and name of every user.
+        '''
+        return list(self.collection.find({}, {'user_email': True, 'user_name': True}))
@@ -0,0 +1,130 @@
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from app.models.recipe import Recipe
+
+# Compact the index once this many removed recipes are still held in the posting lists
+COMPACT_THRESHOLD = 1024
+
+
+def normalize_ingredient_name(name: str) -> str:
+    '''
+    Normalizes an ingredient name for matching: case-folded, with single spaces.
+    '''
+    return ' '.join(name.casefold().split())
+
+
+class IngredientIndex:
+    '''
+    This class is an inverted index from normalized ingredient name to the recipes using it.
+
+    Every recipe gets a slot number, and each ingredient keeps a sorted posting list of
+    the slots of its recipes. Slots only grow, so adding a recipe appends to the lists.
+    Removing a recipe only marks its slot as dead, and the lists are compacted once
+    enough dead slots pile up. Queries run over the lists as numpy arrays.
+
+    Recipes are identified by any hashable id chosen by the caller, e.g. their MongoDB _id.
+    '''
+
+    def __init__(self, recipes: Optional[Iterable[Tuple[Hashable, Recipe]]] = None) -> None:
+        self._slots: Dict[Hashable, int] = {}
+        self._ids: List[Optional[Hashable]] = []
+        self._names: List[Tuple[str, ...]] = []
+        self._sizes = array('q')
+        self._alive = bytearray()
+        self._postings: Dict[str, array] = {}
+        self._dead = 0
+        for recipe_id, recipe in recipes or ():
+            self.add(recipe_id, recipe)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, recipe_id: Hashable) -> bool:
+        return recipe_id in self._slots
+
+    def add(self, recipe_id: Hashable, recipe: Recipe) -> None:
+        '''
+        Adds a recipe to the index, replacing the recipe already stored under the same id.
+        '''
+        if recipe_id in self._slots:
+            self.remove(recipe_id)
+        self._append(recipe_id, tuple(dict.fromkeys(
+            normalize_ingredient_name(ingredient.name) for ingredient in recipe.ingredients)))
+
+    def _append(self, recipe_id: Hashable, names: Tuple[str, ...]) -> None:
+        slot = len(self._ids)
+        self._slots[recipe_id] = slot
+        self._ids.append(recipe_id)
+        self._names.append(names)
+        self._sizes.append(len(names))
+        self._alive.append(1)
+        for name in names:
+            posting = self._postings.get(name)
+            if posting is None:
+                posting = self._postings[name] = array('q')
+            posting.append(slot)
+
+    def remove(self, recipe_id: Hashable) -> None:
+        '''
+        Removes a recipe from the index.
+
+        Raises:
+            KeyError: If the recipe is not in the index.
+        '''
+        slot = self._slots.pop(recipe_id)
+        self._ids[slot] = None
+        self._alive[slot] = 0
+        self._dead += 1
+        if self._dead >= COMPACT_THRESHOLD and self._dead * 2 >= len(self._ids):
+            self.compact()
+
+    def compact(self) -> None:
+        '''
+        Renumbers the live recipes and rebuilds the posting lists without the removed ones.
+        '''
+        live = [(self._ids[slot], self._names[slot]) for slot in range(len(self._ids)) if self._alive[slot]]
+        self._slots, self._ids, self._names = {}, [], []
+        self._sizes, self._alive, self._postings, self._dead = array('q'), bytearray(), {}, 0
+        for recipe_id, names in live:
+            self._append(recipe_id, names)
+
+    def _posting(self, name: str) -> np.ndarray:
+        posting = self._postings.get(name)
+        return np.frombuffer(posting, dtype=np.int64) if posting else np.empty(0, dtype=np.int64)
+
+    def recipes_with_all(self, ingredient_names: Iterable[str]) -> Set[Hashable]:
+        '''
+        Returns the ids of the recipes that use all of the given ingredients.
+        '''
+        names = {normalize_ingredient_name(name) for name in ingredient_names}
+        if not names:
+            return set(self._slots)
+        # Intersect the shortest posting lists first
+        postings = sorted((self._posting(name) for name in names), key=len)
+        slots = postings[0]
+        for posting in postings[1:]:
+            if not len(slots):
+                break
+            slots = np.intersect1d(slots, posting, assume_unique=True)
+        alive = np.frombuffer(self._alive, dtype=np.uint8)
+        return {self._ids[slot] for slot in slots[alive[slots] == 1].tolist()}
+
+    def recipes_missing_at_most(self, pantry: Iterable[str], k: int) -> List[Tuple[Hashable, int]]:
+        '''
+        Returns the recipes that need at most k ingredients that are not in the pantry.
+
+        Returns:
+            List[Tuple[Hashable, int]]: Pairs of recipe id and number of missing
+                ingredients, fewest missing first.
+        '''
+        if not self._ids:
+            return []
+        names = {normalize_ingredient_name(name) for name in pantry}
+        postings = [self._posting(name) for name in names]
+        matched = np.bincount(np.concatenate(postings) if postings else np.empty(0, dtype=np.int64),
+                              minlength=len(self._ids))
+        missing = np.frombuffer(self._sizes, dtype=np.int64) - matched
+        candidates = np.flatnonzero((missing <= k) & (np.frombuffer(self._alive, dtype=np.uint8) == 1))
+        candidates = candidates[np.argsort(missing[candidates], kind='stable')]
+        return [(self._ids[slot], count) for slot, count in zip(candidates.tolist(), missing[candidates].tolist())]
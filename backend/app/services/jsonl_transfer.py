@@ -0,0 +1,198 @@
+from dataclasses import dataclass, field
+from itertools import islice
+import json
+import os
+from time import perf_counter
+from typing import BinaryIO, Callable, IO, Iterable, Iterator, List, Optional, Tuple, Type, Union
+from bson import ObjectId
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.models.validation import is_valid_object_id
+from app.repositories.base import BaseRepository
+from app.repositories.menu import MenuRepository
+from app.repositories.recipe import RecipeRepository
+
+CHUNK_SIZE = 1000
+
+# Error messages kept in an ImportResult, further errors are only counted
+MAX_ERRORS = 1000
+
+
+@dataclass
+class ImportResult:
+    '''
+    This class reports the progress of a JSON Lines import.
+
+    Attributes:
+        offset (int): The byte offset in the file up to which lines were imported,
+            to resume from after a crash.
+        read (int): The number of lines read.
+        imported (int): The number of items written to storage.
+        invalid (int): The number of lines skipped because they were not valid.
+        errors (List[Tuple[int, List[str]]]): Line numbers, counted from where the import
+            started, with their error messages, for the first MAX_ERRORS invalid lines.
+        elapsed (float): The seconds spent importing.
+    '''
+    offset: int = 0
+    read: int = 0
+    imported: int = 0
+    invalid: int = 0
+    errors: List[Tuple[int, List[str]]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+
+def export_jsonl(items: Iterable, fp: IO[str]) -> int:
+    '''
+    Writes models (e.g. recipes or menus) to a text file as JSON Lines, one to_dict per line.
+
+    Returns:
+        int: The number of items written.
+    '''
+    count = 0
+    for item in items:
+        fp.write(json.dumps(item.to_dict()))
+        fp.write('\n')
+        count += 1
+    return count
+
+
+def export_collection(repository: BaseRepository, fp: IO[str], query: Optional[dict] = None,
+                      chunk_size: int = CHUNK_SIZE) -> int:
+    '''
+    Streams a repository's stored documents to a text file as JSON Lines.
+
+    The documents are read from a cursor in batches of chunk_size, so memory use does not
+    depend on the size of the collection. The _id of each document is written as a string,
+    so that importing the file again replaces the same recipes.
+
+    Returns:
+        int: The number of documents written.
+    '''
+    count = 0
+    for document in repository.collection.find(query or {}).batch_size(chunk_size):
+        document['_id'] = str(document['_id'])
+        fp.write(json.dumps(document))
+        fp.write('\n')
+        count += 1
+    return count
+
+
+def _read_checkpoint(checkpoint_path: Optional[str]) -> int:
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        with open(checkpoint_path, encoding='utf-8') as checkpoint:
+            return int(checkpoint.read().strip() or 0)
+    return 0
+
+
+def _write_checkpoint(checkpoint_path: str, offset: int) -> None:
+    # Replace the file atomically so a crash never leaves a partial offset
+    temporary_path = f'{checkpoint_path}.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as checkpoint:
+        checkpoint.write(str(offset))
+    os.replace(temporary_path, checkpoint_path)
+
+
+def _read_id(document: dict) -> Optional[ObjectId]:
+    if '_id' not in document:
+        return None
+    if not is_valid_object_id(document['_id']):
+        raise ValueError(f'Invalid ObjectId: {document["_id"]}')
+    return ObjectId(document['_id'])
+
+
+def _errors(item) -> Iterator[str]:
+    yield from item.iter_errors()
+    if isinstance(item, Menu):
+        for position, recipe in enumerate(item.recipes):
+            for error in recipe.iter_errors():
+                yield f'Recipe {position}: {error}'
+
+
+def _write(model: Type, repository: BaseRepository, items: list, ids: list) -> None:
+    if model is Menu:
+        repository.save_many(items)
+        return
+    # Recipes with an id are replaced by it, so re-importing a chunk after a crash is harmless.
+    # Titles are not unique, recipes without an id are inserted and only the checkpoint skips them.
+    with_id = [(recipe_id, item) for recipe_id, item in zip(ids, items) if recipe_id is not None]
+    if with_id:
+        repository.replace_many(with_id)
+    if len(with_id) < len(items):
+        repository.insert_many(item for recipe_id, item in zip(ids, items) if recipe_id is None)
+
+
+def import_jsonl(source: Union[str, BinaryIO], model: Type, repository: Union[RecipeRepository, MenuRepository],
+                 chunk_size: int = CHUNK_SIZE, start_offset: Optional[int] = None,
+                 checkpoint_path: Optional[str] = None,
+                 on_progress: Optional[Callable[[ImportResult], None]] = None) -> ImportResult:
+    '''
+    Imports recipes or menus from a JSON Lines file in chunks of chunk_size lines.
+
+    Each chunk is decoded, validated and written to storage in one batch before the next
+    chunk is read, so memory use does not depend on the file size. Invalid lines, including
+    menus with an invalid recipe, are skipped and reported. Recipes carrying an _id, as
+    export_collection writes them, are upserted by it and menus by user and date, so
+    importing a chunk twice does not duplicate it. Recipes without an _id are inserted.
+
+    After each chunk the byte offset reached is written to checkpoint_path, if given, and
+    a later import with the same checkpoint_path resumes from there.
+
+    Args:
+        source (str | BinaryIO): The path of the file, or a file opened in binary mode.
+        model (Type): Recipe or Menu.
+        repository: The repository to write to.
+        chunk_size (int): The number of lines per chunk.
+        start_offset (int): The byte offset to start at, defaults to the checkpoint or 0.
+        checkpoint_path (str): The file to keep the offset in.
+        on_progress (Callable): Called with the running result after each chunk.
+
+    Returns:
+        ImportResult: The counts, errors, offset and time of the import.
+    '''
+    if model not in (Recipe, Menu):
+        raise ValueError(f'Cannot import {model.__name__}, only Recipe and Menu.')
+    if isinstance(source, str):
+        with open(source, 'rb') as fp:
+            return import_jsonl(fp, model, repository, chunk_size, start_offset, checkpoint_path, on_progress)
+
+    offset = _read_checkpoint(checkpoint_path) if start_offset is None else start_offset
+    source.seek(offset)
+    result = ImportResult(offset=offset)
+    start = perf_counter()
+    while lines := list(islice(iter(source.readline, b''), chunk_size)):
+        valid, ids = [], []
+        for line in lines:
+            result.read += 1
+            if not line.strip():
+                continue
+            try:
+                document = json.loads(line)
+                item = model.from_dict(document)
+                item_id = _read_id(document) if model is Recipe else None
+            except (ValueError, KeyError, TypeError) as error:
+                result.invalid += 1
+                if len(result.errors) < MAX_ERRORS:
+                    result.errors.append((result.read, [f'Invalid line: {error!r}']))
+                continue
+            errors = list(_errors(item))
+            if errors:
+                result.invalid += 1
+                if len(result.errors) < MAX_ERRORS:
+                    result.errors.append((result.read, errors))
+                continue
+            valid.append(item)
+            ids.append(item_id)
+        if valid:
+            _write(model, repository, valid, ids)
+        result.imported += len(valid)
+        result.offset += sum(len(line) for line in lines)
+        result.elapsed = perf_counter() - start
+        if checkpoint_path:
+            _write_checkpoint(checkpoint_path, result.offset)
+        if on_progress is not None:
+            on_progress(result)
+    return result
@@ -0,0 +1,148 @@
+from bisect import bisect_left, bisect_right
+from calendar import monthrange
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Optional
+from bson import ObjectId
+from app.models.menu import Menu
+from app.repositories.menu import MenuRepository
+
+
+class MenuCalendar:
+    '''
+    This class holds one user's menus sorted by date.
+
+    The dates are kept as ordinals in a sorted list next to the menus, so looking up a
+    date and reading a date range are binary searches followed by a slice, instead of
+    a scan over all of the user's menus.
+
+    Attributes:
+        user_id (ObjectId): The id of the user who the menus belong to, also when given as a string.
+    '''
+
+    def __init__(self, user_id: ObjectId, menus: Iterable[Menu] = ()) -> None:
+        # The repository reads menus back with ObjectId user_ids, so a string id is converted to match them
+        if not ObjectId.is_valid(user_id):
+            raise ValueError(f'Invalid ObjectId: {user_id}')
+        self.user_id = ObjectId(user_id)
+        self._ordinals: List[int] = []
+        self._menus: List[Menu] = []
+        for menu in sorted(menus, key=lambda menu: menu.date):
+            self.put(menu)
+
+    @classmethod
+    def load(cls, repository: MenuRepository, user_id: ObjectId, start: Optional[date] = None,
+             end: Optional[date] = None) -> 'MenuCalendar':
+        '''
+        Creates the calendar of the user's stored menus between start and end (inclusive).
+        '''
+        return cls(user_id, repository.find_menus(user_id, start, end))
+
+    def __len__(self) -> int:
+        return len(self._menus)
+
+    def __iter__(self) -> Iterator[Menu]:
+        return iter(self._menus)
+
+    def __contains__(self, day: date) -> bool:
+        return self.get(day) is not None
+
+    def _position(self, day: date) -> Optional[int]:
+        ordinal = day.toordinal()
+        position = bisect_left(self._ordinals, ordinal)
+        if position < len(self._ordinals) and self._ordinals[position] == ordinal:
+            return position
+        return None
+
+    def get(self, day: date) -> Optional[Menu]:
+        '''
+        Returns the menu for the date, or None if there is none.
+        '''
+        position = self._position(day)
+        return self._menus[position] if position is not None else None
+
+    def put(self, menu: Menu) -> Optional[Menu]:
+        '''
+        Adds the menu, replacing the menu for the same date.
+
+        Returns:
+            Optional[Menu]: The replaced menu, or None.
+
+        Raises:
+            ValueError: If the menu belongs to another user.
+        '''
+        if menu.user_id != self.user_id and str(menu.user_id) != str(self.user_id):
+            raise ValueError(f'Menu belongs to user {menu.user_id}, not {self.user_id}.')
+        ordinal = menu.date.toordinal()
+        position = bisect_left(self._ordinals, ordinal)
+        if position < len(self._ordinals) and self._ordinals[position] == ordinal:
+            replaced = self._menus[position]
+            self._menus[position] = menu
+            return replaced
+        self._ordinals.insert(position, ordinal)
+        self._menus.insert(position, menu)
+        return None
+
+    def remove(self, day: date) -> Menu:
+        '''
+        Removes and returns the menu for the date, raises an error if there is none.
+        '''
+        position = self._position(day)
+        if position is None:
+            raise ValueError(f'No menu on {day.isoformat()}.')
+        del self._ordinals[position]
+        return self._menus.pop(position)
+
+    def range(self, start: date, end: date) -> List[Menu]:
+        '''
+        Returns the menus between start and end (inclusive), sorted by date.
+        '''
+        low = bisect_left(self._ordinals, start.toordinal())
+        high = bisect_right(self._ordinals, end.toordinal(), low)
+        return self._menus[low:high]
+
+    def month(self, year: int, month: int) -> List[Optional[Menu]]:
+        '''
+        Returns the month view: one entry per day of the month, the menu or None.
+        '''
+        first = date(year, month, 1)
+        days = [None] * monthrange(year, month)[1]
+        for menu in self.range(first, first.replace(day=len(days))):
+            days[menu.date.day - 1] = menu
+        return days
+
+    def copy_week(self, source_start: date, target_start: date, overwrite: bool = False) -> List[Menu]:
+        '''
+        Copies the menus of the 7 days from source_start to the 7 days from target_start.
+
+        The copies are new Menus with new recipes lists, but share the Recipe objects with
+        the source menus, which are not copied.
+
+        Args:
+            source_start (date): The first day of the week to copy.
+            target_start (date): The first day of the week to copy to.
+            overwrite (bool): Whether copies replace menus already on the target days.
+
+        Returns:
+            List[Menu]: The new menus, sorted by date.
+
+        Raises:
+            ValueError: If the weeks overlap, or a target day has a menu and overwrite is False.
+        '''
+        offset = target_start - source_start
+        if abs(offset.days) < 7:
+            raise ValueError('The source and target weeks overlap.')
+        sources = self.range(source_start, source_start + timedelta(days=6))
+        if not overwrite:
+            for menu in sources:
+                if menu.date + offset in self:
+                    raise ValueError(f'There is already a menu on {(menu.date + offset).isoformat()}.')
+        copies = [Menu(user_id=self.user_id, date=menu.date + offset, recipes=list(menu.recipes)) for menu in sources]
+        for copy in copies:
+            self.put(copy)
+        return copies
+
+    def copy_last_week(self, week_start: date, overwrite: bool = False) -> List[Menu]:
+        '''
+        Copies the menus of the 7 days before week_start to the 7 days from week_start.
+        '''
+        return self.copy_week(week_start - timedelta(days=7), week_start, overwrite)
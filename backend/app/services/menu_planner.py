@@ -0,0 +1,185 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+import random
+from typing import Dict, Hashable, List, Optional, Sequence
+from app.models.menu import Menu
+from app.models.quantity import parse_prep_time
+from app.models.recipe import Recipe
+from app.services.ingredient_index import normalize_ingredient_name
+
+
+@dataclass
+class PlanConstraints:
+    '''
+    This class represents the rules a menu plan must follow.
+
+    Attributes:
+        days (int): The number of days to plan, e.g. 7 for a week.
+        recipes_per_day (int): The number of recipes planned for each day.
+        max_prep_minutes_per_day (float): The prep-time budget of each day, or None for no budget.
+            Recipes without a parsable prep time count as 0 minutes.
+        no_repeat_days (int): A recipe is not planned again within this many days.
+        separate_meat_and_dairy (bool): Whether meat and dairy recipes are kept on separate days.
+        candidates_per_pick (int): The number of random recipes considered for each pick,
+            or None to consider the whole catalog. If none of them fits, the whole catalog
+            is considered.
+    '''
+    days: int = 7
+    recipes_per_day: int = 3
+    max_prep_minutes_per_day: Optional[float] = None
+    no_repeat_days: int = 7
+    separate_meat_and_dairy: bool = True
+    candidates_per_pick: Optional[int] = 200
+
+
+class _Catalog:
+    '''
+    The recipes reduced to what the planner needs, small enough to send to worker processes.
+
+    Ingredients are stored as bitmasks over the catalog's ingredient names, so the overlap
+    of a recipe with the plan so far is a single AND and bit count.
+    '''
+
+    def __init__(self, recipes: Sequence[Recipe]) -> None:
+        codes: Dict[str, int] = {}
+        self.masks: List[int] = []
+        self.categories: List[str] = []
+        self.prep_minutes: List[float] = []
+        for recipe in recipes:
+            mask = 0
+            for ingredient in recipe.ingredients:
+                mask |= 1 << codes.setdefault(normalize_ingredient_name(ingredient.name), len(codes))
+            self.masks.append(mask)
+            self.categories.append(recipe.category)
+            self.prep_minutes.append(parse_prep_time(recipe.prep_time) or 0.0)
+
+
+def _plan_days(catalog: _Catalog, constraints: PlanConstraints, seed) -> List[List[int]]:
+    '''
+    Picks the catalog positions of the recipes for each day.
+
+    Each pick is the allowed recipe that shares the most ingredients with the recipes
+    already planned while adding the fewest new ones, so the shopping list stays short.
+    '''
+    rng = random.Random(seed)
+    positions = range(len(catalog.masks))
+    last_planned: Dict[int, int] = {}
+    plan_mask = 0
+    days = []
+    for day in range(constraints.days):
+        chosen: List[int] = []
+        day_categories = set()
+        prep_minutes = 0.0
+
+        def best_of(candidates) -> Optional[int]:
+            best, best_score = None, None
+            for position in candidates:
+                if position in chosen:
+                    continue
+                planned_day = last_planned.get(position)
+                if planned_day is not None and day - planned_day < constraints.no_repeat_days:
+                    continue
+                category = catalog.categories[position]
+                if constraints.separate_meat_and_dairy and (
+                        (category == 'meat' and 'dairy' in day_categories)
+                        or (category == 'dairy' and 'meat' in day_categories)):
+                    continue
+                if (constraints.max_prep_minutes_per_day is not None
+                        and prep_minutes + catalog.prep_minutes[position] > constraints.max_prep_minutes_per_day):
+                    continue
+                mask = catalog.masks[position]
+                score = (mask & plan_mask).bit_count() - (mask & ~plan_mask).bit_count()
+                if best_score is None or score > best_score:
+                    best, best_score = position, score
+            return best
+
+        for _ in range(constraints.recipes_per_day):
+            best = None
+            if constraints.candidates_per_pick and constraints.candidates_per_pick < len(positions):
+                best = best_of(rng.sample(positions, constraints.candidates_per_pick))
+            if best is None:
+                # No sample, or no sampled recipe fits: check the whole catalog before leaving the pick empty
+                candidates = list(positions)
+                rng.shuffle(candidates)
+                best = best_of(candidates)
+            if best is None:
+                break
+            chosen.append(best)
+            day_categories.add(catalog.categories[best])
+            prep_minutes += catalog.prep_minutes[best]
+            last_planned[best] = day
+            plan_mask |= catalog.masks[best]
+        days.append(chosen)
+    return days
+
+
+class MenuPlanner:
+    '''
+    This class plans a week or month of menus for users from a catalog of recipes.
+
+    Attributes:
+        recipes (Sequence[Recipe]): The recipes to plan from.
+        constraints (PlanConstraints): The rules the plans follow.
+    '''
+
+    def __init__(self, recipes: Sequence[Recipe], constraints: Optional[PlanConstraints] = None) -> None:
+        self.recipes = list(recipes)
+        self.constraints = constraints or PlanConstraints()
+        self._catalog = _Catalog(self.recipes)
+
+    def _to_menus(self, user_id, start: date, days: List[List[int]]) -> List[Menu]:
+        return [
+            Menu(user_id=user_id, date=start + timedelta(days=day), recipes=[self.recipes[i] for i in positions])
+            for day, positions in enumerate(days) if positions
+        ]
+
+    def plan(self, user_id, start: date, seed=None) -> List[Menu]:
+        '''
+        Plans the menus of a user from the start date.
+
+        Days for which no recipe fits the constraints get no menu.
+
+        Args:
+            user_id (ObjectId): The user the menus belong to.
+            start (date): The date of the first menu.
+            seed: Seed for the random choice between equally good recipes, defaults to the user_id.
+
+        Returns:
+            List[Menu]: The menus, in date order.
+        '''
+        seed = str(user_id) if seed is None else seed
+        return self._to_menus(user_id, start, _plan_days(self._catalog, self.constraints, seed))
+
+    def plan_many(self, user_ids: Sequence[Hashable], start: date,
+                  processes: Optional[int] = None, chunksize: int = 64) -> Dict[Hashable, List[Menu]]:
+        '''
+        Plans the menus of many users, e.g. in a nightly batch.
+
+        With processes set, the plans are made in a process pool. The workers receive the
+        compact catalog once and only send back recipe positions, the menus are built here
+        and share the planner's recipe objects.
+
+        Returns:
+            Dict[Hashable, List[Menu]]: The menus of each user.
+        '''
+        if not processes:
+            return {user_id: self.plan(user_id, start) for user_id in user_ids}
+        seeds = [str(user_id) for user_id in user_ids]
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(self._catalog, self.constraints)) as executor:
+            plans = executor.map(_plan_in_worker, seeds, chunksize=chunksize)
+            return {user_id: self._to_menus(user_id, start, days) for user_id, days in zip(user_ids, plans)}
+
+
+_worker_catalog: Optional[_Catalog] = None
+_worker_constraints: Optional[PlanConstraints] = None
+
+
+def _init_worker(catalog: _Catalog, constraints: PlanConstraints) -> None:
+    global _worker_catalog, _worker_constraints
+    _worker_catalog, _worker_constraints = catalog, constraints
+
+
+def _plan_in_worker(seed: str) -> List[List[int]]:
+    return _plan_days(_worker_catalog, _worker_constraints, seed)
@@ -0,0 +1,267 @@
+import csv
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from app.models.menu import Menu
+from app.models.quantity import parse_quantity
+from app.models.recipe import Recipe
+from app.services.ingredient_index import normalize_ingredient_name
+
+# The values kept per unit of an ingredient, in this column order
+NUTRIENTS = ('calories', 'cost', 'grams')
+
+IngredientKey = Tuple[str, str]
+
+
+class NutritionTable:
+    '''
+    This class is a local lookup table of the calories, cost and weight of ingredients.
+
+    Values are stored per base unit of the ingredient (see Quantity.unit), so an entry
+    given per kilogram is stored per gram, and one per cup is stored per ml. Ingredients
+    counted in pieces use the unit '' (e.g. an egg) or their own unit (e.g. slice).
+    '''
+
+    def __init__(self) -> None:
+        self._rows: Dict[IngredientKey, np.ndarray] = {}
+        # Bumped on every change, so derived totals know when they are stale
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, name: str, unit: str, calories: float = 0.0, cost: float = 0.0, grams: float = 0.0) -> None:
+        '''
+        Adds the values of one unit of the ingredient, e.g. add('Flour', 'kg', 3640, 1.2, 1000).
+
+        Raises:
+            ValueError: If the unit is not a unit of a quantity.
+        '''
+        quantity = parse_quantity(f'1 {unit}')
+        if quantity is None or quantity.amount == 0:
+            raise ValueError(f'Invalid unit: {unit}')
+        values = np.array([calories, cost, grams], dtype=np.float64) / quantity.amount
+        self._rows[normalize_ingredient_name(name), quantity.unit] = values
+        self.version += 1
+
+    def get(self, name: str, unit: str) -> Optional[np.ndarray]:
+        '''
+        Returns the values of one base unit of the ingredient, or None if it is unknown.
+        '''
+        return self._rows.get((normalize_ingredient_name(name), unit))
+
+    def lookup(self, keys: Sequence[IngredientKey]) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+        Returns the values for normalized (name, base unit) keys as a (keys x NUTRIENTS)
+        matrix, with zeros for unknown keys, and a mask of the known keys.
+        '''
+        values = np.zeros((len(keys), len(NUTRIENTS)), dtype=np.float64)
+        known = np.zeros(len(keys), dtype=bool)
+        for position, key in enumerate(keys):
+            row = self._rows.get(key)
+            if row is not None:
+                values[position] = row
+                known[position] = True
+        return values, known
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping]) -> 'NutritionTable':
+        '''
+        Creates a table from mappings with a name, a unit and the NUTRIENTS values.
+        '''
+        table = cls()
+        for row in rows:
+            table.add(row['name'], row['unit'], **{name: float(row.get(name) or 0) for name in NUTRIENTS})
+        return table
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'NutritionTable':
+        '''
+        Creates a table from a CSV file with a header of name, unit and the NUTRIENTS columns.
+        '''
+        with open(path, newline='', encoding='utf-8') as fp:
+            return cls.from_rows(csv.DictReader(fp))
+
+
+@dataclass
+class Rollup:
+    '''
+    This class holds the totals of a set of menus or recipes, one row per menu or recipe.
+
+    Attributes:
+        totals (np.ndarray): The summed NUTRIENTS, a (rows x NUTRIENTS) matrix.
+        missing (np.ndarray): The number of ingredients without nutrition values or with
+            an unparsable quantity, per row.
+    '''
+    totals: np.ndarray
+    missing: np.ndarray
+
+    def as_dicts(self) -> List[dict]:
+        '''
+        Returns each row as a dictionary of its NUTRIENTS and missing count.
+        '''
+        return [{**dict(zip(NUTRIENTS, row.tolist())), 'missing': int(missing)}
+                for row, missing in zip(self.totals, self.missing)]
+
+
+class IngredientTable:
+    '''
+    This class holds the ingredients of a set of recipes as columns.
+
+    Each parsed ingredient is a row of the recipe it belongs to, an ingredient id and its
+    amount in the base unit. Ingredient ids stand for a normalized (name, base unit) key,
+    and the unit of each id is kept as a code into units. The rows are grouped by recipe,
+    so scaling and totals are numpy operations over whole columns.
+
+    Recipes are identified by identity and kept referenced by the table. The table is a
+    snapshot: a recipe whose ingredients change must be added to a new table.
+
+    Attributes:
+        recipes (List[Recipe]): The recipes, in the order of their rows.
+        recipe (np.ndarray): The position of the recipe of each row.
+        ingredient (np.ndarray): The ingredient id of each row.
+        amount (np.ndarray): The amount of each row, in the base unit.
+        keys (List[IngredientKey]): The (normalized name, base unit) of each ingredient id.
+        units (List[str]): The base units, indexed by unit_code.
+        unit_code (np.ndarray): The unit code of each ingredient id.
+        unparsed (np.ndarray): The number of ingredients with an unparsable quantity, per recipe.
+    '''
+
+    def __init__(self, recipes: Iterable[Recipe] = ()) -> None:
+        self.recipes: List[Recipe] = []
+        self.keys: List[IngredientKey] = []
+        self.units: List[str] = []
+        self._positions: Dict[int, int] = {}
+        self._ids: Dict[IngredientKey, int] = {}
+        self._unit_codes: Dict[str, int] = {}
+        self.recipe = np.empty(0, dtype=np.int32)
+        self.ingredient = np.empty(0, dtype=np.int32)
+        self.amount = np.empty(0, dtype=np.float64)
+        self.unit_code = np.empty(0, dtype=np.int16)
+        self.unparsed = np.empty(0, dtype=np.int32)
+        # The last recipe_totals, with the nutrition table, its version and the recipe count
+        self._totals: Optional[Tuple[NutritionTable, int, int, 'Rollup']] = None
+        self.extend(recipes)
+
+    def __len__(self) -> int:
+        return len(self.recipes)
+
+    def position(self, recipe: Recipe) -> Optional[int]:
+        '''
+        Returns the position of the recipe in the table, or None if it was not added.
+        '''
+        return self._positions.get(id(recipe))
+
+    def extend(self, recipes: Iterable[Recipe]) -> None:
+        '''
+        Adds the recipes that are not in the table yet, parsing their ingredients once.
+        '''
+        recipe_column: List[int] = []
+        ingredient_column: List[int] = []
+        amount_column: List[float] = []
+        unparsed: List[int] = []
+        first_key = len(self.keys)
+        for recipe in recipes:
+            if id(recipe) in self._positions:
+                continue
+            position = self._positions[id(recipe)] = len(self.recipes)
+            self.recipes.append(recipe)
+            failed = 0
+            for ingredient in recipe.ingredients:
+                quantity = parse_quantity(ingredient.quantity)
+                if quantity is None:
+                    failed += 1
+                    continue
+                key = (normalize_ingredient_name(ingredient.name), quantity.unit)
+                ingredient_id = self._ids.get(key)
+                if ingredient_id is None:
+                    ingredient_id = self._ids[key] = len(self.keys)
+                    self.keys.append(key)
+                recipe_column.append(position)
+                ingredient_column.append(ingredient_id)
+                amount_column.append(quantity.amount)
+            unparsed.append(failed)
+
+        unit_codes = []
+        for _, unit in self.keys[first_key:]:
+            code = self._unit_codes.get(unit)
+            if code is None:
+                code = self._unit_codes[unit] = len(self.units)
+                self.units.append(unit)
+            unit_codes.append(code)
+        self.unit_code = np.concatenate((self.unit_code, np.array(unit_codes, dtype=np.int16)))
+        self.recipe = np.concatenate((self.recipe, np.array(recipe_column, dtype=np.int32)))
+        self.ingredient = np.concatenate((self.ingredient, np.array(ingredient_column, dtype=np.int32)))
+        self.amount = np.concatenate((self.amount, np.array(amount_column, dtype=np.float64)))
+        self.unparsed = np.concatenate((self.unparsed, np.array(unparsed, dtype=np.int32)))
+
+    def scaled_amounts(self, factors) -> np.ndarray:
+        '''
+        Returns the amount column with the rows of each recipe multiplied by its factor,
+        e.g. the wanted servings over the servings the recipe is written for.
+
+        Args:
+            factors: One factor per recipe, or a single factor for all recipes.
+        '''
+        factors = np.asarray(factors, dtype=np.float64)
+        return self.amount * (factors[self.recipe] if factors.ndim else factors)
+
+    def recipe_totals(self, nutrition: NutritionTable) -> Rollup:
+        '''
+        Returns the NUTRIENTS of every recipe in the table, one row per recipe.
+
+        The result is kept until recipes are added or the nutrition table changes.
+        '''
+        cached = self._totals
+        if cached is not None and cached[0] is nutrition and cached[1:3] == (nutrition.version, len(self.recipes)):
+            return cached[3]
+        values, known = nutrition.lookup(self.keys)
+        count = len(self.recipes)
+        row_values = values[self.ingredient] * self.amount[:, None]
+        totals = np.column_stack([np.bincount(self.recipe, weights=row_values[:, column], minlength=count)
+                                  for column in range(len(NUTRIENTS))])
+        unknown = (~known[self.ingredient]).astype(np.float64)
+        missing = np.bincount(self.recipe, weights=unknown, minlength=count).astype(np.int32)
+        rollup = Rollup(totals=totals, missing=missing + self.unparsed)
+        self._totals = (nutrition, nutrition.version, count, rollup)
+        return rollup
+
+    def recipe_rollup(self, recipes: Sequence[Recipe], nutrition: NutritionTable, factors=1.0) -> Rollup:
+        '''
+        Returns the NUTRIENTS of the recipes, each scaled by its factor (or one factor for all).
+        '''
+        self.extend(recipes)
+        per_recipe = self.recipe_totals(nutrition)
+        positions = np.array([self._positions[id(recipe)] for recipe in recipes], dtype=np.int64)
+        factors = np.broadcast_to(np.asarray(factors, dtype=np.float64), positions.shape)
+        return Rollup(totals=per_recipe.totals[positions] * factors[:, None], missing=per_recipe.missing[positions])
+
+    def menu_rollup(self, menus: Sequence[Menu], nutrition: NutritionTable, servings=1.0) -> Rollup:
+        '''
+        Returns the NUTRIENTS of the menus, summing the recipes of each menu.
+
+        Recipes not in the table yet are added. The totals of each distinct recipe are
+        computed once, then gathered and summed per menu.
+
+        Args:
+            menus (Sequence[Menu]): The menus.
+            nutrition (NutritionTable): The values of the ingredients.
+            servings: A factor per menu, or a single factor for all menus, that scales
+                all of its recipes.
+
+        Returns:
+            Rollup: One row per menu.
+        '''
+        self.extend(recipe for menu in menus for recipe in menu.recipes)
+        per_recipe = self.recipe_totals(nutrition)
+        positions = self._positions
+        recipe_positions = np.array([positions[id(recipe)] for menu in menus for recipe in menu.recipes],
+                                    dtype=np.int64)
+        menu_rows = np.repeat(np.arange(len(menus)), [len(menu.recipes) for menu in menus])
+        weights = np.broadcast_to(np.asarray(servings, dtype=np.float64), (len(menus),))[menu_rows]
+        gathered = per_recipe.totals[recipe_positions] * weights[:, None]
+        totals = np.column_stack([np.bincount(menu_rows, weights=gathered[:, column], minlength=len(menus))
+                                  for column in range(len(NUTRIENTS))])
+        missing = np.bincount(menu_rows, weights=per_recipe.missing[recipe_positions],
+                              minlength=len(menus)).astype(np.int32)
+        return Rollup(totals=totals, missing=missing)
@@ -0,0 +1,168 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+import threading
+from typing import Callable, Deque, Optional, Tuple
+import bcrypt
+from app.models.user import User
+
+DEFAULT_ROUNDS = 12
+
+
+def _hash_password(password: str, rounds: int) -> str:
+    '''
+    Hashes a password with bcrypt, module level so it can run in a process pool.
+    '''
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def _check_password(password: str, hashed_password: str) -> bool:
+    '''
+    Checks a password against a bcrypt hash, module level so it can run in a process pool.
+    '''
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+class PasswordHasher:
+    '''
+    This class runs User password hashing and checking on a bounded worker pool.
+
+    bcrypt releases the GIL, so a thread pool already spreads the work over several
+    cores; a process pool can be used instead. At most max_pending calls are queued or
+    running at once, further calls wait for a free slot so a login storm cannot grow
+    the queue without limit. The async variants wait on a future of their event loop,
+    which is handed the next free slot, so waiting holds no thread.
+
+    Attributes:
+        rounds (int): The bcrypt cost factor used for new hashes.
+        max_workers (int): The number of worker threads or processes.
+        max_pending (int): The number of calls that can be queued or running at once.
+    '''
+
+    def __init__(self, max_workers: int = 4, rounds: int = DEFAULT_ROUNDS,
+                 use_processes: bool = False, max_pending: Optional[int] = None) -> None:
+        if not 4 <= rounds <= 31:
+            raise ValueError(f'Invalid bcrypt rounds: {rounds}')
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_pending = max_pending or max_workers * 4
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        # Coroutines waiting for a slot, with their event loop, guarded by _lock
+        self._lock = threading.Lock()
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._executor: Executor = pool(max_workers=max_workers)
+
+    def __enter__(self) -> 'PasswordHasher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def shutdown(self, wait: bool = True) -> None:
+        '''
+        Shuts down the worker pool.
+        '''
+        self._executor.shutdown(wait=wait)
+
+    def _submit(self, transform: Callable, function: Callable, *args) -> Future:
+        '''
+        Runs function on the pool and returns a future for transform(result).
+
+        The caller's slot is released once the result is available.
+        '''
+        outer: Future = Future()
+        try:
+            inner = self._executor.submit(function, *args)
+        except BaseException:
+            self._release()
+            raise
+
+        def done(inner_future: Future) -> None:
+            self._release()
+            try:
+                outer.set_result(transform(inner_future.result()))
+            except BaseException as error:
+                outer.set_exception(error)
+
+        inner.add_done_callback(done)
+        return outer
+
+    def hash_password_future(self, user: User) -> Future:
+        '''
+        Hashes the user's password on the pool, blocking while the pool is full.
+
+        Returns:
+            Future: Resolves to None once user.user_password holds the hash.
+        '''
+        self._slots.acquire()
+        return self._submit(lambda hashed: setattr(user, 'user_password', hashed),
+                            _hash_password, user.user_password, self.rounds)
+
+    def check_password_future(self, user: User, password: str) -> Future:
+        '''
+        Checks the password against the user's hashed password on the pool, blocking while the pool is full.
+
+        Returns:
+            Future: Resolves to True if the passwords match, False otherwise.
+        '''
+        self._slots.acquire()
+        return self._submit(bool, _check_password, password, user.user_password)
+
+    def _release(self) -> None:
+        '''
+        Frees a slot, handing it to the first waiting coroutine if there is one.
+        '''
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                if not waiter.done():
+                    loop.call_soon_threadsafe(self._hand_over, waiter)
+                    return
+            self._slots.release()
+
+    def _hand_over(self, waiter: asyncio.Future) -> None:
+        '''
+        Gives a released slot to a waiting coroutine, on its event loop.
+        '''
+        if waiter.done():
+            # Cancelled after the slot was released to it, pass the slot on
+            self._release()
+        else:
+            waiter.set_result(None)
+
+    async def _acquire(self) -> None:
+        '''
+        Waits for a free slot without blocking the event loop.
+        '''
+        with self._lock:
+            if self._slots.acquire(blocking=False):
+                return
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # The task can be cancelled after the slot was handed over
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+
+    async def hash_password(self, user: User) -> None:
+        '''
+        Hashes the user's password on the pool.
+        '''
+        await self._acquire()
+        await asyncio.wrap_future(self._submit(lambda hashed: setattr(user, 'user_password', hashed),
+                                               _hash_password, user.user_password, self.rounds))
+
+    async def check_password(self, user: User, password: str) -> bool:
+        '''
+        Checks the password against the user's hashed password on the pool.
+
+        Returns:
+            bool: True if the passwords match, False otherwise.
+        '''
+        await self._acquire()
+        return await asyncio.wrap_future(self._submit(bool, _check_password, password, user.user_password))
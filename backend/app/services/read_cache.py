@@ -0,0 +1,183 @@
+from dataclasses import asdict, dataclass
+from datetime import date
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import bson
+from cachetools import Cache, TTLCache
+from app.models.signals import menu_changed, recipe_changed
+from app.repositories.menu import MenuRepository
+from app.repositories.recipe import RecipeRepository
+
+
+@dataclass
+class CacheStats:
+    '''
+    This class holds the counters of a cache, for monitoring.
+
+    Attributes:
+        hits (int): Reads served from the cache.
+        misses (int): Reads that went to storage.
+        evictions (int): Entries dropped to stay under the size limit.
+        expirations (int): Entries dropped because their time to live passed.
+        invalidations (int): Entries dropped because the stored data changed.
+    '''
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class _CountingTTLCache(TTLCache):
+    '''
+    A TTLCache that counts the entries it evicts and expires.
+    '''
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float], stats: CacheStats) -> None:
+        super().__init__(maxsize, ttl, timer)
+        self.stats = stats
+
+    def popitem(self):
+        item = super().popitem()
+        self.stats.evictions += 1
+        return item
+
+    def expire(self, time=None):
+        # Count the stored entries, len() already leaves out the expired ones
+        size = Cache.currsize.fget(self)
+        expired = super().expire(time)
+        self.stats.expirations += size - Cache.currsize.fget(self)
+        return expired
+
+
+class ReadThroughCache:
+    '''
+    This class caches stored recipes by id and menus by user and date in front of the
+    repositories, with size and time-to-live limits.
+
+    The cached values are the stored documents, i.e. the to_dict output with its _id.
+    They are kept encoded as BSON and decoded on every read, so each reader gets its own
+    document and may change it, e.g. with to_json. Entries are dropped when the
+    menu_changed or recipe_changed signals report a change: adding or removing recipes
+    on a Menu, saving menus, and updating or deleting recipes through the repository.
+
+    Storage is read outside the lock. A key invalidated while it is being read is not
+    cached from that read, as the document may predate the change.
+
+    Attributes:
+        stats (CacheStats): The hit, miss, eviction, expiration and invalidation counters.
+    '''
+
+    def __init__(self, recipes: RecipeRepository, menus: MenuRepository, maxsize: int = 10000,
+                 ttl: float = 300, timer: Callable[[], float] = time.monotonic) -> None:
+        self._recipes_repository = recipes
+        self._menus_repository = menus
+        self.stats = CacheStats()
+        self._lock = threading.RLock()
+        self._limits = (maxsize, ttl, timer)
+        # (cache name, key) -> [reads from storage in progress, invalidations since they started]
+        self._loading: Dict[tuple, List[int]] = {}
+        self._create_caches()
+        menu_changed.connect(self._on_menu_changed)
+        recipe_changed.connect(self._on_recipe_changed)
+
+    def _create_caches(self) -> None:
+        maxsize, ttl, timer = self._limits
+        self._recipes = _CountingTTLCache(maxsize, ttl, timer, self.stats)
+        self._menus = _CountingTTLCache(maxsize, ttl, timer, self.stats)
+        # (user_id, title) -> id of the cached recipes, to invalidate changes made by title
+        self._recipe_ids: TTLCache = TTLCache(maxsize, ttl, timer)
+
+    def close(self) -> None:
+        '''
+        Stops listening to changes.
+        '''
+        menu_changed.disconnect(self._on_menu_changed)
+        recipe_changed.disconnect(self._on_recipe_changed)
+
+    def _get(self, name: str, key, load: Callable[[], Optional[dict]]) -> Optional[dict]:
+        with self._lock:
+            data = getattr(self, name).get(key)
+            if data is not None:
+                self.stats.hits += 1
+                return bson.decode(data)
+            self.stats.misses += 1
+            loading = self._loading.setdefault((name, key), [0, 0])
+            loading[0] += 1
+            generation = loading[1]
+        document = None
+        try:
+            document = load()
+        finally:
+            with self._lock:
+                loading[0] -= 1
+                if not loading[0]:
+                    del self._loading[(name, key)]
+                if document is not None and loading[1] == generation:
+                    getattr(self, name)[key] = bson.encode(document)
+        return document
+
+    def get_recipe(self, recipe_id) -> Optional[dict]:
+        '''
+        Returns the stored recipe with the given id.
+        '''
+        key = str(recipe_id)
+        document = self._get('_recipes', key, lambda: self._recipes_repository.find_by_id(recipe_id))
+        if document is not None:
+            with self._lock:
+                self._recipe_ids[(document['user_id'], document['title'])] = key
+        return document
+
+    def get_menu(self, user_id, menu_date: date) -> Optional[dict]:
+        '''
+        Returns the user's stored menu for the date.
+        '''
+        return self._get('_menus', (str(user_id), menu_date.isoformat()),
+                         lambda: self._menus_repository.find(user_id, menu_date))
+
+    def _invalidate(self, name: str, key) -> None:
+        with self._lock:
+            loading = self._loading.get((name, key))
+            if loading is not None:
+                loading[1] += 1
+            if getattr(self, name).pop(key, None) is not None:
+                self.stats.invalidations += 1
+
+    def invalidate_recipe(self, recipe_id) -> None:
+        '''
+        Drops the cached recipe with the given id.
+        '''
+        self._invalidate('_recipes', str(recipe_id))
+
+    def invalidate_menu(self, user_id, menu_date: date) -> None:
+        '''
+        Drops the user's cached menu for the date.
+        '''
+        self._invalidate('_menus', (str(user_id), menu_date.isoformat()))
+
+    def _on_menu_changed(self, menu, **kwargs) -> None:
+        self.invalidate_menu(menu.user_id, menu.date)
+
+    def _on_recipe_changed(self, sender, recipe_id=None, user_id=None, title=None, **kwargs) -> None:
+        if recipe_id is None:
+            with self._lock:
+                recipe_id = self._recipe_ids.get((user_id, title))
+        if recipe_id is not None:
+            self.invalidate_recipe(recipe_id)
+
+    def clear(self) -> None:
+        '''
+        Drops all cached entries.
+        '''
+        with self._lock:
+            for loading in self._loading.values():
+                loading[1] += 1
+            self._create_caches()
+
+    def stats_dict(self) -> dict:
+        '''
+        Returns the counters and current sizes of the cache, for monitoring.
+        '''
+        with self._lock:
+            return {**asdict(self.stats), 'recipes': len(self._recipes), 'menus': len(self._menus)}
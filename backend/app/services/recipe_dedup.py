@@ -0,0 +1,257 @@
+from concurrent.futures import ProcessPoolExecutor
+import re
+from typing import Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+from zlib import crc32
+import numpy as np
+from app.models.recipe import Recipe
+from app.services.ingredient_index import normalize_ingredient_name
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Odd 64-bit multiplier for combining the rows of a band into one key
+_BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+# Recipes hashed together, bounding the (shingles x num_perm) matrix of a block
+_BLOCK_SIZE = 256
+
+RecipeText = Tuple[str, Sequence[str], Sequence[str]]
+
+
+def recipe_shingles(title: str, ingredient_names: Iterable[str], steps: Iterable[str]) -> Set[str]:
+    '''
+    Returns the fingerprint features of a recipe: the words of its title, its normalized
+    ingredient names and the pairs of consecutive words in its steps.
+    '''
+    shingles = {'t:' + word for word in WORD_PATTERN.findall(title.casefold())}
+    shingles.update('i:' + normalize_ingredient_name(name) for name in ingredient_names)
+    words = WORD_PATTERN.findall(' '.join(steps).casefold())
+    shingles.update(f's:{first} {second}' for first, second in zip(words, words[1:]))
+    if len(words) == 1:
+        shingles.add('s:' + words[0])
+    return shingles
+
+
+def _recipe_text(recipe: Recipe) -> RecipeText:
+    return recipe.title, [ingredient.name for ingredient in recipe.ingredients], list(recipe.steps)
+
+
+def _minhash(texts: Sequence[RecipeText], multipliers: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    '''
+    Returns the MinHash signatures of the recipes, one row of 32-bit values per recipe.
+
+    Each shingle is hashed with crc32 and then permuted by multiply-shift hashing, one
+    permutation per column, and each column keeps the smallest value of the recipe.
+    '''
+    signatures = np.empty((len(texts), len(multipliers)), dtype=np.uint32)
+    for block_start in range(0, len(texts), _BLOCK_SIZE):
+        hashes, starts = [], []
+        for text in texts[block_start:block_start + _BLOCK_SIZE]:
+            starts.append(len(hashes))
+            hashes.extend(crc32(shingle.encode()) for shingle in recipe_shingles(*text))
+            if len(hashes) == starts[-1]:
+                hashes.append(0)
+        values = np.array(hashes, dtype=np.uint64)[:, None] * multipliers + offsets
+        permuted = (values >> np.uint64(32)).astype(np.uint32)
+        block = np.minimum.reduceat(permuted, starts, axis=0)
+        signatures[block_start:block_start + len(block)] = block
+    return signatures
+
+
+_worker_permutations: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+
+def _init_worker(multipliers: np.ndarray, offsets: np.ndarray) -> None:
+    global _worker_permutations
+    _worker_permutations = multipliers, offsets
+
+
+def _minhash_in_worker(texts: Sequence[RecipeText]) -> np.ndarray:
+    return _minhash(texts, *_worker_permutations)
+
+
+class NearDuplicateIndex:
+    '''
+    This class finds near-duplicate recipes with MinHash and locality-sensitive hashing.
+
+    Every recipe gets a slot and a MinHash signature of its shingles (see recipe_shingles).
+    The signature is cut into bands, and recipes whose signatures agree on a whole band
+    are candidates, so a new recipe is only compared to the few recipes sharing one of
+    its band keys instead of the whole catalog. Candidates are near-duplicates if their
+    signatures agree on at least threshold of their values, i.e. their estimated Jaccard
+    similarity. Near-duplicates are grouped, and each group is represented by its
+    earliest recipe.
+
+    The band keys are kept in sorted segments searched with binary search, and segments
+    of similar size are merged as recipes are added, like the parts of a log-structured
+    merge tree. Signatures are kept as their low 16 bits for the comparison, which
+    changes the estimate by about 1 in 65536.
+
+    Attributes:
+        threshold (float): The smallest estimated similarity of near-duplicates.
+        num_perm (int): The number of values in a signature.
+        bands (int): The number of bands, more bands find less similar candidates.
+    '''
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 128, bands: int = 16,
+                 max_candidates: int = 8, seed: int = 1) -> None:
+        if num_perm % bands:
+            raise ValueError(f'num_perm ({num_perm}) must be a multiple of bands ({bands}).')
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        # Recipes compared per shared band key, enough to reach a group through any member
+        self._max_candidates = max_candidates
+        rng = np.random.default_rng(seed)
+        self._multipliers = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._offsets = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._keys: List[Hashable] = []
+        self._signatures = np.empty((1024, num_perm), dtype=np.uint16)
+        self._parents: List[int] = []
+        # Sorted band keys (rows x bands) with the slot of each key, sorted per band
+        self._segments: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def signatures(self, recipes: Sequence[Recipe], processes: Optional[int] = None,
+                   chunksize: int = 2000) -> np.ndarray:
+        '''
+        Returns the MinHash signatures of the recipes, computed in a process pool if processes is set.
+        '''
+        texts = [_recipe_text(recipe) for recipe in recipes]
+        if not processes or len(texts) <= chunksize:
+            return _minhash(texts, self._multipliers, self._offsets)
+        chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(self._multipliers, self._offsets)) as executor:
+            return np.concatenate(list(executor.map(_minhash_in_worker, chunks)))
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        rows = signatures.reshape(len(signatures), self.bands, -1).astype(np.uint64)
+        keys = np.zeros((len(signatures), self.bands), dtype=np.uint64)
+        for row in range(rows.shape[2]):
+            keys = keys * _BAND_MULTIPLIER + rows[:, :, row]
+        return keys
+
+    @staticmethod
+    def _sorted(keys: np.ndarray, slots: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        order = np.argsort(keys, axis=0, kind='stable')
+        return np.take_along_axis(keys, order, axis=0), np.take_along_axis(slots, order, axis=0)
+
+    def _add_segment(self, keys: np.ndarray, slots: np.ndarray) -> None:
+        self._segments.append(self._sorted(keys, slots))
+        # Merge segments of similar size, leaving O(log n) segments to search
+        while len(self._segments) > 1 and len(self._segments[-2][0]) <= 2 * len(self._segments[-1][0]):
+            (keys_a, slots_a), (keys_b, slots_b) = self._segments.pop(-2), self._segments.pop()
+            self._segments.append(self._sorted(np.concatenate((keys_a, keys_b)), np.concatenate((slots_a, slots_b))))
+
+    def _candidates(self, keys: np.ndarray) -> List[Set[int]]:
+        '''
+        Returns the slots sharing a band key with each row of keys.
+        '''
+        candidates = [set() for _ in range(len(keys))]
+        for segment_keys, segment_slots in self._segments:
+            for band in range(self.bands):
+                column = segment_keys[:, band]
+                low = np.searchsorted(column, keys[:, band], side='left')
+                high = np.minimum(np.searchsorted(column, keys[:, band], side='right'), low + self._max_candidates)
+                for row in np.flatnonzero(high > low):
+                    candidates[row].update(segment_slots[low[row]:high[row], band].tolist())
+        return candidates
+
+    def _similar(self, signature: np.ndarray, slots: Iterable[int]) -> List[int]:
+        slots = sorted(slots)
+        if not slots:
+            return []
+        agreement = (self._signatures[slots] == signature).mean(axis=1)
+        return [slot for slot, similarity in zip(slots, agreement) if similarity >= self.threshold]
+
+    def _find(self, slot: int) -> int:
+        parents = self._parents
+        while parents[slot] != slot:
+            parents[slot] = parents[parents[slot]]
+            slot = parents[slot]
+        return slot
+
+    def _union(self, first: int, second: int) -> None:
+        first, second = self._find(first), self._find(second)
+        # The earliest recipe stays the representative of the group
+        if first < second:
+            self._parents[second] = first
+        elif second < first:
+            self._parents[first] = second
+
+    def add_many(self, keys: Sequence[Hashable], recipes: Sequence[Recipe], processes: Optional[int] = None,
+                 chunksize: int = 2000) -> List[Optional[Hashable]]:
+        '''
+        Adds recipes to the index, and groups them with their near-duplicates among the
+        recipes already added and the new ones.
+
+        Args:
+            keys (Sequence[Hashable]): The id of each recipe, e.g. its ObjectId.
+            recipes (Sequence[Recipe]): The recipes.
+            processes (int): The number of processes computing the signatures, or None to
+                compute them in this process.
+            chunksize (int): The number of recipes sent to a process at a time.
+
+        Returns:
+            List[Optional[Hashable]]: For each recipe, the key of the earliest recipe of its
+                group if it is a near-duplicate, otherwise None.
+        '''
+        if len(keys) != len(recipes):
+            raise ValueError('keys and recipes must have the same length.')
+        if not recipes:
+            return []
+        signatures = self.signatures(recipes, processes, chunksize)
+        first = len(self._keys)
+        end = first + len(recipes)
+        if end > len(self._signatures):
+            grown = np.empty((max(end, 2 * len(self._signatures)), self.num_perm), dtype=np.uint16)
+            grown[:first] = self._signatures[:first]
+            self._signatures = grown
+        self._signatures[first:end] = signatures.astype(np.uint16)
+        self._keys.extend(keys)
+        self._parents.extend(range(first, end))
+
+        band_keys = self._band_keys(signatures)
+        slots = np.repeat(np.arange(first, end)[:, None], self.bands, axis=1)
+        self._add_segment(band_keys, slots)
+        for row, candidates in enumerate(self._candidates(band_keys)):
+            slot = first + row
+            candidates.discard(slot)
+            for similar in self._similar(self._signatures[slot], candidates):
+                self._union(slot, similar)
+
+        results = []
+        for slot in range(first, end):
+            root = self._find(slot)
+            results.append(self._keys[root] if root != slot else None)
+        return results
+
+    def add(self, key: Hashable, recipe: Recipe) -> Optional[Hashable]:
+        '''
+        Adds a recipe to the index, e.g. when it is inserted.
+
+        Returns:
+            Optional[Hashable]: The key of the earliest recipe of its group if it is a
+                near-duplicate, otherwise None.
+        '''
+        return self.add_many([key], [recipe])[0]
+
+    def duplicates_of(self, recipe: Recipe) -> List[Hashable]:
+        '''
+        Returns the keys of the indexed recipes that are near-duplicates of the recipe,
+        without adding it.
+        '''
+        signature = self.signatures([recipe])
+        candidates = self._candidates(self._band_keys(signature))[0]
+        return [self._keys[slot] for slot in self._similar(signature[0].astype(np.uint16), candidates)]
+
+    def groups(self) -> List[List[Hashable]]:
+        '''
+        Returns the groups of near-duplicates with more than one recipe, each starting
+        with its earliest recipe.
+        '''
+        members = {}
+        for slot in range(len(self._keys)):
+            members.setdefault(self._find(slot), []).append(self._keys[slot])
+        return [group for group in members.values() if len(group) > 1]
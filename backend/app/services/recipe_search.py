@@ -0,0 +1,258 @@
+from array import array
+from bisect import bisect_left, insort
+import json
+import math
+import os
+import re
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, Union
+import numpy as np
+from app.models.recipe import Recipe
+
+CATEGORIES = ('dairy', 'meat', 'parve', 'unknown')
+
+# Weight of a term occurrence in each field, title words count more than body words
+TITLE_WEIGHT = 3.0
+BODY_WEIGHT = 1.0
+
+# Number of vocabulary terms a prefix is expanded to, most common first
+MAX_PREFIX_EXPANSIONS = 20
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    '''
+    Splits text into lower-case word tokens.
+    '''
+    return _TOKEN_PATTERN.findall(text.casefold())
+
+
+class RecipeSearchIndex:
+    '''
+    This class is a full-text search index over recipe titles, descriptions and steps,
+    ranked with BM25.
+
+    The postings of each term live in two parts: a read-only base loaded from disk,
+    memory-mapped so that workers share it instead of rebuilding it, and an in-memory
+    part for recipes added since. Removing or replacing a recipe marks its old slot
+    as dead. save() merges both parts and drops the dead slots.
+
+    Recipe ids can be any hashable value, but must be JSON-serializable (e.g. str of an
+    ObjectId) to save the index.
+
+    Attributes:
+        k1 (float): The BM25 term frequency saturation.
+        b (float): The BM25 document length normalization.
+    '''
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._slots: Dict[Hashable, int] = {}
+        self._ids: List[Optional[Hashable]] = []
+        self._lengths = array('f')
+        self._categories = bytearray()
+        self._alive = bytearray()
+        self._total_length = 0.0
+        # Sorted vocabulary, for prefix lookups
+        self._terms: List[str] = []
+        # Read-only base postings in CSR form: term -> row
+        self._base_rows: Dict[str, int] = {}
+        self._base_offsets = np.zeros(1, dtype=np.int64)
+        self._base_slots = np.empty(0, dtype=np.int32)
+        self._base_tfs = np.empty(0, dtype=np.float32)
+        # Postings added in memory: term -> (slots, weighted term frequencies)
+        self._postings: Dict[str, Tuple[array, array]] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, recipe_id: Hashable) -> bool:
+        return recipe_id in self._slots
+
+    def add(self, recipe_id: Hashable, recipe: Recipe) -> None:
+        '''
+        Adds a recipe to the index, replacing the recipe already indexed under the same id.
+        '''
+        if recipe_id in self._slots:
+            self.remove(recipe_id)
+        frequencies: Dict[str, float] = {}
+        for token in tokenize(recipe.title):
+            frequencies[token] = frequencies.get(token, 0.0) + TITLE_WEIGHT
+        for text in (recipe.description, *recipe.steps):
+            for token in tokenize(text):
+                frequencies[token] = frequencies.get(token, 0.0) + BODY_WEIGHT
+        category = CATEGORIES.index(recipe.category) if recipe.category in CATEGORIES else CATEGORIES.index('unknown')
+        self._append(recipe_id, frequencies, category)
+
+    def _append(self, recipe_id: Hashable, frequencies: Dict[str, float], category: int) -> None:
+        slot = len(self._ids)
+        length = sum(frequencies.values())
+        self._slots[recipe_id] = slot
+        self._ids.append(recipe_id)
+        self._lengths.append(length)
+        self._categories.append(category)
+        self._alive.append(1)
+        self._total_length += length
+        for term, frequency in frequencies.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = (array('q'), array('f'))
+                if term not in self._base_rows:
+                    insort(self._terms, term)
+            posting[0].append(slot)
+            posting[1].append(frequency)
+
+    def remove(self, recipe_id: Hashable) -> None:
+        '''
+        Removes a recipe from the index.
+
+        Raises:
+            KeyError: If the recipe is not in the index.
+        '''
+        slot = self._slots.pop(recipe_id)
+        self._ids[slot] = None
+        self._alive[slot] = 0
+        self._total_length -= self._lengths[slot]
+
+    def _posting(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+        Returns the live slots and term frequencies of a term, from both parts of the index.
+        '''
+        parts_slots, parts_tfs = [], []
+        row = self._base_rows.get(term)
+        if row is not None:
+            start, end = self._base_offsets[row], self._base_offsets[row + 1]
+            parts_slots.append(self._base_slots[start:end])
+            parts_tfs.append(self._base_tfs[start:end])
+        posting = self._postings.get(term)
+        if posting is not None:
+            parts_slots.append(np.frombuffer(posting[0], dtype=np.int64))
+            parts_tfs.append(np.frombuffer(posting[1], dtype=np.float32))
+        if not parts_slots:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        slots = np.concatenate(parts_slots).astype(np.int64, copy=False)
+        tfs = np.concatenate(parts_tfs)
+        live = np.frombuffer(self._alive, dtype=np.uint8)[slots] == 1
+        return slots[live], tfs[live]
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        '''
+        Returns the vocabulary terms starting with prefix that are still used, most common first.
+        '''
+        start = bisect_left(self._terms, prefix)
+        terms = []
+        for term in self._terms[start:]:
+            if not term.startswith(prefix):
+                break
+            frequency = len(self._posting(term)[0])
+            if frequency:
+                terms.append((frequency, term))
+        terms.sort(key=lambda pair: -pair[0])
+        return [term for _, term in terms]
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[str]:
+        '''
+        Returns the indexed words starting with prefix, most common first.
+        '''
+        tokens = tokenize(prefix)
+        return self._expand_prefix(tokens[-1])[:limit] if tokens else []
+
+    def search(self, query: str, limit: int = 10, category: Union[str, Iterable[str], None] = None,
+               prefix: bool = False) -> List[Tuple[Hashable, float]]:
+        '''
+        Returns the recipes best matching the query, ranked with BM25.
+
+        Args:
+            query (str): The words to search for.
+            limit (int): The number of results.
+            category (str): A category or categories the recipes must be in.
+            prefix (bool): Whether the last query word is a prefix, for search as you type.
+
+        Returns:
+            List[Tuple[Hashable, float]]: Pairs of recipe id and score, best first.
+        '''
+        tokens = tokenize(query)
+        count = len(self._slots)
+        if not tokens or not count:
+            return []
+        terms = [[token] for token in dict.fromkeys(tokens)]
+        if prefix:
+            terms[-1] = self._expand_prefix(tokens[-1])[:MAX_PREFIX_EXPANSIONS]
+
+        lengths = np.frombuffer(self._lengths, dtype=np.float32)
+        average_length = self._total_length / count
+        scores = np.zeros(len(self._ids), dtype=np.float64)
+        for alternatives in terms:
+            for term in alternatives:
+                slots, tfs = self._posting(term)
+                if not len(slots):
+                    continue
+                idf = math.log(1 + (count - len(slots) + 0.5) / (len(slots) + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * lengths[slots] / average_length)
+                scores[slots] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+
+        if category is not None:
+            wanted = [CATEGORIES.index(name) for name in ([category] if isinstance(category, str) else category)
+                      if name in CATEGORIES]
+            scores[~np.isin(np.frombuffer(self._categories, dtype=np.uint8), wanted)] = 0
+        matches = np.flatnonzero(scores)
+        if len(matches) > limit:
+            matches = matches[np.argpartition(-scores[matches], limit - 1)[:limit]]
+        matches = matches[np.argsort(-scores[matches], kind='stable')]
+        return [(self._ids[slot], float(scores[slot])) for slot in matches.tolist()]
+
+    def save(self, path: str) -> None:
+        '''
+        Writes the index to the directory at path, leaving out removed recipes.
+        '''
+        alive = np.frombuffer(self._alive, dtype=np.uint8) == 1
+        # Renumber the live slots densely
+        renumber = np.cumsum(alive, dtype=np.int64) - 1
+        offsets, slots, tfs = [0], [], []
+        terms = []
+        for term in self._terms:
+            term_slots, term_tfs = self._posting(term)
+            if not len(term_slots):
+                continue
+            terms.append(term)
+            slots.append(renumber[term_slots].astype(np.int32))
+            tfs.append(term_tfs)
+            offsets.append(offsets[-1] + len(term_slots))
+
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'offsets.npy'), np.array(offsets, dtype=np.int64))
+        np.save(os.path.join(path, 'slots.npy'), np.concatenate(slots) if slots else np.empty(0, dtype=np.int32))
+        np.save(os.path.join(path, 'tfs.npy'), np.concatenate(tfs) if tfs else np.empty(0, dtype=np.float32))
+        np.save(os.path.join(path, 'lengths.npy'), np.frombuffer(self._lengths, dtype=np.float32)[alive])
+        np.save(os.path.join(path, 'categories.npy'), np.frombuffer(self._categories, dtype=np.uint8)[alive])
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as meta:
+            json.dump({
+                'k1': self.k1,
+                'b': self.b,
+                'ids': [recipe_id for recipe_id in self._ids if recipe_id is not None],
+                'terms': terms,
+            }, meta)
+
+    @classmethod
+    def load(cls, path: str) -> 'RecipeSearchIndex':
+        '''
+        Loads an index saved with save(), memory-mapping its postings.
+
+        The loaded index can be updated like a new one, the file on disk is not changed.
+        '''
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as meta_file:
+            meta = json.load(meta_file)
+        index = cls(k1=meta['k1'], b=meta['b'])
+        index._base_offsets = np.load(os.path.join(path, 'offsets.npy'), mmap_mode='r')
+        index._base_slots = np.load(os.path.join(path, 'slots.npy'), mmap_mode='r')
+        index._base_tfs = np.load(os.path.join(path, 'tfs.npy'), mmap_mode='r')
+        index._base_rows = {term: row for row, term in enumerate(meta['terms'])}
+        index._terms = list(meta['terms'])
+        index._ids = list(meta['ids'])
+        index._slots = {recipe_id: slot for slot, recipe_id in enumerate(index._ids)}
+        index._lengths = array('f', np.load(os.path.join(path, 'lengths.npy')).tobytes())
+        index._categories = bytearray(np.load(os.path.join(path, 'categories.npy')).tobytes())
+        index._alive = bytearray(b'\x01' * len(index._ids))
+        index._total_length = float(np.frombuffer(index._lengths, dtype=np.float32).sum())
+        return index
@@ -0,0 +1,268 @@
+from array import array
+from collections import defaultdict
+import math
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
+import numpy as np
+from scipy import sparse
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.services.ingredient_index import normalize_ingredient_name
+
+# Number of recipes added since the last merge that are kept in the in-memory part
+MERGE_THRESHOLD = 5_000
+
+
+def _top_k(keys: List[Hashable], slots: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[Hashable, float]]:
+    '''
+    Returns the k highest scoring (key, score) pairs, best first.
+    '''
+    if len(scores) > k:
+        best = np.argpartition(-scores, k - 1)[:k]
+        slots, scores = slots[best], scores[best]
+    order = np.argsort(-scores, kind='stable')
+    return [(keys[slot], float(score)) for slot, score in zip(slots[order].tolist(), scores[order].tolist())]
+
+
+class RecipeRecommender:
+    '''
+    This class finds the recipes most similar to a recipe by their ingredients and category.
+
+    Each recipe is a sparse vector with one feature per normalized ingredient name and
+    one for its category, weighted by category_weight. Recipes are ranked by the cosine
+    similarity of their vectors.
+
+    The index keeps the ingredient features transposed, as a feature -> recipes sparse
+    matrix, so a query only reads the recipes that share an ingredient with it instead
+    of every recipe, and adds the category term to those. The matrix has a base part and
+    an in-memory part for the recipes added since the last merge, which is rebuilt when
+    it changes and merged into the base once it holds merge_threshold recipes. Removed
+    recipes are marked dead and left out of the results.
+
+    Attributes:
+        category_weight (float): The weight of the category feature, relative to one ingredient.
+    '''
+
+    def __init__(self, category_weight: float = 0.5, merge_threshold: int = MERGE_THRESHOLD) -> None:
+        self.category_weight = category_weight
+        self._merge_threshold = merge_threshold
+        self._features: Dict[str, int] = {}
+        self._categories: Dict[str, int] = {}
+        self._slots: Dict[Hashable, int] = {}
+        self._keys: List[Optional[Hashable]] = []
+        # Per slot: whether the recipe is still indexed, its category code and vector length
+        self._alive = bytearray()
+        self._category = array('h')
+        self._norm = array('f')
+        # Base part: the ingredient features up to _base_size as rows, and transposed as feature -> recipes
+        self._base_size = 0
+        self._base_rows = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self._base_postings = sparse.csr_matrix((0, 0), dtype=np.float32)
+        # In-memory part: the features of the recipes added since, and their postings once built
+        self._new_features: List[np.ndarray] = []
+        self._new_postings: Optional[sparse.csr_matrix] = None
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slots
+
+    def _encode(self, recipe: Recipe, grow: bool) -> Tuple[np.ndarray, int, int]:
+        '''
+        Returns the ingredient feature ids, the ingredient count and the category code of
+        the recipe. Ingredients and categories not seen yet are added if grow is set,
+        otherwise they only count towards the length of the vector.
+        '''
+        names = dict.fromkeys(normalize_ingredient_name(ingredient.name) for ingredient in recipe.ingredients)
+        if grow:
+            features = [self._features.setdefault(name, len(self._features)) for name in names]
+            category = self._categories.setdefault(recipe.category, len(self._categories))
+        else:
+            features = [self._features[name] for name in names if name in self._features]
+            category = self._categories.get(recipe.category, -1)
+        return np.array(features, dtype=np.int32), len(names), category
+
+    def add(self, key: Hashable, recipe: Recipe) -> None:
+        '''
+        Adds a recipe to the index, replacing the recipe already stored under the same key.
+        '''
+        self.add_many([(key, recipe)])
+
+    def add_many(self, items: Iterable[Tuple[Hashable, Recipe]]) -> None:
+        '''
+        Adds recipes to the index, e.g. the whole catalog at start-up.
+        '''
+        for key, recipe in items:
+            if key in self._slots:
+                self.remove(key)
+            features, count, category = self._encode(recipe, grow=True)
+            self._slots[key] = len(self._keys)
+            self._keys.append(key)
+            self._alive.append(1)
+            self._category.append(category)
+            self._norm.append(math.sqrt(count + self.category_weight ** 2))
+            self._new_features.append(features)
+        self._new_postings = None
+        if len(self._new_features) >= self._merge_threshold:
+            self.merge()
+
+    def remove(self, key: Hashable) -> None:
+        '''
+        Removes a recipe from the index.
+
+        Raises:
+            KeyError: If the recipe is not in the index.
+        '''
+        slot = self._slots.pop(key)
+        self._alive[slot] = 0
+        self._keys[slot] = None
+
+    def _new_rows(self) -> sparse.csr_matrix:
+        rows = self._new_features
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(features) for features in rows], out=indptr[1:])
+        indices = np.concatenate(rows) if rows else np.empty(0, dtype=np.int32)
+        return sparse.csr_matrix((np.ones(len(indices), dtype=np.float32), indices, indptr),
+                                 shape=(len(rows), len(self._features)))
+
+    def merge(self) -> None:
+        '''
+        Merges the in-memory part into the base, dropping the rows of removed recipes.
+        '''
+        base = self._base_rows
+        base = sparse.csr_matrix((base.data, base.indices, base.indptr), shape=(self._base_size, len(self._features)))
+        rows = sparse.vstack([base, self._new_rows()], format='csr')
+        # Zero the rows of removed recipes so they stop costing time in queries
+        alive = np.frombuffer(bytes(self._alive), dtype=np.uint8).astype(np.float32)
+        rows = (sparse.diags(alive) @ rows).tocsr()
+        rows.eliminate_zeros()
+        self._base_rows = rows
+        self._base_postings = rows.T.tocsr()
+        self._base_size = len(self._keys)
+        self._new_features = []
+        self._new_postings = None
+
+    def _postings_of_new(self) -> sparse.csr_matrix:
+        if self._new_postings is None:
+            self._new_postings = self._new_rows().T.tocsr()
+        return self._new_postings
+
+    def _shared(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+        Returns the slots sharing an ingredient with the features, and how many they share.
+        '''
+        slots, counts = [], []
+        for postings, offset in ((self._base_postings, 0), (self._postings_of_new(), self._base_size)):
+            known = features[features < postings.shape[0]]
+            if not len(known) or not postings.shape[1]:
+                continue
+            result = sparse.csr_matrix(np.ones((1, len(known)), dtype=np.float32)) @ postings[known]
+            slots.append(result.indices.astype(np.int64) + offset)
+            counts.append(result.data)
+        if not slots:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        return np.concatenate(slots), np.concatenate(counts)
+
+    def similar(self, recipe_or_key: Union[Hashable, Recipe], k: int = 10) -> List[Tuple[Hashable, float]]:
+        '''
+        Returns the k recipes most similar to an indexed recipe (by key) or to any recipe.
+
+        Only recipes sharing at least one ingredient with it are candidates.
+
+        Returns:
+            List[Tuple[Hashable, float]]: The keys and cosine similarities, most similar
+                first, leaving out the recipe itself.
+
+        Raises:
+            ValueError: If the key is not in the index.
+        '''
+        if isinstance(recipe_or_key, Recipe):
+            features, count, category = self._encode(recipe_or_key, grow=False)
+            own_slot, norm = None, math.sqrt(count + self.category_weight ** 2)
+        else:
+            own_slot = self._slots.get(recipe_or_key)
+            if own_slot is None:
+                raise ValueError(f'Recipe {recipe_or_key} is not in the index.')
+            if own_slot < self._base_size:
+                start, end = self._base_rows.indptr[own_slot:own_slot + 2]
+                features = self._base_rows.indices[start:end]
+            else:
+                features = self._new_features[own_slot - self._base_size]
+            category, norm = self._category[own_slot], self._norm[own_slot]
+
+        slots, shared = self._shared(features)
+        keep = np.frombuffer(bytes(self._alive), dtype=np.uint8)[slots].astype(bool)
+        if own_slot is not None:
+            keep &= slots != own_slot
+        slots, shared = slots[keep], shared[keep]
+        same_category = np.frombuffer(self._category, dtype=np.int16)[slots] == category
+        norms = np.frombuffer(self._norm, dtype=np.float32)[slots] * norm
+        scores = (shared + same_category * self.category_weight ** 2) / norms
+        return _top_k(self._keys, slots, scores, k)
+
+
+class CoPlanRecommender:
+    '''
+    This class finds the recipes planned together with a recipe in users' menu histories:
+    users who planned X also planned Y.
+
+    Recipes are scored by the number of users who planned both, divided by the square
+    root of the number of users who planned each (the cosine of their user vectors), so
+    recipes everyone plans do not top every list. Recipes are identified by key(recipe),
+    by default their normalized title.
+    '''
+
+    def __init__(self, key: Callable[[Recipe], Hashable] = lambda recipe: normalize_ingredient_name(recipe.title)):
+        self._key = key
+        self._items: Dict[Hashable, int] = {}
+        self._item_keys: List[Hashable] = []
+        self._users: Dict[Hashable, int] = {}
+        self._planned: Dict[int, Set[int]] = defaultdict(set)
+        # Item -> users and user -> items matrices, rebuilt after histories are added
+        self._matrices: Optional[Tuple[sparse.csr_matrix, sparse.csr_matrix, np.ndarray]] = None
+
+    def add_menus(self, user_id: Hashable, menus: Iterable[Menu]) -> None:
+        '''
+        Adds the recipes of the user's menus to the user's history.
+        '''
+        user = self._users.setdefault(user_id, len(self._users))
+        for menu in menus:
+            for recipe in menu.recipes:
+                key = self._key(recipe)
+                item = self._items.get(key)
+                if item is None:
+                    item = self._items[key] = len(self._item_keys)
+                    self._item_keys.append(key)
+                self._planned[user].add(item)
+        self._matrices = None
+
+    def _build(self) -> Tuple[sparse.csr_matrix, sparse.csr_matrix, np.ndarray]:
+        if self._matrices is None:
+            users = [user for user, items in self._planned.items() for _ in items]
+            items = [item for user_items in self._planned.values() for item in user_items]
+            user_items = sparse.csr_matrix((np.ones(len(items), dtype=np.float32), (users, items)),
+                                           shape=(len(self._users), len(self._item_keys)))
+            popularity = np.asarray(user_items.sum(axis=0)).ravel()
+            self._matrices = (user_items.T.tocsr(), user_items, popularity)
+        return self._matrices
+
+    def also_planned(self, recipe_or_key: Union[Hashable, Recipe], k: int = 10) -> List[Tuple[Hashable, float]]:
+        '''
+        Returns the k recipes most often planned by the users who planned the recipe.
+
+        Returns:
+            List[Tuple[Hashable, float]]: The keys and scores, best first, leaving out the
+                recipe itself. Empty if nobody planned the recipe.
+        '''
+        key = self._key(recipe_or_key) if isinstance(recipe_or_key, Recipe) else recipe_or_key
+        item = self._items.get(key)
+        if item is None:
+            return []
+        item_users, user_items, popularity = self._build()
+        together = (item_users[item] @ user_items).tocsr()
+        together.sort_indices()
+        keep = together.indices != item
+        slots = together.indices[keep].astype(np.int64)
+        scores = together.data[keep] / np.sqrt(popularity[slots] * popularity[item])
+        return _top_k(self._item_keys, slots, scores, k)
+
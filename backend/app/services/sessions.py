@@ -0,0 +1,182 @@
+from dataclasses import dataclass
+import secrets
+import threading
+import time
+from typing import Callable, Dict, Optional
+from cachetools import LRUCache
+from itsdangerous import BadSignature, URLSafeSerializer
+from app.models.user import User
+from app.services.read_cache import CacheStats
+
+SESSION_SALT = 'dish-dash-session'
+
+
+@dataclass(frozen=True)
+class Session:
+    '''
+    This class represents a verified session token.
+
+    Attributes:
+        user_email (str): The email of the user who logged in.
+        session_id (str): The random id of the session, used to revoke it.
+        issued_at (float): When the token was issued, in seconds since the epoch.
+        expires_at (float): When the token stops being accepted.
+    '''
+    user_email: str
+    session_id: str
+    issued_at: float
+    expires_at: float
+
+
+class _CountingLRUCache(LRUCache):
+    '''
+    An LRUCache that counts the entries it evicts.
+    '''
+
+    def __init__(self, maxsize: int, stats: CacheStats) -> None:
+        super().__init__(maxsize)
+        self.stats = stats
+
+    def popitem(self):
+        item = super().popitem()
+        self.stats.evictions += 1
+        return item
+
+
+class SessionManager:
+    '''
+    This class issues signed session tokens at login and verifies them on later requests.
+
+    Only login checks the password with bcrypt. The token carries the user's email, a
+    session id and the issue time, signed with the secret key (itsdangerous), so
+    verifying it is an HMAC. Verified tokens are cached until they expire, so repeated
+    requests with the same token are a dictionary lookup. Revoked sessions and users
+    are checked on every request, including cache hits.
+
+    Revocations are kept in this process, so every process of a deployment must be told
+    about them, or keep max_age short.
+
+    Attributes:
+        max_age (float): The lifetime of a token, in seconds.
+        stats (CacheStats): The counters of the verified-token cache.
+    '''
+
+    def __init__(self, secret_key: str, max_age: float = 3600, cache_size: int = 10000,
+                 timer: Callable[[], float] = time.time) -> None:
+        if not secret_key:
+            raise ValueError('A secret key is required to sign sessions.')
+        self.max_age = max_age
+        self.stats = CacheStats()
+        self._serializer = URLSafeSerializer(secret_key, salt=SESSION_SALT)
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._cache_size = cache_size
+        self._create_cache()
+        # Revoked session ids, and per user the time before which tokens are revoked,
+        # both kept until the tokens they revoke have expired
+        self._revoked_sessions: Dict[str, float] = {}
+        self._revoked_users: Dict[str, float] = {}
+
+    def _create_cache(self) -> None:
+        self._cache = _CountingLRUCache(self._cache_size, self.stats) if self._cache_size else None
+
+    def issue(self, user_email: str) -> str:
+        '''
+        Returns a new session token for the user, without checking a password.
+        '''
+        return self._serializer.dumps({'email': user_email, 'sid': secrets.token_urlsafe(12), 'iat': self._timer()})
+
+    def login(self, user: User, password: str) -> Optional[str]:
+        '''
+        Checks the password against the user's stored hash with bcrypt.
+
+        Returns:
+            Optional[str]: A new session token, or None if the password is wrong.
+        '''
+        if not user.user_password or not user.check_password(password):
+            return None
+        return self.issue(user.user_email)
+
+    def _verify(self, token: str) -> Optional[Session]:
+        try:
+            payload = self._serializer.loads(token)
+        except BadSignature:
+            return None
+        return Session(payload['email'], payload['sid'], payload['iat'], payload['iat'] + self.max_age)
+
+    def _is_revoked(self, session: Session) -> bool:
+        revoked_before = self._revoked_users.get(session.user_email)
+        return session.session_id in self._revoked_sessions or (
+            revoked_before is not None and session.issued_at <= revoked_before)
+
+    def authenticate(self, token: str) -> Optional[Session]:
+        '''
+        Returns the session of a valid token, or None if the token is invalid, expired or revoked.
+        '''
+        now = self._timer()
+        with self._lock:
+            session = self._cache.get(token) if self._cache is not None else None
+            if session is not None:
+                if session.expires_at <= now:
+                    del self._cache[token]
+                    self.stats.expirations += 1
+                    return None
+                if self._is_revoked(session):
+                    del self._cache[token]
+                    self.stats.invalidations += 1
+                    return None
+                self.stats.hits += 1
+                return session
+            self.stats.misses += 1
+
+        session = self._verify(token)
+        if session is None or session.expires_at <= now:
+            return None
+        with self._lock:
+            if self._is_revoked(session):
+                return None
+            if self._cache is not None:
+                self._cache[token] = session
+        return session
+
+    def revoke(self, token: str) -> bool:
+        '''
+        Revokes the session of the token, e.g. on logout.
+
+        Returns:
+            bool: Whether the token was a valid session.
+        '''
+        session = self.authenticate(token)
+        if session is None:
+            return False
+        with self._lock:
+            self._revoked_sessions[session.session_id] = session.expires_at
+            self._prune()
+        return True
+
+    def revoke_user(self, user_email: str) -> None:
+        '''
+        Revokes all sessions of the user issued until now, e.g. after a password change.
+        '''
+        with self._lock:
+            self._revoked_users[user_email] = self._timer()
+            self._prune()
+
+    def _prune(self) -> None:
+        '''
+        Forgets revocations whose tokens have all expired.
+        '''
+        now = self._timer()
+        for session_id in [key for key, expires_at in self._revoked_sessions.items() if expires_at <= now]:
+            del self._revoked_sessions[session_id]
+        for user_email in [key for key, revoked_at in self._revoked_users.items()
+                           if revoked_at + self.max_age <= now]:
+            del self._revoked_users[user_email]
+
+    def clear_cache(self) -> None:
+        '''
+        Drops all verified tokens, they are verified again on their next request.
+        '''
+        with self._lock:
+            # A new cache, clearing the old one would count the entries as evictions
+            self._create_cache()
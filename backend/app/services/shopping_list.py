@@ -0,0 +1,87 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.models.menu import Menu
+from app.models.quantity import parse_quantity
+from app.services.ingredient_index import normalize_ingredient_name
+
+
+@dataclass
+class ShoppingItem:
+    '''
+    This class represents one line of a shopping list.
+
+    Attributes:
+        name (str): The name of the ingredient, as first written in the menus.
+        amount (float): The total amount, in unit.
+        unit (str): The unit of the amount (see Quantity.unit).
+    '''
+    name: str
+    amount: float
+    unit: str
+
+
+@dataclass
+class ShoppingList:
+    '''
+    This class represents the ingredients needed for a set of menus.
+
+    Attributes:
+        items (List[ShoppingItem]): The summed ingredients, sorted by name and unit.
+        unparsed (Dict[str, List[str]]): The quantities that could not be parsed, by ingredient name.
+    '''
+    items: List[ShoppingItem] = field(default_factory=list)
+    unparsed: Dict[str, List[str]] = field(default_factory=dict)
+
+
+def build_shopping_list(menus: Iterable[Menu], start: Optional[date] = None,
+                        end: Optional[date] = None) -> ShoppingList:
+    '''
+    Sums the ingredients of all recipes in the menus dated between start and end (inclusive).
+
+    Each distinct recipe is flattened once into (ingredient key, amount) columns, with its
+    amounts weighted by the number of times it is planned, and the columns of all recipes
+    are summed per key with one numpy bincount.
+
+    Returns:
+        ShoppingList: The summed ingredients.
+    '''
+    # Count the recipes by identity, a recipe planned on many days is flattened once
+    planned: Counter = Counter()
+    recipes = {}
+    for menu in menus:
+        if (start is not None and menu.date < start) or (end is not None and menu.date > end):
+            continue
+        for recipe in menu.recipes:
+            planned[id(recipe)] += 1
+            recipes[id(recipe)] = recipe
+
+    keys: Dict[Tuple[str, str], int] = {}
+    names: List[str] = []
+    codes: List[int] = []
+    amounts: List[float] = []
+    weights: List[int] = []
+    unparsed: Dict[str, List[str]] = {}
+    for recipe_id, count in planned.items():
+        for ingredient in recipes[recipe_id].ingredients:
+            quantity = parse_quantity(ingredient.quantity)
+            if quantity is None:
+                unparsed.setdefault(ingredient.name, []).extend([ingredient.quantity] * count)
+                continue
+            key = (normalize_ingredient_name(ingredient.name), quantity.unit)
+            code = keys.get(key)
+            if code is None:
+                code = keys[key] = len(names)
+                names.append(ingredient.name)
+            codes.append(code)
+            amounts.append(quantity.amount)
+            weights.append(count)
+
+    totals = np.bincount(np.array(codes, dtype=np.int64),
+                         weights=np.array(amounts, dtype=np.float64) * np.array(weights, dtype=np.float64),
+                         minlength=len(names))
+    items = [ShoppingItem(names[code], float(totals[code]), unit) for (_, unit), code in keys.items()]
+    items.sort(key=lambda item: (normalize_ingredient_name(item.name), item.unit))
+    return ShoppingList(items=items, unparsed=unparsed)
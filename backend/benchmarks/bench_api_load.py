@@ -0,0 +1,179 @@
+'''
+Load-tests the sync, async and ASGI api modes at fixed concurrency levels.
+
+Clients send requests back to back to the overview endpoint, which reads the user's
+recipes and menus, and to the recipes endpoint, which makes a single read. Reports the
+p50 and p99 latency and the throughput of each mode at each level.
+
+In the sync and async modes each client is a thread standing for a WSGI worker, which
+is blocked until its request is answered. The async mode overlaps the two reads of the
+overview but costs an event loop per request, and gains nothing on single reads. In
+the ASGI mode the clients are tasks on one event loop, the app.asgi server path: a
+request waiting on the database holds no thread, so one loop serves every client.
+
+Without MONGO_URI the requests run against an in-memory database that sleeps for
+LATENCY_SECONDS on every read, to stand in for a network round trip. With MONGO_URI the
+benchmark seeds a throwaway database named dish_dash_bench_<random hex> and drops it at
+the end, the database named by MONGO_DB is never touched.
+
+Run from the backend directory:
+    python -m benchmarks.bench_api_load
+    MONGO_URI=mongodb://localhost:27017 python -m benchmarks.bench_api_load
+'''
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import os
+from statistics import quantiles
+from time import perf_counter, sleep
+from uuid import uuid4
+from bson import ObjectId
+import mongomock
+from app import create_app
+from app.asgi import create_asgi_app
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.repositories import MenuRepository, RecipeRepository
+
+CONCURRENCY_LEVELS = (1, 4, 16)
+REQUESTS_PER_CLIENT = 50
+LATENCY_SECONDS = 0.01
+
+
+class SlowCollection:
+    '''
+    A collection that waits before every read, like a database across the network.
+    '''
+
+    def __init__(self, collection) -> None:
+        self._collection = collection
+
+    def find(self, *args, **kwargs):
+        sleep(LATENCY_SECONDS)
+        return self._collection.find(*args, **kwargs)
+
+    def find_one(self, *args, **kwargs):
+        sleep(LATENCY_SECONDS)
+        return self._collection.find_one(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+class SlowDatabase:
+    def __init__(self, database) -> None:
+        self._database = database
+
+    def __getitem__(self, name):
+        return SlowCollection(self._database[name])
+
+    def __getattr__(self, name):
+        return getattr(self._database, name)
+
+
+def seed(database, user_id: ObjectId) -> None:
+    recipes = [
+        Recipe(user_id=user_id, title=f'Recipe {i}', ingredients=[Ingredient(name='Flour', quantity='1 cup')],
+               steps=['Mix', 'Bake'], prep_time='30 minutes', category='parve')
+        for i in range(20)
+    ]
+    RecipeRepository(database).insert_many(recipes)
+    start = date(2024, 1, 1)
+    MenuRepository(database).save_many(
+        [Menu(user_id=user_id, date=start + timedelta(days=i), recipes=recipes[i % 20:i % 20 + 2]) for i in range(30)]
+    )
+
+
+def run(database, mode: str, path: str, concurrency: int) -> dict:
+    app = create_app({'MONGO_DATABASE': database, 'API_MODE': mode, 'DB_THREADS': concurrency * 2})
+
+    def client_loop(_) -> list:
+        client = app.test_client()
+        latencies = []
+        for _ in range(REQUESTS_PER_CLIENT):
+            start = perf_counter()
+            response = client.get(path)
+            latencies.append(perf_counter() - start)
+            assert response.status_code == 200
+        return latencies
+
+    # Warm up the lazy views and the connection pool
+    app.test_client().get(path)
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = [latency for result in executor.map(client_loop, range(concurrency)) for latency in result]
+    elapsed = perf_counter() - start
+    cuts = quantiles(latencies, n=100)
+    return {'p50': cuts[49], 'p99': cuts[98], 'requests_per_second': len(latencies) / elapsed}
+
+
+def run_asgi(database, path: str, concurrency: int) -> dict:
+    app = create_asgi_app({'MONGO_DATABASE': database, 'DB_THREADS': concurrency * 2})
+    path, _, query = path.partition('?')
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query.encode(), 'headers': []}
+
+    async def get() -> int:
+        messages = []
+
+        async def receive() -> dict:
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message: dict) -> None:
+            messages.append(message)
+
+        await app(scope, receive, send)
+        return messages[0]['status']
+
+    async def client_loop() -> list:
+        latencies = []
+        for _ in range(REQUESTS_PER_CLIENT):
+            start = perf_counter()
+            status = await get()
+            latencies.append(perf_counter() - start)
+            assert status == 200
+        return latencies
+
+    async def load() -> list:
+        # Warm up the lazy views and the connection pool
+        await get()
+        results = await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+        return [latency for result in results for latency in result]
+
+    start = perf_counter()
+    latencies = asyncio.run(load())
+    elapsed = perf_counter() - start
+    cuts = quantiles(latencies, n=100)
+    return {'p50': cuts[49], 'p99': cuts[98], 'requests_per_second': len(latencies) / elapsed}
+
+
+def main() -> None:
+    user_id = ObjectId()
+    client = None
+    if os.environ.get('MONGO_URI'):
+        from app.repositories.client import get_client
+        client = get_client()
+        # A fresh database of our own, so the run never touches the application's data
+        database = client[f'dish_dash_bench_{uuid4().hex}']
+        MenuRepository(database).ensure_indexes()
+    else:
+        database = SlowDatabase(mongomock.MongoClient().db)
+    try:
+        seed(database, user_id)
+        for path in (f'/users/{user_id}/overview', f'/users/{user_id}/recipes'):
+            for concurrency in CONCURRENCY_LEVELS:
+                print(f'{concurrency} clients x {REQUESTS_PER_CLIENT} requests to {path}')
+                for mode in ('sync', 'async', 'asgi'):
+                    if mode == 'asgi':
+                        result = run_asgi(database, path, concurrency)
+                    else:
+                        result = run(database, mode, path, concurrency)
+                    print(f'  {mode:>5}: p50 {result["p50"] * 1000:7.2f} ms  p99 {result["p99"] * 1000:7.2f} ms  '
+                          f'{result["requests_per_second"]:8.0f} req/s')
+    finally:
+        if client is not None:
+            client.drop_database(database.name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+'''
+Benchmarks near-duplicate detection on a synthetic catalog with planted duplicates.
+
+The catalog is added in batches, as an import would, with the signatures computed in
+a process pool. Reports throughput and how many of the planted near-duplicates were
+grouped with their original. Pass the catalog size to try a million recipes.
+
+Run from the backend directory:
+    python -m benchmarks.bench_dedup
+    python -m benchmarks.bench_dedup 1000000
+'''
+import os
+import random
+import sys
+from time import perf_counter
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.recipe import Recipe
+from app.services.recipe_dedup import NearDuplicateIndex
+
+BATCH_SIZE = 50_000
+DUPLICATE_RATE = 0.1
+WORDS = ['tomato', 'garlic', 'onion', 'basil', 'lemon', 'chicken', 'rice', 'pepper', 'cheese', 'bean',
+         'spicy', 'baked', 'fresh', 'quick', 'grandma', 'green', 'roasted', 'sweet', 'soup', 'salad']
+VERBS = ['Chop', 'Mix', 'Boil', 'Fry', 'Bake', 'Stir', 'Season', 'Serve', 'Grill', 'Whisk']
+
+
+def make_catalog(count: int, rng: random.Random):
+    '''
+    Returns recipes where about DUPLICATE_RATE of them are edited copies of earlier
+    recipes, and the position of the original of each copy.
+    '''
+    user_id = ObjectId()
+    vocabulary = [f'ingredient {i}' for i in range(5000)]
+    recipes, originals = [], {}
+    for i in range(count):
+        if recipes and rng.random() < DUPLICATE_RATE:
+            position = rng.randrange(len(recipes))
+            original = recipes[position]
+            ingredients = list(original.ingredients)
+            ingredients[rng.randrange(len(ingredients))] = Ingredient(name=rng.choice(vocabulary), quantity='1')
+            recipes.append(Recipe(user_id=user_id, title=original.title.lower(), ingredients=ingredients,
+                                  steps=original.steps, prep_time='20 minutes', category=original.category))
+            originals[i] = position
+            continue
+        names = rng.sample(vocabulary, rng.randint(6, 12))
+        recipes.append(Recipe(
+            user_id=user_id, title=' '.join(rng.sample(WORDS, 3)).title(),
+            ingredients=[Ingredient(name=name, quantity='1 cup') for name in names],
+            steps=[f'{rng.choice(VERBS)} the {name} for {rng.randint(1, 30)} minutes' for name in names[:5]],
+            prep_time='20 minutes', category=rng.choice(('meat', 'dairy', 'parve')),
+        ))
+    return recipes, originals
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    processes = os.cpu_count()
+    recipes, originals = make_catalog(count, random.Random(0))
+    index = NearDuplicateIndex()
+    start = perf_counter()
+    found = []
+    for offset in range(0, count, BATCH_SIZE):
+        batch = recipes[offset:offset + BATCH_SIZE]
+        found.extend(index.add_many(range(offset, offset + len(batch)), batch, processes=processes))
+    elapsed = perf_counter() - start
+
+    # A copy is found if it is grouped with its original's group
+    grouped = sum(1 for i, position in originals.items() if found[i] is not None
+                  and found[i] == (found[position] if found[position] is not None else position))
+    flagged = sum(1 for representative in found if representative is not None)
+    print(f'{count} recipes on {processes} processes: {elapsed:.1f} s ({count / elapsed:,.0f} recipes/s)')
+    print(f'planted near-duplicates grouped: {grouped}/{len(originals)}, recipes flagged: {flagged}')
+
+    sample = recipes[:1000]
+    start = perf_counter()
+    for recipe in sample:
+        index.duplicates_of(recipe)
+    print(f'duplicates_of: {(perf_counter() - start) / len(sample) * 1000:.2f} ms per recipe')
+
+
+if __name__ == '__main__':
+    main()
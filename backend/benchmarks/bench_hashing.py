@@ -0,0 +1,46 @@
+'''
+Benchmarks logins per second (bcrypt password checks) against the hashing pool size.
+
+Run from the backend directory:
+    python -m benchmarks.bench_hashing [rounds]
+'''
+import os
+import sys
+from time import perf_counter
+from app.models.user import User
+from app.services.password_hasher import PasswordHasher, _hash_password
+
+LOGINS = 64
+WORKER_COUNTS = (1, 2, 4, 8, 16)
+
+
+def logins_per_second(hasher: PasswordHasher, user: User) -> float:
+    start = perf_counter()
+    futures = [hasher.check_password_future(user, 'GoodPassword12') for _ in range(LOGINS)]
+    assert all(future.result() for future in futures)
+    return LOGINS / (perf_counter() - start)
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    user = User(user_email='user@example.com', user_password=_hash_password('GoodPassword12', rounds),
+                user_name='User Example')
+
+    start = perf_counter()
+    for _ in range(LOGINS // 4):
+        user.check_password('GoodPassword12')
+    print(f'rounds={rounds}, cpus={os.cpu_count()}')
+    print(f'{"inline":>16} {LOGINS // 4 / (perf_counter() - start):>10.1f} logins/s')
+
+    for use_processes in (False, True):
+        for workers in WORKER_COUNTS:
+            with PasswordHasher(max_workers=workers, rounds=rounds, use_processes=use_processes) as hasher:
+                # Warm up the pool so worker start-up is not measured
+                hasher.check_password_future(user, 'GoodPassword12').result()
+                rate = logins_per_second(hasher, user)
+            label = f'{"process" if use_processes else "thread"} x{workers}'
+            print(f'{label:>16} {rate:>10.1f} logins/s')
+
+
+if __name__ == '__main__':
+    main()
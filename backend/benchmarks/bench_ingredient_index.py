@@ -0,0 +1,86 @@
+'''
+Benchmarks pantry queries on a synthetic corpus of 100k recipes.
+
+Compares the inverted ingredient index with scanning every recipe.
+
+Run from the backend directory:
+    python -m benchmarks.bench_ingredient_index
+'''
+import random
+from time import perf_counter
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.recipe import Recipe
+from app.services.ingredient_index import IngredientIndex, normalize_ingredient_name
+
+RECIPES = 100_000
+VOCABULARY = 2_000
+QUERIES = 5
+
+
+def make_corpus(rng: random.Random) -> list:
+    '''
+    Builds recipes of 4 to 12 ingredients, drawn so that a few ingredients are very common.
+    '''
+    names = [f'Ingredient {i}' for i in range(VOCABULARY)]
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY)]
+    user_id = ObjectId()
+    return [
+        (i, Recipe(user_id=user_id, title=f'Recipe {i}',
+                   ingredients=[Ingredient(name=name, quantity='1') for name in
+                                set(rng.choices(names, weights, k=rng.randint(4, 12)))]))
+        for i in range(RECIPES)
+    ]
+
+
+def scan_with_all(corpus: list, ingredient_names: list) -> set:
+    wanted = {normalize_ingredient_name(name) for name in ingredient_names}
+    return {recipe_id for recipe_id, recipe in corpus
+            if wanted <= {normalize_ingredient_name(ingredient.name) for ingredient in recipe.ingredients}}
+
+
+def scan_missing_at_most(corpus: list, pantry: list, k: int) -> list:
+    pantry = {normalize_ingredient_name(name) for name in pantry}
+    results = []
+    for recipe_id, recipe in corpus:
+        names = {normalize_ingredient_name(ingredient.name) for ingredient in recipe.ingredients}
+        missing = len(names - pantry)
+        if missing <= k:
+            results.append((recipe_id, missing))
+    return results
+
+
+def timed(function) -> float:
+    start = perf_counter()
+    for _ in range(QUERIES):
+        function()
+    return (perf_counter() - start) / QUERIES * 1000
+
+
+def main() -> None:
+    rng = random.Random(7)
+    corpus = make_corpus(rng)
+
+    start = perf_counter()
+    index = IngredientIndex(corpus)
+    print(f'built index of {len(index)} recipes in {perf_counter() - start:.2f}s')
+
+    pantry = [f'Ingredient {i}' for i in rng.sample(range(200), 30)]
+    pair = pantry[:2]
+    print(f'{"query":>28} {"index ms":>10} {"scan ms":>10}')
+    print(f'{"all of 2 ingredients":>28} {timed(lambda: index.recipes_with_all(pair)):>10.2f} '
+          f'{timed(lambda: scan_with_all(corpus, pair)):>10.2f}')
+    for k in (0, 2):
+        print(f'{f"missing at most {k} (30 items)":>28} '
+              f'{timed(lambda: index.recipes_missing_at_most(pantry, k)):>10.2f} '
+              f'{timed(lambda: scan_missing_at_most(corpus, pantry, k)):>10.2f}')
+
+    start = perf_counter()
+    for recipe_id, recipe in corpus[:1000]:
+        index.remove(recipe_id)
+        index.add(recipe_id, recipe)
+    print(f'1000 incremental updates in {(perf_counter() - start) * 1000:.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+'''
+Benchmarks importing recipe JSON Lines files of growing size.
+
+Reports throughput and the peak memory of the import pipeline, which should stay flat
+as the file grows. Writes go to a repository that drops them, so storage is not measured.
+
+Run from the backend directory:
+    python -m benchmarks.bench_jsonl_import
+'''
+import json
+import os
+import tempfile
+import tracemalloc
+from bson import ObjectId
+from app.models.recipe import Recipe
+from app.services.jsonl_transfer import import_jsonl
+
+SIZES = (10_000, 50_000, 200_000)
+
+
+class DiscardingRepository:
+    def insert_many(self, recipes) -> list:
+        return [None for _ in recipes]
+
+
+def write_file(path: str, count: int) -> None:
+    user_id = str(ObjectId())
+    with open(path, 'w', encoding='utf-8') as fp:
+        for i in range(count):
+            fp.write(json.dumps({
+                'user_id': user_id, 'title': f'Recipe {i}', 'description': 'A synthetic recipe',
+                'ingredients': [{'name': f'Ingredient {j}', 'quantity': '1 cup'} for j in range(8)],
+                'steps': ['Mix', 'Cook', 'Serve'], 'prep_time': '20 minutes', 'category': 'parve',
+            }))
+            fp.write('\n')
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            path = os.path.join(directory, f'recipes-{size}.jsonl')
+            write_file(path, size)
+            tracemalloc.start()
+            result = import_jsonl(path, Recipe, DiscardingRepository(), start_offset=0)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f'{size:>8} lines: {result.items_per_second:>8.0f} lines/s, peak {peak / 2 ** 20:>6.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+'''
+Measures the per-object memory footprint of ingredients and recipes with tracemalloc.
+
+Compares the previous dict-backed dataclasses with the slotted and frozen models.
+
+Run from the backend directory:
+    python -m benchmarks.bench_memory
+'''
+from dataclasses import field, make_dataclass
+from typing import List
+import tracemalloc
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.recipe import FrozenRecipe, Recipe
+
+COUNT = 100_000
+
+# The models as they were before they were slotted
+LegacyIngredient = make_dataclass('LegacyIngredient', [('name', str), ('quantity', str)])
+LegacyRecipe = make_dataclass('LegacyRecipe', [
+    ('user_id', ObjectId),
+    ('title', str),
+    ('description', str, field(default='')),
+    ('ingredients', List, field(default_factory=list)),
+    ('steps', List[str], field(default_factory=list)),
+    ('prep_time', str, field(default='')),
+    ('category', str, field(default='unknown')),
+])
+
+
+def measure(build) -> float:
+    '''
+    Returns the bytes allocated per object by build(i) for COUNT objects.
+    '''
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [build(i) for i in range(COUNT)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    # Exclude the list that holds the objects
+    allocated -= objects.__sizeof__()
+    return allocated / COUNT
+
+
+def main() -> None:
+    # Shared field values so only the objects themselves are measured
+    name, quantity, title, step = 'Sugar', '1 cup', 'Cake', 'Bake'
+    user_id = ObjectId()
+    ingredients = [Ingredient(name=name, quantity=quantity)] * 3
+    frozen_ingredients = tuple(ingredient.freeze() for ingredient in ingredients)
+
+    results = {
+        'LegacyIngredient': measure(lambda i: LegacyIngredient(name, quantity)),
+        'Ingredient': measure(lambda i: Ingredient(name, quantity)),
+        'FrozenIngredient': measure(lambda i: ingredients[0].freeze()),
+        'LegacyRecipe': measure(lambda i: LegacyRecipe(user_id, title, '', list(ingredients), [step])),
+        'Recipe': measure(lambda i: Recipe(user_id, title, '', list(ingredients), [step])),
+        'FrozenRecipe': measure(lambda i: FrozenRecipe(user_id, title, '', frozen_ingredients, (step,))),
+    }
+    for model, size in results.items():
+        print(f'{model:>18} {size:>8.1f} bytes/object')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+'''
+Benchmarks adding, looking up and removing recipes on menus of growing size.
+
+Compares the indexed Menu against the previous linear list scans.
+
+Run from the backend directory:
+    python -m benchmarks.bench_menu
+'''
+from datetime import date
+from time import perf_counter
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+
+SIZES = (100, 1000, 5000)
+OPERATIONS = 200
+
+
+def make_recipes(count: int) -> list:
+    '''
+    Builds recipes with distinct titles and a handful of shared ingredients.
+    '''
+    user_id = ObjectId()
+    ingredients = [Ingredient(name=f'Ingredient {i}', quantity=f'{i} gram') for i in range(8)]
+    return [
+        Recipe(user_id=user_id, title=f'Recipe {i}', ingredients=list(ingredients),
+               steps=['Mix', 'Cook', 'Serve'], prep_time='10 minutes', category='parve')
+        for i in range(count)
+    ]
+
+
+def linear_add(recipes: list, recipe: Recipe) -> None:
+    if recipe in recipes:
+        raise ValueError(f'Recipe "{recipe.title}" is already in the menu.')
+    recipes.append(recipe)
+
+
+def linear_remove(recipes: list, recipe_title: str) -> None:
+    recipe_to_remove = next((recipe for recipe in recipes if recipe.title == recipe_title), None)
+    recipes.remove(recipe_to_remove)
+
+
+def bench(size: int) -> dict:
+    recipes = make_recipes(size + OPERATIONS)
+    base, extra = recipes[:size], recipes[size:]
+
+    linear = list(base)
+    start = perf_counter()
+    for recipe in extra:
+        linear_add(linear, recipe)
+    for recipe in extra:
+        linear_remove(linear, recipe.title)
+    linear_time = perf_counter() - start
+
+    menu = Menu(user_id=ObjectId(), date=date.today(), recipes=list(base))
+    start = perf_counter()
+    for recipe in extra:
+        menu.add_recipe(recipe)
+    for recipe in extra:
+        menu.get_recipe(recipe.title)
+    for recipe in extra:
+        menu.remove_recipe(recipe.title)
+    indexed_time = perf_counter() - start
+
+    return {'size': size, 'linear_us': linear_time / OPERATIONS * 1e6, 'indexed_us': indexed_time / OPERATIONS * 1e6}
+
+
+def main() -> None:
+    print(f'{"menu size":>10} {"linear us/op":>14} {"indexed us/op":>14}')
+    for size in SIZES:
+        result = bench(size)
+        print(f'{result["size"]:>10} {result["linear_us"]:>14.1f} {result["indexed_us"]:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
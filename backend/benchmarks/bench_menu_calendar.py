@@ -0,0 +1,57 @@
+'''
+Benchmarks date-range queries on a calendar of 10 years of daily menus.
+
+Compares MenuCalendar's binary search with scanning a flat list of the user's menus,
+for week, month and year ranges, and times copying last week.
+
+Run from the backend directory:
+    python -m benchmarks.bench_menu_calendar
+'''
+from datetime import date, timedelta
+import random
+from timeit import timeit
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.services.menu_calendar import MenuCalendar
+
+YEARS = 10
+QUERIES = 1000
+
+
+def main() -> None:
+    user_id = ObjectId()
+    recipes = [
+        Recipe(user_id=user_id, title=f'Recipe {i}', ingredients=[Ingredient(name='Flour', quantity='1 cup')],
+               steps=['Mix', 'Bake'], prep_time='30 minutes', category='parve')
+        for i in range(50)
+    ]
+    first = date(2015, 1, 1)
+    days = YEARS * 365 + YEARS // 4
+    menus = [Menu(user_id=user_id, date=first + timedelta(days=i), recipes=recipes[i % 48:i % 48 + 3])
+             for i in range(days)]
+    calendar = MenuCalendar(user_id, menus)
+    print(f'{len(calendar)} daily menus')
+
+    rng = random.Random(0)
+    for name, length in (('week', 7), ('month', 31), ('year', 365)):
+        starts = [first + timedelta(days=rng.randrange(days - length)) for _ in range(QUERIES)]
+        ranges = [(start, start + timedelta(days=length - 1)) for start in starts]
+        indexed = timeit(lambda: [calendar.range(start, end) for start, end in ranges], number=1)
+        scanned = timeit(lambda: [[menu for menu in menus if start <= menu.date <= end] for start, end in ranges],
+                         number=1)
+        print(f'{name:>5} range: calendar {indexed / QUERIES * 1e6:8.2f} us  '
+              f'scan {scanned / QUERIES * 1e6:8.2f} us  ({scanned / indexed:.0f}x)')
+
+    month = timeit(lambda: calendar.month(2020, 2), number=QUERIES)
+    print(f'month view: {month / QUERIES * 1e6:.2f} us')
+
+    weeks = [first + timedelta(days=7 * i) for i in range(1, days // 7)]
+    copied = MenuCalendar(user_id, menus[:7])
+    copy = timeit(lambda: [copied.copy_last_week(week) for week in weeks[:500]], number=1)
+    print(f'copy last week: {copy / 500 * 1e6:.2f} us')
+
+
+if __name__ == '__main__':
+    main()
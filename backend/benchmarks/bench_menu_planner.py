@@ -0,0 +1,47 @@
+'''
+Benchmarks planning a week of menus for many users, in process and in a process pool.
+
+Run from the backend directory:
+    python -m benchmarks.bench_menu_planner [processes]
+'''
+from datetime import date
+import os
+import random
+import sys
+from time import perf_counter
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.recipe import Recipe
+from app.services.menu_planner import MenuPlanner, PlanConstraints
+
+USERS = 2_000
+CATALOG = 1_000
+CATEGORIES = ('dairy', 'meat', 'parve', 'parve')
+
+
+def make_catalog(rng: random.Random) -> list:
+    user_id = ObjectId()
+    return [
+        Recipe(user_id=user_id, title=f'Recipe {i}', category=rng.choice(CATEGORIES),
+               prep_time=f'{rng.randint(5, 90)} minutes',
+               ingredients=[Ingredient(name=f'Ingredient {rng.randrange(300)}', quantity='1')
+                            for _ in range(rng.randint(4, 12))])
+        for i in range(CATALOG)
+    ]
+
+
+def main() -> None:
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    planner = MenuPlanner(make_catalog(random.Random(11)),
+                          PlanConstraints(days=7, recipes_per_day=3, max_prep_minutes_per_day=120))
+    user_ids = [ObjectId() for _ in range(USERS)]
+    start = date(2024, 5, 5)
+
+    for label, pool in (('in process', None), (f'{processes} processes', processes)):
+        began = perf_counter()
+        planner.plan_many(user_ids, start, processes=pool)
+        print(f'{label:>14}: {USERS / (perf_counter() - began):>8.0f} plans/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+'''
+Benchmarks the cost of the metrics on hot model operations.
+
+Times each operation before the metrics were ever enabled, while they are enabled,
+and after disable(). Disabled, the models run their own methods, so the first and
+last columns should match within noise.
+
+Run from the backend directory:
+    python -m benchmarks.bench_metrics
+'''
+from datetime import date
+from timeit import repeat
+from bson import ObjectId
+from app import metrics
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+
+NUMBER = 20_000
+
+
+def operations():
+    user_id = ObjectId()
+    recipe = Recipe(user_id=user_id, title='Pasta',
+                    ingredients=[Ingredient(name=f'Ingredient {i}', quantity='1 cup') for i in range(8)],
+                    steps=['Boil the water', 'Cook the pasta'], prep_time='10 minutes', category='parve')
+    extra = Recipe(user_id=user_id, title='Salad', ingredients=[Ingredient(name='Lettuce', quantity='1')],
+                   steps=['Mix'], prep_time='5 minutes', category='parve')
+    menu = Menu(user_id=user_id, date=date(2024, 5, 1), recipes=[recipe])
+
+    def add_and_remove():
+        menu.add_recipe(extra)
+        menu.remove_recipe('Salad')
+
+    return {
+        'Recipe.validate': recipe.validate,
+        'Recipe.to_dict': recipe.to_dict,
+        'Menu.add+remove': add_and_remove,
+    }
+
+
+def measure() -> dict:
+    # Bound methods are made after each switch, so they pick up the current functions
+    return {name: min(repeat(operation, number=NUMBER, repeat=5)) / NUMBER * 1e6
+            for name, operation in operations().items()}
+
+
+def main() -> None:
+    measure()  # warm up
+    never = measure()
+    metrics.enable()
+    enabled = measure()
+    metrics.disable()
+    disabled = measure()
+    print(f'{"operation":<18}{"never":>10}{"enabled":>10}{"disabled":>10}  (us per call)')
+    for name in never:
+        print(f'{name:<18}{never[name]:10.2f}{enabled[name]:10.2f}{disabled[name]:10.2f}')
+
+
+if __name__ == '__main__':
+    main()
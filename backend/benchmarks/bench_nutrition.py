@@ -0,0 +1,70 @@
+'''
+Benchmarks menu nutrition and cost rollups over a catalog of recipes.
+
+Compares the columnar IngredientTable with summing each Ingredient of each menu in a
+Python loop, for a batch of menus drawing on a shared recipe catalog.
+
+Run from the backend directory:
+    python -m benchmarks.bench_nutrition
+'''
+from datetime import date, timedelta
+import random
+from time import perf_counter
+import numpy as np
+from bson import ObjectId
+from app.models.menu import Menu
+from app.models.quantity import parse_quantity
+from app.services.ingredient_index import normalize_ingredient_name
+from app.services.nutrition import IngredientTable, NutritionTable
+from benchmarks.generators import make_recipes
+
+CATALOG_SIZE = 5_000
+MENU_COUNTS = (1_000, 10_000)
+
+
+def python_rollup(menus, nutrition: NutritionTable, servings: float) -> list:
+    totals = []
+    for menu in menus:
+        total = np.zeros(3)
+        for recipe in menu.recipes:
+            for ingredient in recipe.ingredients:
+                quantity = parse_quantity(ingredient.quantity)
+                if quantity is None:
+                    continue
+                values = nutrition.get(normalize_ingredient_name(ingredient.name), quantity.unit)
+                if values is not None:
+                    total += values * quantity.amount * servings
+        totals.append(total)
+    return totals
+
+
+def main() -> None:
+    rng = random.Random(0)
+    user_id = ObjectId()
+    catalog = make_recipes(CATALOG_SIZE, user_id=user_id)
+    nutrition = NutritionTable()
+    for i in range(5000):
+        for unit in ('gram', 'cup', 'tablespoon', 'ml', ''):
+            nutrition.add(f'Ingredient {i}', unit, calories=rng.uniform(0, 5), cost=rng.uniform(0, 0.1),
+                          grams=rng.uniform(0.5, 1.5))
+
+    for count in MENU_COUNTS:
+        menus = [Menu(user_id=user_id, date=date(2024, 1, 1) + timedelta(days=i), recipes=rng.sample(catalog, 3))
+                 for i in range(count)]
+        table = IngredientTable()
+        start = perf_counter()
+        table.menu_rollup(menus, nutrition, servings=2)
+        cold = perf_counter() - start
+        start = perf_counter()
+        rollup = table.menu_rollup(menus, nutrition, servings=2)
+        warm = perf_counter() - start
+        start = perf_counter()
+        expected = python_rollup(menus, nutrition, servings=2)
+        loop = perf_counter() - start
+        assert np.allclose(rollup.totals, expected)
+        print(f'{count:>6} menus: table {count / cold:10,.0f} menus/s cold, {count / warm:10,.0f} warm  '
+              f'python loop {count / loop:8,.0f} menus/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+'''
+Benchmarks similar-recipe queries on a large synthetic catalog.
+
+Builds the index from the catalog, then times queries by key against the merged
+base, queries right after single recipes are added (served from the in-memory part),
+and the merge itself. Pass the catalog size to try another scale.
+
+Run from the backend directory:
+    python -m benchmarks.bench_recommender
+    python -m benchmarks.bench_recommender 100000
+'''
+import random
+import sys
+from time import perf_counter
+from app.services.recommender import RecipeRecommender
+from benchmarks.generators import make_recipes
+
+QUERIES = 1000
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return {name: timings[int(len(timings) * fraction) - 1] * 1000
+            for name, fraction in (('p50', 0.5), ('p99', 0.99), ('max', 1.0))}
+
+
+def time_queries(recommender: RecipeRecommender, keys, rng: random.Random):
+    timings = []
+    for _ in range(QUERIES):
+        key = rng.choice(keys)
+        start = perf_counter()
+        recommender.similar(key, k=10)
+        timings.append(perf_counter() - start)
+    return percentiles(timings)
+
+
+def main(count: int = 500_000) -> None:
+    rng = random.Random(0)
+    start = perf_counter()
+    recipes = make_recipes(count)
+    print(f'generated {count} recipes in {perf_counter() - start:.1f}s')
+
+    recommender = RecipeRecommender()
+    start = perf_counter()
+    recommender.add_many(enumerate(recipes))
+    recommender.merge()
+    print(f'built the index in {perf_counter() - start:.1f}s')
+
+    stats = time_queries(recommender, range(count), rng)
+    print('query by key: ' + ', '.join(f'{name} {value:.2f} ms' for name, value in stats.items()))
+
+    extra = make_recipes(1000, seed=1)
+    start = perf_counter()
+    for i, recipe in enumerate(extra):
+        recommender.add(count + i, recipe)
+        recommender.similar(count + i, k=10)
+    elapsed = (perf_counter() - start) / len(extra) * 1000
+    print(f'add then query: {elapsed:.2f} ms per recipe, {len(extra)} recipes in the in-memory part')
+
+    start = perf_counter()
+    recommender.merge()
+    print(f'merge: {perf_counter() - start:.2f}s')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,71 @@
+'''
+Benchmarks serializing a week of menus for many users.
+
+Compares json.dumps over the to_dict chain with the batch serializer. Each approach
+runs REPEATS times after a full garbage collection and the best run is reported, as
+a single run mostly measures whether a full collection happened to fall inside it.
+
+Run from the backend directory:
+    python -m benchmarks.bench_serializer
+'''
+from datetime import date, timedelta
+import gc
+import json
+from time import perf_counter
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.models.serializer import iter_json, serialize_many
+
+USERS = 500
+RECIPES_PER_USER = 20
+RECIPES_PER_MENU = 4
+REPEATS = 10
+
+
+def make_menus() -> list:
+    '''
+    Builds a week of menus per user, drawing on a small recipe book per user.
+    '''
+    menus = []
+    today = date.today()
+    for _ in range(USERS):
+        user_id = ObjectId()
+        book = [
+            Recipe(user_id=user_id, title=f'Recipe {i}',
+                   ingredients=[Ingredient(name=f'Ingredient {j}', quantity='1 cup') for j in range(6)],
+                   steps=['Mix', 'Cook', 'Serve'], prep_time='20 minutes', category='parve')
+            for i in range(RECIPES_PER_USER)
+        ]
+        for day in range(7):
+            recipes = [book[(day * RECIPES_PER_MENU + k) % RECIPES_PER_USER] for k in range(RECIPES_PER_MENU)]
+            menus.append(Menu(user_id=user_id, date=today + timedelta(days=day), recipes=recipes))
+    return menus
+
+
+def timed(function) -> float:
+    best = None
+    for _ in range(REPEATS):
+        gc.collect()
+        start = perf_counter()
+        function()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main() -> None:
+    menus = make_menus()
+    results = {
+        'to_dict': timed(lambda: [menu.to_dict() for menu in menus]),
+        'serialize_many': timed(lambda: serialize_many(menus)),
+        'json.dumps(to_dict)': timed(lambda: json.dumps([menu.to_dict() for menu in menus])),
+        'iter_json': timed(lambda: ''.join(iter_json(menus))),
+    }
+    for name, seconds in results.items():
+        print(f'{name:>20} {len(menus) / seconds:>12.0f} menus/s')
+
+
+if __name__ == '__main__':
+    main()
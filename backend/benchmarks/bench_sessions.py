@@ -0,0 +1,56 @@
+'''
+Benchmarks authenticated request throughput.
+
+Compares checking the password with bcrypt on every request, verifying the signed
+session token on every request, and the verified-token cache, first for the
+authentication alone and then for requests to /me through the Flask test client.
+
+Run from the backend directory:
+    python -m benchmarks.bench_sessions
+'''
+from time import perf_counter
+import mongomock
+from app import create_app
+from app.models.user import User
+from app.repositories import UserRepository
+from app.services.sessions import SessionManager
+
+PASSWORD = 'GoodPassword12'
+
+
+def rate(function, seconds: float = 1.0) -> float:
+    '''
+    Returns how many times per second function runs, over about the given time.
+    '''
+    count, start = 0, perf_counter()
+    while perf_counter() - start < seconds:
+        function()
+        count += 1
+    return count / (perf_counter() - start)
+
+
+def main() -> None:
+    user = User(user_email='user@example.com', user_password=PASSWORD, user_name='User Example')
+    user.hash_password()
+    cached = SessionManager('secret')
+    uncached = SessionManager('secret', cache_size=0)
+    token = cached.login(user, PASSWORD)
+
+    print('authentication per second')
+    print(f'  {"bcrypt per request:":<22}{rate(lambda: user.check_password(PASSWORD), 3.0):12,.1f}')
+    print(f'  {"signed token:":<22}{rate(lambda: uncached.authenticate(token)):12,.0f}')
+    print(f'  {"verified-token cache:":<22}{rate(lambda: cached.authenticate(token)):12,.0f}')
+
+    database = mongomock.MongoClient().db
+    UserRepository(database).insert_many([user])
+    print('requests to /me per second')
+    for name, cache_size in (('signed token', 0), ('verified-token cache', 10000)):
+        client = create_app({'MONGO_DATABASE': database, 'SECRET_KEY': 'secret',
+                             'SESSION_CACHE_SIZE': cache_size}).test_client()
+        login = client.post('/sessions', json={'user_email': user.user_email, 'user_password': PASSWORD})
+        headers = {'Authorization': f'Bearer {login.get_json()["token"]}'}
+        print(f'  {name + ":":<22}{rate(lambda: client.get("/me", headers=headers)):12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
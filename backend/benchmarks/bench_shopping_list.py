@@ -0,0 +1,63 @@
+'''
+Benchmarks building consolidated shopping lists for thousands of menus.
+
+Compares summing parsed quantities per planned ingredient in Python with build_shopping_list.
+
+Run from the backend directory:
+    python -m benchmarks.bench_shopping_list
+'''
+from datetime import date, timedelta
+import random
+from time import perf_counter
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.quantity import parse_quantity
+from app.models.recipe import Recipe
+from app.services.ingredient_index import normalize_ingredient_name
+from app.services.shopping_list import build_shopping_list
+
+MENUS = 5_000
+CATALOG = 300
+UNITS = ('gram', 'kg', 'cups', 'tsp', 'Tbs', 'slices', '')
+
+
+def make_menus(rng: random.Random) -> list:
+    user_id = ObjectId()
+    catalog = [
+        Recipe(user_id=user_id, title=f'Recipe {i}', ingredients=[
+            Ingredient(name=f'Ingredient {rng.randrange(200)}', quantity=f'{rng.randint(1, 500)} {rng.choice(UNITS)}')
+            for _ in range(rng.randint(4, 12))
+        ])
+        for i in range(CATALOG)
+    ]
+    start = date(2024, 1, 1)
+    return [Menu(user_id=user_id, date=start + timedelta(days=i % 365), recipes=rng.sample(catalog, 3))
+            for i in range(MENUS)]
+
+
+def per_item_totals(menus: list) -> dict:
+    totals = {}
+    for menu in menus:
+        for recipe in menu.recipes:
+            for ingredient in recipe.ingredients:
+                quantity = parse_quantity(ingredient.quantity)
+                key = (normalize_ingredient_name(ingredient.name), quantity.unit)
+                totals[key] = totals.get(key, 0.0) + quantity.amount
+    return totals
+
+
+def main() -> None:
+    menus = make_menus(random.Random(3))
+    start = perf_counter()
+    per_item_totals(menus)
+    loop_seconds = perf_counter() - start
+    start = perf_counter()
+    build_shopping_list(menus)
+    grouped_seconds = perf_counter() - start
+    print(f'{MENUS} menus: per-item loop {loop_seconds * 1000:.1f}ms, '
+          f'build_shopping_list {grouped_seconds * 1000:.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
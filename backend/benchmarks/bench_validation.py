@@ -0,0 +1,37 @@
+'''
+Benchmarks validating a bulk import of recipes and users.
+
+Reports the validate_many throughput of a batch. The rules keep no state on the
+models, so a second pass over an unchanged batch costs the same as the first.
+
+Run from the backend directory:
+    python -m benchmarks.bench_validation
+'''
+from time import perf_counter
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.recipe import Recipe
+from app.models.user import User
+from app.models.validation import validate_many
+
+COUNT = 100_000
+
+
+def throughput(items: list) -> float:
+    start = perf_counter()
+    validate_many(items)
+    return len(items) / (perf_counter() - start)
+
+
+def main() -> None:
+    user_ids = [str(ObjectId()) for _ in range(1000)]
+    recipes = [Recipe(user_id=user_ids[i % len(user_ids)], title=f'Recipe {i}', category='parve',
+                      ingredients=[Ingredient(name='Water', quantity='1 cup')]) for i in range(COUNT)]
+    users = [User(user_email=f'user{i}@example.com', user_password=f'GoodPassword{i}', user_name=f'User {i}')
+             for i in range(COUNT)]
+    for name, items in (('recipes', recipes), ('users', users)):
+        print(f'{name:>8}: {throughput(items):>10.0f}/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+'''
+Synthetic data generators for the benchmarks.
+
+Each generator is deterministic for a seed, so runs on different commits time the
+same data.
+'''
+from datetime import date, timedelta
+import random
+from typing import List
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.models.user import User
+
+# Objects per generated batch at each scale
+SCALES = {'small': 100, 'medium': 1_000, 'large': 10_000}
+
+UNITS = ('gram', 'cup', 'tablespoon', 'ml', '')
+CATEGORIES = ('meat', 'dairy', 'parve')
+VERBS = ('Chop', 'Mix', 'Boil', 'Fry', 'Bake', 'Stir', 'Season', 'Serve')
+
+
+def _object_id(rng: random.Random) -> ObjectId:
+    return ObjectId(rng.randbytes(12))
+
+
+def make_users(count: int, seed: int = 0) -> List[User]:
+    rng = random.Random(seed)
+    return [User(user_email=f'user{i}@example.com', user_password=f'Password{rng.randrange(10 ** 6)}',
+                 user_name=f'User {i}') for i in range(count)]
+
+
+def make_ingredients(count: int, seed: int = 0) -> List[Ingredient]:
+    rng = random.Random(seed)
+    return [Ingredient(name=f'Ingredient {rng.randrange(5000)}',
+                       quantity=f'{rng.randint(1, 500)} {rng.choice(UNITS)}'.strip()) for _ in range(count)]
+
+
+def make_recipes(count: int, seed: int = 0, ingredients_per_recipe: int = 8,
+                 user_id: ObjectId = None) -> List[Recipe]:
+    rng = random.Random(seed)
+    user_id = user_id or _object_id(rng)
+    return [
+        Recipe(
+            user_id=user_id, title=f'Recipe {i}', description='A synthetic recipe',
+            ingredients=make_ingredients(ingredients_per_recipe, seed=rng.randrange(2 ** 32)),
+            steps=[f'{rng.choice(VERBS)} for {rng.randint(1, 30)} minutes' for _ in range(rng.randint(2, 6))],
+            prep_time=f'{rng.randint(5, 120)} minutes', category=rng.choice(CATEGORIES),
+        )
+        for i in range(count)
+    ]
+
+
+def make_menus(count: int, seed: int = 0, recipes_per_menu: int = 3) -> List[Menu]:
+    '''
+    Returns one user's daily menus, drawing their recipes from a shared pool.
+    '''
+    rng = random.Random(seed)
+    user_id = _object_id(rng)
+    pool = make_recipes(max(recipes_per_menu, 50), seed=seed, user_id=user_id)
+    start = date(2024, 1, 1)
+    return [Menu(user_id=user_id, date=start + timedelta(days=i), recipes=rng.sample(pool, recipes_per_menu))
+            for i in range(count)]
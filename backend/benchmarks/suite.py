@@ -0,0 +1,204 @@
+'''
+Benchmark suite for the models: construction, validate, to_dict, the menu mutators
+and bcrypt hashing, on synthetic data at several scales.
+
+Results are written as JSON with the seconds per operation of each case. The compare
+mode checks a run against a stored baseline and exits with status 1 if any case got
+slower by more than the threshold, so it can gate a CI job.
+
+Run from the backend directory:
+    python -m benchmarks.suite run --scale small medium --output baseline.json
+    python -m benchmarks.suite run --output current.json --baseline baseline.json
+    python -m benchmarks.suite compare baseline.json current.json --threshold 0.2
+'''
+import argparse
+from dataclasses import dataclass
+import json
+import platform
+import sys
+from time import perf_counter
+from typing import Callable, Dict, List, Sequence
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.models.user import User
+from benchmarks.generators import SCALES, make_ingredients, make_menus, make_recipes, make_users
+
+# bcrypt takes hundreds of milliseconds per call, so it is timed on a few users at any scale
+BCRYPT_USERS = 2
+REPEAT = 5
+
+
+@dataclass
+class Case:
+    '''
+    A benchmark case: setup builds fresh data for each repeat, and run is timed on it.
+
+    Attributes:
+        name (str): The metric name, the scale is appended for scaled cases.
+        setup (Callable[[int], object]): Builds the data for a number of objects.
+        run (Callable[[object], int]): The timed code, returning the number of operations.
+        scaled (bool): Whether the case runs at every scale, or once.
+    '''
+    name: str
+    setup: Callable[[int], object]
+    run: Callable[[object], int]
+    scaled: bool = True
+
+
+def _each(function: Callable) -> Callable[[list], int]:
+    def run(items: list) -> int:
+        for item in items:
+            function(item)
+        return len(items)
+    return run
+
+
+def _construct(cls) -> Callable[[list], int]:
+    def run(rows: list) -> int:
+        for row in rows:
+            cls(**row)
+        return len(rows)
+    return run
+
+
+def _fields(make: Callable, names: Sequence[str]) -> Callable[[int], list]:
+    '''
+    Returns a setup making the constructor arguments of the generated objects.
+    '''
+    return lambda count: [{name: getattr(item, name) for name in names} for item in make(count)]
+
+
+def _menu_with_extra(count: int):
+    recipes = make_recipes(2 * count, seed=3)
+    menu = make_menus(1)[0]
+    return Menu(user_id=recipes[0].user_id, date=menu.date, recipes=recipes[:count]), recipes[count:]
+
+
+def _add_and_remove(state) -> int:
+    menu, extra = state
+    for recipe in extra:
+        menu.add_recipe(recipe)
+    for recipe in extra:
+        menu.remove_recipe(recipe.title)
+    return 2 * len(extra)
+
+
+def _hashed_users(count: int) -> List[User]:
+    users = make_users(BCRYPT_USERS)
+    for user in users:
+        user.hash_password()
+    return users
+
+
+CASES = [
+    Case('user.construct', _fields(make_users, ('user_email', 'user_password', 'user_name')), _construct(User)),
+    Case('ingredient.construct', _fields(make_ingredients, ('name', 'quantity')), _construct(Ingredient)),
+    Case('recipe.construct', _fields(make_recipes, ('user_id', 'title', 'description', 'ingredients', 'steps',
+                                                    'prep_time', 'category')), _construct(Recipe)),
+    Case('menu.construct', _fields(make_menus, ('user_id', 'date', 'recipes')), _construct(Menu)),
+    Case('user.validate', make_users, _each(User.validate)),
+    Case('ingredient.validate', make_ingredients, _each(Ingredient.validate)),
+    Case('recipe.validate', make_recipes, _each(Recipe.validate)),
+    Case('menu.validate', make_menus, _each(Menu.validate)),
+    Case('user.to_dict', make_users, _each(User.to_dict)),
+    Case('ingredient.to_dict', make_ingredients, _each(Ingredient.to_dict)),
+    Case('recipe.to_dict', make_recipes, _each(Recipe.to_dict)),
+    Case('menu.to_dict', make_menus, _each(Menu.to_dict)),
+    Case('menu.add_remove_recipe', _menu_with_extra, _add_and_remove),
+    Case('user.hash_password', lambda count: make_users(BCRYPT_USERS), _each(User.hash_password), scaled=False),
+    Case('user.check_password', _hashed_users, _each(lambda user: user.check_password('Password0')), scaled=False),
+]
+
+
+def time_case(case: Case, count: int, repeat: int = REPEAT) -> float:
+    '''
+    Returns the best seconds per operation of the case over the repeats, with fresh data for each.
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        data = case.setup(count)
+        start = perf_counter()
+        operations = case.run(data)
+        best = min(best, (perf_counter() - start) / operations)
+    return best
+
+
+def run_suite(scales: Sequence[str], cases: Sequence[Case] = CASES, repeat: int = REPEAT,
+              log: Callable[[str], None] = print) -> dict:
+    '''
+    Runs the cases at the scales.
+
+    Returns:
+        dict: The machine and the seconds per operation of each metric, e.g.
+            results['recipe.validate[medium]'].
+    '''
+    results = {}
+    for case in cases:
+        for scale in (scales if case.scaled else scales[:1]):
+            name = f'{case.name}[{scale}]' if case.scaled else case.name
+            results[name] = time_case(case, SCALES[scale] if case.scaled else BCRYPT_USERS,
+                                      repeat if case.scaled else 1)
+            log(f'{name:<40}{results[name] * 1e6:12.3f} us')
+    return {
+        'machine': {'python': platform.python_version(), 'platform': platform.platform()},
+        'scales': list(scales),
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> Dict[str, float]:
+    '''
+    Returns the metrics of current that are slower than in the baseline by more than
+    threshold (e.g. 0.2 for 20%), with their ratio to the baseline.
+    '''
+    regressions = {}
+    for name, seconds in current['results'].items():
+        before = baseline['results'].get(name)
+        if before and seconds / before > 1 + threshold:
+            regressions[name] = seconds / before
+    return regressions
+
+
+def _report(baseline: dict, current: dict, threshold: float) -> int:
+    regressions = compare(baseline, current, threshold)
+    for name, seconds in current['results'].items():
+        before = baseline['results'].get(name)
+        change = f'{(seconds / before - 1) * 100:+7.1f}%' if before else '    new'
+        flag = '  REGRESSION' if name in regressions else ''
+        print(f'{name:<40}{change}{flag}')
+    print(f'{len(regressions)} regression(s) beyond {threshold:.0%}')
+    return 1 if regressions else 0
+
+
+def main(argv: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description=__doc__.split('\n\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='run the suite')
+    run.add_argument('--scale', nargs='+', choices=list(SCALES), default=['small', 'medium'])
+    run.add_argument('--repeat', type=int, default=REPEAT)
+    run.add_argument('--output', help='write the results to this JSON file')
+    run.add_argument('--baseline', help='compare the results with this JSON file')
+    run.add_argument('--threshold', type=float, default=0.2)
+    check = commands.add_parser('compare', help='compare two result files')
+    check.add_argument('baseline')
+    check.add_argument('current')
+    check.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        with open(args.baseline) as baseline, open(args.current) as current:
+            return _report(json.load(baseline), json.load(current), args.threshold)
+
+    current = run_suite(args.scale, repeat=args.repeat)
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(current, fp, indent=2)
+    if args.baseline:
+        with open(args.baseline) as fp:
+            return _report(json.load(fp), current, args.threshold)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,225 @@
+import asyncio
+from datetime import date
+import json
+import subprocess
+import sys
+import time
+import unittest
+from bson import ObjectId
+import mongomock
+from app import COLD_START_BUDGET_SECONDS, create_app, metrics
+from app.asgi import create_asgi_app
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.repositories import MenuRepository, RecipeRepository
+
+COLD_START_SCRIPT = '''
+import json, sys
+from time import perf_counter
+start = perf_counter()
+from app import create_app
+app = create_app({'PROFILE_STARTUP': True})
+elapsed = perf_counter() - start
+print(json.dumps({
+    'elapsed': elapsed,
+    'profile': list(app.extensions['startup_profile']),
+    'loaded': [name for name in ('pymongo', 'app.models.recipe', 'app.api.recipes') if name in sys.modules],
+}))
+'''
+
+
+async def asgi_get(asgi_app, path: str) -> tuple:
+    '''
+    Sends a GET request to an ASGI app, returns the status and the body.
+    '''
+    path, _, query = path.partition('?')
+    messages = []
+
+    async def receive() -> dict:
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    await asgi_app({'type': 'http', 'method': 'GET', 'path': path, 'query_string': query.encode(), 'headers': []},
+                   receive, send)
+    return messages[0]['status'], messages[1]['body']
+
+
+class TestApp(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up an app on an in-memory database with a recipe and a menu
+        '''
+        self.database = mongomock.MongoClient().db
+        self.app = create_app({'MONGO_DATABASE': self.database, 'TESTING': True})
+        self.client = self.app.test_client()
+        self.user_id = ObjectId()
+        self.recipe = Recipe(user_id=self.user_id, title='Pasta',
+                             ingredients=[Ingredient(name='Pastsa', quantity='100 gram')],
+                             steps=['Boil the water'], prep_time='10 minutes', category='parve')
+        self.recipe_id = RecipeRepository(self.database).insert(self.recipe)
+        MenuRepository(self.database).save(Menu(user_id=self.user_id, date=date(2024, 5, 1), recipes=[self.recipe]))
+
+    def test_cold_start_budget(self) -> None:
+        '''
+        Tests that create_app() stays under the cold-start budget in a fresh interpreter
+        and leaves the models, pymongo and the views for the first request.
+        '''
+        output = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT], capture_output=True, text=True,
+                                check=True).stdout
+        result = json.loads(output)
+        self.assertLess(result['elapsed'], COLD_START_BUDGET_SECONDS)
+        self.assertEqual(result['loaded'], [])
+        self.assertEqual(result['profile'], ['flask', 'app.api', 'create_app'])
+
+    def test_health(self) -> None:
+        '''
+        Tests the health endpoint.
+        '''
+        self.assertEqual(self.client.get('/health').get_json(), {'status': 'ok'})
+
+    def test_get_recipe(self) -> None:
+        '''
+        Tests reading a recipe, and a 404 for an unknown or invalid id.
+        '''
+        response = self.client.get(f'/recipes/{self.recipe_id}')
+        self.assertEqual(response.get_json(), {**self.recipe.to_dict(), '_id': str(self.recipe_id)})
+        self.assertEqual(self.client.get(f'/recipes/{ObjectId()}').status_code, 404)
+        self.assertEqual(self.client.get('/recipes/invalid').status_code, 404)
+
+    def test_list_recipes(self) -> None:
+        '''
+        Tests listing the user's recipe summaries.
+        '''
+        recipes = self.client.get(f'/users/{self.user_id}/recipes').get_json()
+        self.assertEqual([recipe['title'] for recipe in recipes], ['Pasta'])
+        self.assertNotIn('steps', recipes[0])
+
+    def test_menus(self) -> None:
+        '''
+        Tests listing menus by date range and reading one menu.
+        '''
+        menus = self.client.get(f'/users/{self.user_id}/menus?start=2024-05-01&end=2024-05-31').get_json()
+        self.assertEqual([menu['date'] for menu in menus], ['2024-05-01'])
+        self.assertEqual(self.client.get(f'/users/{self.user_id}/menus?start=2024-06-01').get_json(), [])
+        self.assertEqual(self.client.get(f'/users/{self.user_id}/menus?start=May').status_code, 400)
+
+        menu = self.client.get(f'/users/{self.user_id}/menus/2024-05-01').get_json()
+        self.assertEqual(menu['recipes'], [self.recipe.to_dict()])
+        self.assertEqual(self.client.get(f'/users/{self.user_id}/menus/2024-05-02').status_code, 404)
+
+    def test_menu_etag_and_changes(self) -> None:
+        '''
+        Tests that clients holding the current menu version get a 304, and older versions a patch.
+        '''
+        path = f'/users/{self.user_id}/menus/2024-05-01'
+        response = self.client.get(path)
+        self.assertEqual(response.headers['ETag'], '"1"')
+        self.assertEqual(self.client.get(path, headers={'If-None-Match': '"1"'}).status_code, 304)
+
+        menus = MenuRepository(self.database)
+        menu = menus.find_menu(self.user_id, date(2024, 5, 1))
+        menu.remove_recipe('Pasta')
+        menus.save_changes(menu)
+        self.assertEqual(self.client.get(path, headers={'If-None-Match': '"1"'}).headers['ETag'], '"2"')
+        self.assertEqual(self.client.get(f'{path}/changes?since=1').get_json(),
+                         {'version': 2, 'patch': [{'op': 'remove', 'path': '/recipes/0'}]})
+        self.assertEqual(self.client.get(f'{path}/changes?since=0').get_json()['menu']['recipes'], [])
+        self.assertEqual(self.client.get(f'{path}/changes').status_code, 400)
+        self.assertEqual(self.client.get(f'/users/{self.user_id}/menus/2024-05-02/changes?since=0').status_code, 404)
+
+    def test_startup_profile_records_lazy_imports(self) -> None:
+        '''
+        Tests that the startup profile records the views imported on the first request.
+        '''
+        app = create_app({'MONGO_DATABASE': self.database, 'PROFILE_STARTUP': True})
+        app.test_client().get(f'/users/{self.user_id}/recipes')
+        self.assertIn('app.api.recipes', app.extensions['startup_profile'])
+
+    def test_overview(self) -> None:
+        '''
+        Tests the overview of the user's recipes and menus.
+        '''
+        overview = self.client.get(f'/users/{self.user_id}/overview').get_json()
+        self.assertEqual([recipe['title'] for recipe in overview['recipes']], ['Pasta'])
+        self.assertEqual([menu['date'] for menu in overview['menus']], ['2024-05-01'])
+
+    def test_async_mode_matches_sync(self) -> None:
+        '''
+        Tests that the async api returns the same responses as the sync api.
+        '''
+        async_client = create_app({'MONGO_DATABASE': self.database, 'API_MODE': 'async'}).test_client()
+        for path in ('/health', f'/recipes/{self.recipe_id}', f'/recipes/{ObjectId()}', '/recipes/invalid',
+                     f'/users/{self.user_id}/recipes', f'/users/{self.user_id}/menus?start=2024-05-01',
+                     f'/users/{self.user_id}/menus?start=May', f'/users/{self.user_id}/menus/2024-05-01',
+                     f'/users/{self.user_id}/menus/2024-05-02', f'/users/{self.user_id}/overview',
+                     f'/users/{self.user_id}/menus/2024-05-01/changes?since=0'):
+            expected, response = self.client.get(path), async_client.get(path)
+            self.assertEqual(response.status_code, expected.status_code, path)
+            self.assertEqual(response.get_json(), expected.get_json(), path)
+
+    def test_asgi_matches_sync(self) -> None:
+        '''
+        Tests that the ASGI app returns the same responses as the sync api, with request hooks and errors.
+        '''
+        asgi_app = create_asgi_app({'MONGO_DATABASE': self.database, 'METRICS': True})
+        self.addCleanup(metrics.disable)
+        paths = ['/health', f'/recipes/{self.recipe_id}', f'/recipes/{ObjectId()}', '/recipes/invalid', '/missing',
+                 f'/users/{self.user_id}/menus?start=2024-05-01', f'/users/{self.user_id}/menus?start=May',
+                 f'/users/{self.user_id}/menus/2024-05-01', f'/users/{self.user_id}/overview',
+                 f'/users/{self.user_id}/menus/2024-05-01/changes?since=0']
+
+        async def get_all() -> list:
+            return await asyncio.gather(*(asgi_get(asgi_app, path) for path in paths))
+
+        for path, (status, body) in zip(paths, asyncio.run(get_all())):
+            expected = self.client.get(path)
+            self.assertEqual(status, expected.status_code, path)
+            if status == 200:
+                self.assertEqual(json.loads(body), expected.get_json(), path)
+        self.assertIn(b'dish_dash_request_seconds', asyncio.run(asgi_get(asgi_app, '/metrics'))[1])
+
+    def test_asgi_requests_wait_without_threads(self) -> None:
+        '''
+        Tests that ASGI requests waiting on the database are served at the same time by one event loop.
+        '''
+        database = self.database
+
+        class SlowCollection:
+            def __init__(self, collection) -> None:
+                self._collection = collection
+
+            def find(self, *args, **kwargs):
+                time.sleep(0.05)
+                return self._collection.find(*args, **kwargs)
+
+            def __getattr__(self, name):
+                return getattr(self._collection, name)
+
+        class SlowDatabase:
+            def __getitem__(self, name):
+                return SlowCollection(database[name])
+
+        asgi_app = create_asgi_app({'MONGO_DATABASE': SlowDatabase(), 'DB_THREADS': 40})
+
+        async def get_all() -> list:
+            return await asyncio.gather(*(asgi_get(asgi_app, f'/users/{self.user_id}/overview') for _ in range(20)))
+
+        start = time.perf_counter()
+        responses = asyncio.run(get_all())
+        # 20 requests of two 50ms reads each, one after the other they would take 2 seconds
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual({status for status, _ in responses}, {200})
+
+    def test_invalid_api_mode(self) -> None:
+        '''
+        Tests that an unknown API_MODE is rejected.
+        '''
+        with self.assertRaises(ValueError):
+            create_app({'API_MODE': 'threads'})
+
+
+if __name__ == '__main__':
+    unittest.main()
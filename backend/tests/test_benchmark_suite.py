@@ -0,0 +1,50 @@
+import json
+import os
+import tempfile
+import unittest
+from benchmarks.generators import make_menus, make_recipes
+from benchmarks.suite import CASES, compare, main, run_suite
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_generators_are_deterministic(self) -> None:
+        '''
+        Tests that the generators make the same valid data for a seed.
+        '''
+        self.assertEqual(make_recipes(5, seed=1), make_recipes(5, seed=1))
+        for menu in make_menus(5):
+            menu.validate()
+
+    def test_run_suite(self) -> None:
+        '''
+        Tests that every scaled case runs and reports seconds per operation.
+        '''
+        cases = [case for case in CASES if case.scaled]
+        report = run_suite(['small'], cases, repeat=1, log=lambda line: None)
+        self.assertEqual(set(report['results']), {f'{case.name}[small]' for case in cases})
+        self.assertTrue(all(seconds > 0 for seconds in report['results'].values()))
+
+    def test_compare(self) -> None:
+        '''
+        Tests that only metrics slower than the threshold are regressions.
+        '''
+        baseline = {'results': {'a': 1.0, 'b': 1.0, 'c': 1.0}}
+        current = {'results': {'a': 1.1, 'b': 1.5, 'c': 0.5, 'd': 9.0}}
+        self.assertEqual(compare(baseline, current, 0.2), {'b': 1.5})
+
+    def test_compare_exit_status(self) -> None:
+        '''
+        Tests that the compare command fails on a regression.
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for name, seconds in (('baseline', 1.0), ('current', 2.0)):
+                paths.append(os.path.join(directory, f'{name}.json'))
+                with open(paths[-1], 'w') as fp:
+                    json.dump({'results': {'recipe.validate[small]': seconds}}, fp)
+            self.assertEqual(main(['compare', paths[0], paths[1], '--threshold', '0.5']), 1)
+            self.assertEqual(main(['compare', paths[0], paths[0]]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
+from dataclasses import FrozenInstanceError
 import unittest
-from app.models.ingredient import Ingredient
+from app.models.ingredient import FrozenIngredient, Ingredient
 
 
 class TestIngredientModel(unittest.TestCase):
@@ -57,6 +58,32 @@ class TestIngredientModel(unittest.TestCase):
         self.assertEqual(ingredient_dict['name'], 'Sugar')
         self.assertEqual(ingredient_dict['quantity'], '1 cup')
 
+    def test_hash(self) -> None:
+        '''
+        Tests that equal ingredients hash the same and can be used in a set.
+        '''
+        same = Ingredient(**self.ingredient_data)
+        self.assertEqual(hash(same), hash(self.ingredient))
+        self.assertEqual(len({self.ingredient, same}), 1)
+        self.assertFalse(hasattr(self.ingredient, '__dict__'))
+
+    def test_freeze(self) -> None:
+        '''
+        Tests that a frozen ingredient keeps its data, cannot be changed and thaws back.
+        '''
+        frozen = self.ingredient.freeze()
+        self.assertIsInstance(frozen, FrozenIngredient)
+        self.assertEqual(frozen.to_dict(), self.ingredient.to_dict())
+        with self.assertRaises(FrozenInstanceError):
+            frozen.name = 'Salt'
+        self.assertEqual(frozen.thaw(), self.ingredient)
+
+    def test_from_dict(self) -> None:
+        '''
+        Tests that an ingredient is recreated from its dictionary.
+        '''
+        self.assertEqual(Ingredient.from_dict(self.ingredient.to_dict()), self.ingredient)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+import unittest
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.recipe import Recipe
+from app.services import ingredient_index
+from app.services.ingredient_index import IngredientIndex, normalize_ingredient_name
+
+
+def make_recipe(title: str, *names: str) -> Recipe:
+    return Recipe(user_id=ObjectId(), title=title, ingredients=[Ingredient(name=name, quantity='1') for name in names])
+
+
+class TestIngredientIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up an index over a few recipes
+        '''
+        self.index = IngredientIndex([
+            ('pasta', make_recipe('Pasta', 'Pasta', 'Water')),
+            ('ketchup pasta', make_recipe('Pasta with ketchop', 'Pasta', 'water ', 'Ketchup')),
+            ('omelette', make_recipe('Omelette', 'Eggs', 'Oil', 'Salt')),
+        ])
+
+    def test_normalize_ingredient_name(self) -> None:
+        '''
+        Tests that names are case-folded and their whitespace collapsed.
+        '''
+        self.assertEqual(normalize_ingredient_name('  Olive   OIL '), 'olive oil')
+
+    def test_recipes_with_all(self) -> None:
+        '''
+        Tests finding recipes that use all of the given ingredients.
+        '''
+        self.assertEqual(self.index.recipes_with_all(['pasta', 'WATER']), {'pasta', 'ketchup pasta'})
+        self.assertEqual(self.index.recipes_with_all(['pasta', 'ketchup']), {'ketchup pasta'})
+        self.assertEqual(self.index.recipes_with_all(['pasta', 'eggs']), set())
+        self.assertEqual(self.index.recipes_with_all(['saffron']), set())
+
+    def test_recipes_missing_at_most(self) -> None:
+        '''
+        Tests finding recipes missing at most k ingredients, fewest missing first.
+        '''
+        pantry = ['Pasta', 'Water', 'Salt']
+        self.assertEqual(self.index.recipes_missing_at_most(pantry, 0), [('pasta', 0)])
+        self.assertEqual(self.index.recipes_missing_at_most(pantry, 2),
+                         [('pasta', 0), ('ketchup pasta', 1), ('omelette', 2)])
+
+    def test_remove_and_replace(self) -> None:
+        '''
+        Tests that removed recipes leave the results and that adding an existing id replaces it.
+        '''
+        self.index.remove('pasta')
+        self.assertNotIn('pasta', self.index)
+        self.assertEqual(self.index.recipes_with_all(['pasta']), {'ketchup pasta'})
+        self.index.add('omelette', make_recipe('Omelette', 'Eggs'))
+        self.assertEqual(self.index.recipes_missing_at_most(['eggs'], 0), [('omelette', 0)])
+        self.assertEqual(len(self.index), 2)
+        with self.assertRaises(KeyError):
+            self.index.remove('pasta')
+
+    def test_compact(self) -> None:
+        '''
+        Tests that compaction after many removals keeps the results.
+        '''
+        threshold = ingredient_index.COMPACT_THRESHOLD
+        ingredient_index.COMPACT_THRESHOLD = 2
+        try:
+            for i in range(4):
+                self.index.add(i, make_recipe(f'Salad {i}', 'Lettuce'))
+            for i in range(4):
+                self.index.remove(i)
+        finally:
+            ingredient_index.COMPACT_THRESHOLD = threshold
+        self.assertEqual(self.index._dead, 0)
+        self.assertEqual(self.index.recipes_with_all(['lettuce']), set())
+        self.assertEqual(self.index.recipes_with_all(['water']), {'pasta', 'ketchup pasta'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+from datetime import date, timedelta
+import io
+import json
+import os
+import tempfile
+import unittest
+from bson import ObjectId
+import mongomock
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.repositories import MenuRepository, RecipeRepository
+from app.services.jsonl_transfer import export_collection, export_jsonl, import_jsonl
+
+
+class TestJsonlTransfer(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up repositories on an in-memory database and a few recipes
+        '''
+        database = mongomock.MongoClient().db
+        self.recipes = RecipeRepository(database)
+        self.menus = MenuRepository(database)
+        self.user_id = ObjectId()
+        self.catalog = [
+            Recipe(user_id=self.user_id, title=f'Recipe {i}', steps=['Cook'],
+                   ingredients=[Ingredient(name='Water', quantity=f'{i + 1} cups')])
+            for i in range(10)
+        ]
+
+    def export(self, items) -> io.BytesIO:
+        text = io.StringIO()
+        export_jsonl(items, text)
+        return io.BytesIO(text.getvalue().encode('utf-8'))
+
+    def test_import_recipes(self) -> None:
+        '''
+        Tests importing recipes in chunks, skipping and reporting invalid lines.
+        '''
+        source = self.export(self.catalog)
+        source.seek(0, io.SEEK_END)
+        source.write(b'not json\n\n')
+        source.write(json.dumps({**self.catalog[0].to_dict(), 'title': '', 'category': 'vegan'}).encode() + b'\n')
+        progress = []
+        result = import_jsonl(source, Recipe, self.recipes, chunk_size=4, start_offset=0,
+                              on_progress=lambda running: progress.append(running.read))
+        self.assertEqual((result.read, result.imported, result.invalid), (13, 10, 2))
+        self.assertEqual(progress, [4, 8, 12, 13])
+        self.assertEqual(result.errors[0][0], 11)
+        self.assertEqual(result.errors[1], (13, ['Title cannot be empty.', 'Invalid category: vegan']))
+        self.assertEqual(result.offset, len(source.getvalue()))
+        self.assertEqual(Recipe.from_dict(self.recipes.find_by_title(self.user_id, 'Recipe 3')), self.catalog[3])
+
+    def test_resume_from_checkpoint(self) -> None:
+        '''
+        Tests that an import resumes from its checkpoint without duplicating recipes.
+        '''
+        data = self.export(self.catalog).getvalue()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'recipes.jsonl')
+            checkpoint_path = os.path.join(directory, 'recipes.checkpoint')
+            with open(path, 'wb') as fp:
+                fp.write(data)
+
+            def crash(result) -> None:
+                if result.read >= 6:
+                    raise RuntimeError('crash')
+
+            with self.assertRaises(RuntimeError):
+                import_jsonl(path, Recipe, self.recipes, chunk_size=3, checkpoint_path=checkpoint_path,
+                             on_progress=crash)
+            self.assertEqual(self.recipes.collection.count_documents({}), 6)
+
+            result = import_jsonl(path, Recipe, self.recipes, chunk_size=3, checkpoint_path=checkpoint_path)
+            self.assertEqual(result.read, 4)
+            self.assertEqual(self.recipes.collection.count_documents({}), 10)
+            with open(checkpoint_path, encoding='utf-8') as checkpoint:
+                self.assertEqual(int(checkpoint.read()), len(data))
+
+    def test_reimport_export_by_id(self) -> None:
+        '''
+        Tests that recipes sharing a title are kept apart and importing an export twice does not duplicate them.
+        '''
+        other = Recipe(user_id=self.user_id, title='Recipe 0', steps=['Bake'],
+                       ingredients=[Ingredient(name='Flour', quantity='2 cups')])
+        self.recipes.insert_many(self.catalog + [other])
+        text = io.StringIO()
+        self.assertEqual(export_collection(self.recipes, text), 11)
+        data = text.getvalue().encode('utf-8')
+        self.recipes.collection.delete_many({})
+
+        for _ in range(2):
+            result = import_jsonl(io.BytesIO(data), Recipe, self.recipes, chunk_size=4, start_offset=0)
+            self.assertEqual((result.imported, result.invalid), (11, 0))
+            self.assertEqual(self.recipes.collection.count_documents({}), 11)
+        stored = [Recipe.from_dict(document) for document in self.recipes.collection.find({'title': 'Recipe 0'})]
+        self.assertCountEqual(stored, [self.catalog[0], other])
+
+        line = json.dumps({**self.catalog[1].to_dict(), '_id': 'abc'}).encode('utf-8') + b'\n'
+        result = import_jsonl(io.BytesIO(line), Recipe, self.recipes, start_offset=0)
+        self.assertEqual(result.invalid, 1)
+        self.assertIn('Invalid ObjectId: abc', result.errors[0][1][0])
+
+    def test_menus_round_trip(self) -> None:
+        '''
+        Tests exporting stored menus and importing them again.
+        '''
+        menus = [Menu(user_id=self.user_id, date=date(2024, 5, 1) + timedelta(days=day), recipes=self.catalog[:2])
+                 for day in range(3)]
+        self.menus.save_many(menus)
+        text = io.StringIO()
+        self.assertEqual(export_collection(self.menus, text, chunk_size=2), 3)
+        self.menus.collection.delete_many({})
+
+        result = import_jsonl(io.BytesIO(text.getvalue().encode('utf-8')), Menu, self.menus, start_offset=0)
+        self.assertEqual(result.imported, 3)
+        self.assertEqual(self.menus.find_menu(self.user_id, date(2024, 5, 2)), menus[1])
+
+    def test_import_menu_with_invalid_date(self) -> None:
+        '''
+        Tests that a menu whose date is not a date is reported and the rest of its chunk is imported.
+        '''
+        menus = [Menu(user_id=self.user_id, date=date(2024, 5, 1) + timedelta(days=day), recipes=self.catalog[:1])
+                 for day in range(3)]
+        lines = [json.dumps(menu.to_dict()) for menu in menus]
+        lines[1] = json.dumps({**menus[1].to_dict(), 'date': 20240502})
+        checkpoint = os.path.join(tempfile.mkdtemp(), 'checkpoint')
+        result = import_jsonl(io.BytesIO('\n'.join(lines).encode('utf-8') + b'\n'), Menu, self.menus,
+                              start_offset=0, checkpoint_path=checkpoint)
+        self.assertEqual((result.read, result.imported, result.invalid), (3, 2, 1))
+        self.assertEqual(result.errors, [(2, ['Invalid date: 20240502'])])
+        self.assertIsNone(self.menus.find_menu(self.user_id, date(2024, 5, 2)))
+        self.assertEqual(self.menus.find_menu(self.user_id, date(2024, 5, 3)), menus[2])
+        with open(checkpoint) as fp:
+            self.assertEqual(int(fp.read()), result.offset)
+
+    def test_import_menu_with_invalid_recipe(self) -> None:
+        '''
+        Tests that a menu with an invalid recipe is reported as an invalid line and not saved.
+        '''
+        menus = [Menu(user_id=self.user_id, date=date(2024, 5, 1) + timedelta(days=day), recipes=self.catalog[:2])
+                 for day in range(2)]
+        document = menus[0].to_dict()
+        document['recipes'][1] = {**document['recipes'][1], 'title': '', 'category': 'vegan'}
+        lines = [json.dumps(document), json.dumps(menus[1].to_dict())]
+        result = import_jsonl(io.BytesIO('\n'.join(lines).encode('utf-8') + b'\n'), Menu, self.menus,
+                              start_offset=0)
+        self.assertEqual((result.read, result.imported, result.invalid), (2, 1, 1))
+        self.assertEqual(result.errors,
+                         [(1, ['Recipe 1: Title cannot be empty.', 'Recipe 1: Invalid category: vegan'])])
+        self.assertIsNone(self.menus.find_menu(self.user_id, date(2024, 5, 1)))
+        self.assertEqual(self.menus.find_menu(self.user_id, date(2024, 5, 2)), menus[1])
+
+    def test_import_invalid_model(self) -> None:
+        '''
+        Tests that only recipes and menus can be imported.
+        '''
+        with self.assertRaises(ValueError) as context:
+            import_jsonl(io.BytesIO(), Ingredient, self.recipes)
+        self.assertEqual(str(context.exception), 'Cannot import Ingredient, only Recipe and Menu.')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
+import copy
 from datetime import date
+import pickle
 import unittest
+import bson
 from app.models.ingredient import Ingredient
 from app.models.menu import Menu
 from app.models.recipe import Recipe
@@ -105,6 +108,147 @@ class TestMenuModel(unittest.TestCase):
             self.menu.remove_recipe('Nonexistent Recipe')
         self.assertEqual(str(context.exception), 'Recipe with title "Nonexistent Recipe" not found in menu.')
 
+    def test_remove_recipe_with_shared_title(self) -> None:
+        '''
+        Tests that removing by title removes the first recipe with that title and keeps the rest.
+        '''
+        same_title = Recipe(**{**self.recipe2_data, 'title': self.recipe1.title})
+        self.menu.add_recipe(same_title)
+        self.menu.remove_recipe(self.recipe1.title)
+        self.assertEqual(self.menu.recipes, [same_title])
+        self.assertIs(self.menu.get_recipe(self.recipe1.title), same_title)
+
+    def test_get_recipe(self) -> None:
+        '''
+        Tests looking up a recipe in the menu by title.
+        '''
+        self.assertIs(self.menu.get_recipe(self.recipe1.title), self.recipe1)
+        self.assertIsNone(self.menu.get_recipe(self.recipe2.title))
+        self.assertTrue(self.menu.has_recipe(self.recipe1.title))
+        self.assertFalse(self.menu.has_recipe(self.recipe2.title))
+
+    def test_index_follows_recipes_assignment(self) -> None:
+        '''
+        Tests that the title index is rebuilt when the recipes list is assigned.
+        '''
+        self.menu.recipes = [self.recipe2]
+        self.assertNotIn(self.recipe1, self.menu)
+        self.assertIn(self.recipe2, self.menu)
+
+        # += extends the list in place and assigns it back
+        self.menu.recipes += [self.recipe1]
+        self.assertTrue(self.menu.has_recipe(self.recipe1.title))
+        self.menu.remove_recipe(self.recipe2.title)
+        self.assertEqual(self.menu.recipes, [self.recipe1])
+        with self.assertRaises(ValueError):
+            self.menu.add_recipe(self.recipe1)
+        self.assertEqual(self.menu.to_json_patch(),
+                         [{'op': 'replace', 'path': '/recipes', 'value': [self.recipe1.to_dict()]}])
+
+    def test_remove_after_earlier_removals(self) -> None:
+        '''
+        Tests that recipes are removed at their current position after recipes before them were removed.
+        '''
+        recipes = [Recipe(**{**self.recipe2_data, 'title': f'Recipe {i}'}) for i in range(6)]
+        for recipe in recipes:
+            self.menu.add_recipe(recipe)
+        self.menu.mark_saved()
+        for i in (0, 2, 5, 3):
+            self.menu.remove_recipe(f'Recipe {i}')
+        self.assertEqual(self.menu.recipes, [self.recipe1, recipes[1], recipes[4]])
+        self.assertEqual([operation['path'] for operation in self.menu.to_json_patch()],
+                         ['/recipes/1', '/recipes/2', '/recipes/4', '/recipes/2'])
+
+    def test_pickle(self) -> None:
+        '''
+        Tests that a pickled menu keeps its recipes, index and recorded changes.
+        '''
+        self.menu.add_recipe(self.recipe2)
+        for copied in (pickle.loads(pickle.dumps(self.menu)), copy.deepcopy(self.menu)):
+            self.assertEqual(copied, self.menu)
+            self.assertEqual(copied.to_json_patch(), self.menu.to_json_patch())
+            self.assertIs(copied.get_recipe(self.recipe2.title), copied.recipes[1])
+            copied.remove_recipe(self.recipe1.title)
+            self.assertEqual(copied.recipes, [self.recipe2])
+            self.assertEqual(self.menu.recipes, [self.recipe1, self.recipe2])
+
+    def test_from_dict(self) -> None:
+        '''
+        Tests that a menu is recreated from its dictionary and from raw BSON.
+        '''
+        self.menu.add_recipe(self.recipe2)
+        document = self.menu.to_dict()
+        self.assertEqual(Menu.from_dict(document), self.menu)
+        lazy_menu = Menu.from_dict(document, lazy=True)
+        self.assertEqual(lazy_menu.get_recipe('Pasta'), self.recipe1)
+        bson_menu = Menu.from_bson(bson.encode(document))
+        self.assertEqual(bson_menu.date, self.menu.date)
+        self.assertEqual(bson_menu.to_dict(), document)
+
+
+    def test_change_tracking_push_and_pull(self) -> None:
+        '''
+        Tests that added recipes become a $push and removed recipes a $pull.
+        '''
+        self.assertFalse(self.menu.has_changes)
+        self.assertIsNone(self.menu.to_update())
+        self.menu.add_recipe(self.recipe2)
+        self.assertEqual(self.menu.to_update(), {'$push': {'recipes': {'$each': [self.recipe2.to_dict()]}}})
+        self.assertEqual(self.menu.to_json_patch(),
+                         [{'op': 'add', 'path': '/recipes/-', 'value': self.recipe2.to_dict()}])
+
+        self.menu.mark_saved(version=4)
+        self.assertEqual(self.menu.version, 4)
+        self.menu.remove_recipe('Pasta')
+        self.assertEqual(self.menu.to_update(), {'$pull': {'recipes': {'$in': [self.recipe1.to_dict()]}}})
+        self.assertEqual(self.menu.to_json_patch(), [{'op': 'remove', 'path': '/recipes/0'}])
+
+    def test_change_tracking_collapses_changes(self) -> None:
+        '''
+        Tests that changes that cancel out are dropped, and mixed or replaced lists are set whole.
+        '''
+        self.menu.add_recipe(self.recipe2)
+        self.menu.remove_recipe('Pasta with ketchop')
+        self.assertTrue(self.menu.has_changes)
+        self.assertIsNone(self.menu.to_update())
+
+        self.menu.add_recipe(self.recipe2)
+        self.menu.remove_recipe('Pasta')
+        self.assertEqual(self.menu.to_update(), {'$set': {'recipes': [self.recipe2.to_dict()]}})
+        self.assertEqual([operation['op'] for operation in self.menu.to_json_patch()],
+                         ['add', 'remove', 'add', 'remove'])
+
+        self.menu.mark_saved()
+        self.menu.recipes = [self.recipe1]
+        self.assertEqual(self.menu.to_update(), {'$set': {'recipes': [self.recipe1.to_dict()]}})
+        self.assertEqual(self.menu.to_json_patch(),
+                         [{'op': 'replace', 'path': '/recipes', 'value': [self.recipe1.to_dict()]}])
+        self.assertEqual(self.menu.to_update(encode=lambda recipe: recipe.title), {'$set': {'recipes': ['Pasta']}})
+
+    def test_change_tracking_keeps_equal_copies(self) -> None:
+        '''
+        Tests that removing one of two equal recipes sets the list instead of pulling both.
+        '''
+        copy = Recipe(**self.recipe1_data)
+        menu = Menu(user_id=ObjectId(), date=date.today(), recipes=[self.recipe1, copy, self.recipe2])
+        menu.remove_recipe('Pasta')
+        self.assertEqual(menu.to_update(), {'$set': {'recipes': [copy.to_dict(), self.recipe2.to_dict()]}})
+
+    def test_saved_positions(self) -> None:
+        '''
+        Tests mapping the recipes as they were saved to their positions after adds and removals.
+        '''
+        recipe3 = Recipe(**{**self.recipe2_data, 'title': 'Salad'})
+        menu = Menu(user_id=ObjectId(), date=date.today(), recipes=[self.recipe1, self.recipe2, recipe3])
+        self.assertEqual(menu.saved_positions(), [0, 1, 2])
+        menu.remove_recipe('Pasta with ketchop')
+        menu.add_recipe(self.recipe2)
+        menu.remove_recipe('Pasta')
+        self.assertEqual(menu.saved_positions(), [None, None, 0])
+        self.assertEqual(menu.recipes, [recipe3, self.recipe2])
+        menu.recipes = menu.recipes[::-1]
+        self.assertIsNone(menu.saved_positions())
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
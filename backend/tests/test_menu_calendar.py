@@ -0,0 +1,115 @@
+from datetime import date
+import unittest
+from bson import ObjectId
+import mongomock
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.repositories import MenuRepository
+from app.services.menu_calendar import MenuCalendar
+
+
+class TestMenuCalendar(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up a calendar with a menu on every other day of May 2024
+        '''
+        self.user_id = ObjectId()
+        self.recipe = Recipe(user_id=self.user_id, title='Pasta',
+                             ingredients=[Ingredient(name='Pasta', quantity='100 gram')],
+                             steps=['Boil the water'], prep_time='10 minutes', category='parve')
+        self.menus = [Menu(user_id=self.user_id, date=date(2024, 5, day), recipes=[self.recipe])
+                      for day in range(31, 0, -2)]
+        self.calendar = MenuCalendar(self.user_id, self.menus)
+
+    def test_sorted_and_get(self) -> None:
+        '''
+        Tests that the menus are kept in date order and looked up by date.
+        '''
+        self.assertEqual([menu.date.day for menu in self.calendar], list(range(1, 32, 2)))
+        self.assertIs(self.calendar.get(date(2024, 5, 3)), self.menus[-2])
+        self.assertIsNone(self.calendar.get(date(2024, 5, 2)))
+        self.assertIn(date(2024, 5, 31), self.calendar)
+        self.assertNotIn(date(2024, 6, 1), self.calendar)
+
+    def test_put_and_remove(self) -> None:
+        '''
+        Tests replacing, inserting and removing menus, and rejecting another user's menu.
+        '''
+        replacement = Menu(user_id=self.user_id, date=date(2024, 5, 1), recipes=[self.recipe])
+        self.assertIs(self.calendar.put(replacement), self.menus[-1])
+        self.assertIsNone(self.calendar.put(Menu(user_id=self.user_id, date=date(2024, 5, 2), recipes=[self.recipe])))
+        self.assertEqual(len(self.calendar), 17)
+        self.assertIs(self.calendar.remove(date(2024, 5, 1)), replacement)
+        with self.assertRaises(ValueError):
+            self.calendar.remove(date(2024, 5, 1))
+        with self.assertRaises(ValueError):
+            self.calendar.put(Menu(user_id=ObjectId(), date=date(2024, 5, 4), recipes=[self.recipe]))
+
+    def test_range(self) -> None:
+        '''
+        Tests that date ranges include both ends.
+        '''
+        self.assertEqual([menu.date.day for menu in self.calendar.range(date(2024, 5, 5), date(2024, 5, 11))],
+                         [5, 7, 9, 11])
+        self.assertEqual(self.calendar.range(date(2024, 6, 1), date(2024, 6, 30)), [])
+        self.assertEqual(self.calendar.range(date(2024, 5, 11), date(2024, 5, 5)), [])
+
+    def test_month(self) -> None:
+        '''
+        Tests the month view has an entry per day.
+        '''
+        view = self.calendar.month(2024, 5)
+        self.assertEqual(len(view), 31)
+        self.assertIs(view[0], self.menus[-1])
+        self.assertIsNone(view[1])
+        self.assertEqual(self.calendar.month(2024, 2), [None] * 29)
+
+    def test_copy_last_week(self) -> None:
+        '''
+        Tests copying last week's menus shares their recipes and leaves the source menus alone.
+        '''
+        copies = self.calendar.copy_last_week(date(2024, 6, 1))
+        self.assertEqual([menu.date for menu in copies], [date(2024, 6, day) for day in (1, 3, 5, 7)])
+        source = self.calendar.get(date(2024, 5, 25))
+        copy = self.calendar.get(date(2024, 6, 1))
+        self.assertIs(copy, copies[0])
+        self.assertIsNot(copy.recipes, source.recipes)
+        self.assertIs(copy.recipes[0], source.recipes[0])
+
+        with self.assertRaises(ValueError):
+            self.calendar.copy_last_week(date(2024, 6, 1))
+        self.assertEqual(len(self.calendar.copy_last_week(date(2024, 6, 1), overwrite=True)), 4)
+        with self.assertRaises(ValueError):
+            self.calendar.copy_week(date(2024, 5, 1), date(2024, 5, 4))
+
+    def test_load(self) -> None:
+        '''
+        Tests loading a date range of the user's stored menus.
+        '''
+        repository = MenuRepository(mongomock.MongoClient().db)
+        repository.save_many(self.menus)
+        repository.save(Menu(user_id=ObjectId(), date=date(2024, 5, 2), recipes=[self.recipe]))
+        calendar = MenuCalendar.load(repository, self.user_id, date(2024, 5, 10), date(2024, 5, 20))
+        self.assertEqual([menu.date.day for menu in calendar], [11, 13, 15, 17, 19])
+        self.assertEqual(calendar.get(date(2024, 5, 11)).recipes, [self.recipe])
+
+    def test_string_user_id(self) -> None:
+        '''
+        Tests that a calendar created with a string user id accepts the user's stored and new menus.
+        '''
+        repository = MenuRepository(mongomock.MongoClient().db)
+        repository.save_many(self.menus)
+        calendar = MenuCalendar.load(repository, str(self.user_id))
+        self.assertEqual(calendar.user_id, self.user_id)
+        self.assertEqual(len(calendar), len(self.menus))
+        calendar.put(Menu(user_id=str(self.user_id), date=date(2024, 5, 2), recipes=[self.recipe]))
+        self.assertEqual(len(calendar.copy_week(date(2024, 5, 1), date(2024, 6, 1))), 5)
+        with self.assertRaises(ValueError):
+            calendar.put(Menu(user_id=str(ObjectId()), date=date(2024, 5, 4), recipes=[self.recipe]))
+        with self.assertRaises(ValueError):
+            MenuCalendar('invalid')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+import unittest
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.quantity import parse_prep_time
+from app.models.recipe import Recipe
+from app.services.menu_planner import MenuPlanner, PlanConstraints
+from app.services.shopping_list import build_shopping_list
+
+
+def make_recipe(title: str, category: str, prep_time: str, *names: str) -> Recipe:
+    return Recipe(user_id=ObjectId(), title=title, category=category, prep_time=prep_time,
+                  ingredients=[Ingredient(name=name, quantity='1') for name in names])
+
+
+class TestMenuPlanner(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up a small catalog of meat, dairy and parve recipes
+        '''
+        self.recipes = [
+            make_recipe('Steak', 'meat', '30 minutes', 'Beef', 'Salt'),
+            make_recipe('Schnitzel', 'meat', '40 minutes', 'Chicken', 'Eggs', 'Flour'),
+            make_recipe('Cheese toast', 'dairy', '5 minutes', 'Cheese', 'Bread'),
+            make_recipe('Lasagna', 'dairy', '1 hour', 'Cheese', 'Pasta', 'Tomato'),
+            make_recipe('Pasta', 'parve', '10 minutes', 'Pasta', 'Water', 'Salt'),
+            make_recipe('Pasta with ketchop', 'parve', '10 minutes', 'Pasta', 'Water', 'Ketchup'),
+            make_recipe('Salad', 'parve', '10 minutes', 'Tomato', 'Cucumber', 'Salt'),
+            make_recipe('Omelette', 'parve', '10 minutes', 'Eggs', 'Salt'),
+        ]
+        self.user_id = ObjectId()
+        self.start = date(2024, 5, 5)
+
+    def test_plan_follows_constraints(self) -> None:
+        '''
+        Tests that a plan keeps meat and dairy apart, stays in the prep budget and does not repeat recipes.
+        '''
+        constraints = PlanConstraints(days=7, recipes_per_day=2, max_prep_minutes_per_day=60, no_repeat_days=3)
+        menus = MenuPlanner(self.recipes, constraints).plan(self.user_id, self.start)
+        self.assertEqual([menu.date for menu in menus], [self.start + timedelta(days=day) for day in range(7)])
+        last_planned = {}
+        for day, menu in enumerate(menus):
+            menu.validate()
+            self.assertEqual(menu.user_id, self.user_id)
+            categories = {recipe.category for recipe in menu.recipes}
+            self.assertFalse({'meat', 'dairy'} <= categories)
+            self.assertLessEqual(sum(parse_prep_time(recipe.prep_time) for recipe in menu.recipes), 60)
+            for recipe in menu.recipes:
+                if recipe.title in last_planned:
+                    self.assertGreaterEqual(day - last_planned[recipe.title], 3)
+                last_planned[recipe.title] = day
+
+    def test_plan_prefers_shared_ingredients(self) -> None:
+        '''
+        Tests that the plan picks recipes that reuse the ingredients already planned.
+        '''
+        constraints = PlanConstraints(days=1, recipes_per_day=2)
+        for seed in range(10):
+            menu, = MenuPlanner(self.recipes, constraints).plan(self.user_id, self.start, seed=seed)
+            first, second = menu.recipes
+            shared = ({ingredient.name for ingredient in first.ingredients}
+                      & {ingredient.name for ingredient in second.ingredients})
+            self.assertTrue(shared, f'{first.title} and {second.title} share no ingredients')
+
+    def test_plan_skips_days_without_recipes(self) -> None:
+        '''
+        Tests that days where no recipe fits get no menu.
+        '''
+        constraints = PlanConstraints(days=3, recipes_per_day=3, no_repeat_days=7)
+        menus = MenuPlanner(self.recipes[:4], constraints).plan(self.user_id, self.start)
+        self.assertEqual(sum(len(menu.recipes) for menu in menus), 4)
+        self.assertLess(len(menus), 3)
+
+    def test_plan_falls_back_to_whole_catalog(self) -> None:
+        '''
+        Tests that a recipe that fits is found when the random candidates hold none.
+        '''
+        slow = [make_recipe(f'Stew {i}', 'meat', '3 hours', 'Beef') for i in range(500)]
+        catalog = slow + [self.recipes[2]]
+        constraints = PlanConstraints(days=7, recipes_per_day=1, max_prep_minutes_per_day=30, no_repeat_days=0,
+                                      candidates_per_pick=5)
+        menus = MenuPlanner(catalog, constraints).plan(self.user_id, self.start)
+        self.assertEqual([menu.recipes for menu in menus], [[self.recipes[2]]] * 7)
+
+    def test_plan_many(self) -> None:
+        '''
+        Tests that planning in a process pool gives the same plans as planning in process.
+        '''
+        planner = MenuPlanner(self.recipes, PlanConstraints(days=7, recipes_per_day=2, no_repeat_days=2))
+        user_ids = [ObjectId() for _ in range(5)]
+        serial = planner.plan_many(user_ids, self.start)
+        pooled = planner.plan_many(user_ids, self.start, processes=2, chunksize=2)
+        self.assertEqual(list(pooled), user_ids)
+        self.assertEqual(pooled, serial)
+        self.assertIs(pooled[user_ids[0]][0].recipes[0], serial[user_ids[0]][0].recipes[0])
+        self.assertTrue(build_shopping_list(pooled[user_ids[0]]).items)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+from datetime import date
+import unittest
+from bson import ObjectId
+import mongomock
+from app import create_app, metrics
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.models.user import User
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up a recipe and the original model methods
+        '''
+        self.originals = {(cls, name): cls.__dict__[name]
+                          for cls, name in ((Recipe, 'validate'), (User, 'check_password'), (Menu, 'add_recipe'))}
+        self.recipe = Recipe(user_id=ObjectId(), title='Pasta',
+                             ingredients=[Ingredient(name='Pasta', quantity='100 gram')],
+                             steps=['Boil the water'], prep_time='10 minutes', category='parve')
+
+    def tearDown(self) -> None:
+        metrics.disable()
+
+    def sample(self, name: str, labels: dict) -> float:
+        return metrics.get_metrics().registry.get_sample_value(name, labels) or 0
+
+    def test_disabled_leaves_models_unchanged(self) -> None:
+        '''
+        Tests that the models run their own methods unless metrics are enabled, and again after disable().
+        '''
+        self.assertIsNone(metrics.get_metrics())
+        for (cls, name), original in self.originals.items():
+            self.assertIs(cls.__dict__[name], original)
+        metrics.enable()
+        self.assertIsNot(Recipe.__dict__['validate'], self.originals[Recipe, 'validate'])
+        metrics.disable()
+        for (cls, name), original in self.originals.items():
+            self.assertIs(cls.__dict__[name], original)
+
+    def test_operations_are_timed(self) -> None:
+        '''
+        Tests that calls and errors of model operations are counted and timed.
+        '''
+        self.assertIs(metrics.enable(), metrics.enable())
+        self.recipe.validate()
+        self.recipe.title = ''
+        with self.assertRaises(ValueError):
+            self.recipe.validate()
+        menu = Menu(user_id=ObjectId(), date=date(2024, 5, 1))
+        menu.add_recipe(self.recipe)
+
+        calls = 'dish_dash_operation_calls_total'
+        self.assertEqual(self.sample(calls, {'operation': 'Recipe.validate', 'outcome': 'ok'}), 1)
+        self.assertEqual(self.sample(calls, {'operation': 'Recipe.validate', 'outcome': 'error'}), 1)
+        self.assertEqual(self.sample('dish_dash_operation_seconds_count', {'operation': 'Recipe.validate'}), 2)
+        self.assertEqual(self.sample('dish_dash_operation_seconds_count', {'operation': 'Menu.add_recipe'}), 1)
+        self.assertEqual(Recipe.validate.__name__, 'validate')
+
+    def test_metrics_endpoint(self) -> None:
+        '''
+        Tests that an app with METRICS times its requests and serves them on /metrics.
+        '''
+        client = create_app({'MONGO_DATABASE': mongomock.MongoClient().db, 'METRICS': True}).test_client()
+        client.get('/health')
+        client.get('/recipes/invalid')
+        body = client.get('/metrics').get_data(as_text=True)
+        self.assertIn('dish_dash_requests_total{endpoint="api.health",method="GET",status="200"} 1.0', body)
+        self.assertIn('dish_dash_requests_total{endpoint="api.get_recipe",method="GET",status="404"} 1.0', body)
+        self.assertIn('dish_dash_operation_seconds_bucket', body)
+
+    def test_no_metrics_endpoint_by_default(self) -> None:
+        '''
+        Tests that an app without METRICS has no /metrics endpoint.
+        '''
+        client = create_app({'MONGO_DATABASE': mongomock.MongoClient().db}).test_client()
+        self.assertEqual(client.get('/metrics').status_code, 404)
+        self.assertIsNone(metrics.get_metrics())
+
+
+if __name__ == '__main__':
+    unittest.main()
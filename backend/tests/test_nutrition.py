@@ -0,0 +1,99 @@
+from datetime import date
+import os
+import tempfile
+import unittest
+from bson import ObjectId
+import numpy as np
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.services.nutrition import IngredientTable, NutritionTable
+
+
+class TestNutrition(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up a nutrition table, two recipes and two menus
+        '''
+        self.nutrition = NutritionTable()
+        self.nutrition.add('Flour', 'kg', calories=3640, cost=1.2, grams=1000)
+        self.nutrition.add('Milk', 'cup', calories=120, cost=0.24, grams=240)
+        self.nutrition.add('Egg', '', calories=70, cost=0.3, grams=50)
+        user_id = ObjectId()
+        self.pancakes = Recipe(user_id=user_id, title='Pancakes', category='dairy', ingredients=[
+            Ingredient(name='flour', quantity='200 gram'),
+            Ingredient(name='Milk', quantity='2 cups'),
+            Ingredient(name='Egg', quantity='2'),
+            Ingredient(name='Salt', quantity='a pinch'),
+        ])
+        self.omelette = Recipe(user_id=user_id, title='Omelette', category='parve', ingredients=[
+            Ingredient(name='Egg', quantity='3'),
+            Ingredient(name='Chives', quantity='1 tbsp'),
+        ])
+        self.menus = [
+            Menu(user_id=user_id, date=date(2024, 5, 1), recipes=[self.pancakes, self.omelette]),
+            Menu(user_id=user_id, date=date(2024, 5, 2), recipes=[self.omelette]),
+        ]
+
+    def test_units_are_converted(self) -> None:
+        '''
+        Tests that nutrition values are stored per base unit.
+        '''
+        np.testing.assert_allclose(self.nutrition.get('FLOUR', 'gram'), [3.64, 0.0012, 1.0])
+        np.testing.assert_allclose(self.nutrition.get('milk', 'ml'), [0.5, 0.001, 1.0])
+        self.assertIsNone(self.nutrition.get('Milk', 'gram'))
+        self.nutrition.add('Bread', 'slices', calories=80, cost=0.1, grams=30)
+        np.testing.assert_allclose(self.nutrition.get('bread', 'slice'), [80, 0.1, 30])
+
+    def test_columns(self) -> None:
+        '''
+        Tests the columnar layout of the ingredients.
+        '''
+        table = IngredientTable([self.pancakes, self.omelette, self.pancakes])
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.recipe.tolist(), [0, 0, 0, 1, 1])
+        self.assertEqual(table.keys, [('flour', 'gram'), ('milk', 'ml'), ('egg', ''), ('chives', 'ml')])
+        self.assertEqual(table.ingredient.tolist(), [0, 1, 2, 2, 3])
+        self.assertEqual(table.amount.tolist(), [200, 480, 2, 3, 15])
+        self.assertEqual([table.units[code] for code in table.unit_code], ['gram', 'ml', '', 'ml'])
+        self.assertEqual(table.unparsed.tolist(), [1, 0])
+        self.assertEqual(table.scaled_amounts([2, 0.5]).tolist(), [400, 960, 4, 1.5, 7.5])
+
+    def test_recipe_rollup(self) -> None:
+        '''
+        Tests recipe totals, scaled by servings, with missing values counted.
+        '''
+        rollup = IngredientTable().recipe_rollup([self.pancakes, self.omelette], self.nutrition, factors=[1, 2])
+        np.testing.assert_allclose(rollup.totals, [[728 + 240 + 140, 0.24 + 0.48 + 0.6, 200 + 480 + 100],
+                                                   [420, 1.8, 300]])
+        self.assertEqual(rollup.missing.tolist(), [1, 1])
+
+    def test_menu_rollup(self) -> None:
+        '''
+        Tests menu totals, and that they follow changes to the nutrition table.
+        '''
+        table = IngredientTable()
+        rollup = table.menu_rollup(self.menus, self.nutrition, servings=[1, 3])
+        self.assertEqual([round(row['calories']) for row in rollup.as_dicts()], [1108 + 210, 630])
+        self.assertEqual(rollup.missing.tolist(), [2, 1])
+
+        self.nutrition.add('Chives', 'tbsp', calories=15)
+        rollup = table.menu_rollup(self.menus, self.nutrition)
+        self.assertEqual([round(row['calories']) for row in rollup.as_dicts()], [1108 + 225, 225])
+        self.assertEqual(table.menu_rollup([], self.nutrition).totals.shape, (0, 3))
+
+    def test_from_csv(self) -> None:
+        '''
+        Tests loading a nutrition table from CSV.
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'nutrition.csv')
+            with open(path, 'w', encoding='utf-8') as fp:
+                fp.write('name,unit,calories,cost,grams\nRice,kg,1300,2.5,1000\nLemon,,17,0.4,\n')
+            table = NutritionTable.from_csv(path)
+        np.testing.assert_allclose(table.get('rice', 'gram'), [1.3, 0.0025, 1.0])
+        np.testing.assert_allclose(table.get('lemon', ''), [17, 0.4, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import asyncio
+import unittest
+import bcrypt
+from app.models.user import User
+from app.services.password_hasher import PasswordHasher
+
+
+class TestPasswordHasher(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up a user and a hasher with a low cost factor to keep the tests fast
+        '''
+        self.user = User(user_email='user@example.com', user_password='GoodPassword12', user_name='User Example')
+        self.hasher = PasswordHasher(max_workers=2, rounds=4)
+
+    def tearDown(self) -> None:
+        self.hasher.shutdown()
+
+    def test_hash_password_future(self) -> None:
+        '''
+        Tests that the future hashes the user's password with the configured cost factor.
+        '''
+        self.assertIsNone(self.hasher.hash_password_future(self.user).result())
+        self.assertNotEqual(self.user.user_password, 'GoodPassword12')
+        self.assertTrue(self.user.user_password.startswith('$2b$04$'))
+        self.assertTrue(self.user.check_password('GoodPassword12'))
+
+    def test_check_password_future(self) -> None:
+        '''
+        Tests that checking passwords on the pool matches User.check_password.
+        '''
+        self.user.hash_password()
+        self.assertTrue(self.hasher.check_password_future(self.user, 'GoodPassword12').result())
+        self.assertFalse(self.hasher.check_password_future(self.user, 'WrongPassword12').result())
+
+    def test_async(self) -> None:
+        '''
+        Tests the async variants, with more calls than the pool has slots.
+        '''
+        async def login() -> list:
+            await self.hasher.hash_password(self.user)
+            attempts = ['GoodPassword12', 'WrongPassword12'] * 10
+            return await asyncio.gather(*(self.hasher.check_password(self.user, password) for password in attempts))
+
+        self.assertEqual(asyncio.run(login()), [True, False] * 10)
+
+    def test_async_cancelled_waiters(self) -> None:
+        '''
+        Tests that cancelling coroutines waiting for a slot does not lose the slot.
+        '''
+        self.user.hash_password()
+        hasher = PasswordHasher(max_workers=1, rounds=4, max_pending=1)
+        self.addCleanup(hasher.shutdown)
+
+        async def login() -> bool:
+            running = asyncio.ensure_future(hasher.check_password(self.user, 'GoodPassword12'))
+            waiting = [asyncio.ensure_future(hasher.check_password(self.user, 'GoodPassword12')) for _ in range(5)]
+            await asyncio.sleep(0)
+            for task in waiting:
+                task.cancel()
+            await asyncio.gather(*waiting, return_exceptions=True)
+            await running
+            return await hasher.check_password(self.user, 'GoodPassword12')
+
+        self.assertTrue(asyncio.run(login()))
+        self.assertTrue(hasher._slots.acquire(blocking=False))
+        self.assertFalse(hasher._waiters)
+
+    def test_check_password_invalid_hash(self) -> None:
+        '''
+        Tests that an error in the worker is raised from the future and frees its slot.
+        '''
+        for _ in range(self.hasher.max_pending + 1):
+            with self.assertRaises(ValueError):
+                self.hasher.check_password_future(self.user, 'GoodPassword12').result()
+
+    def test_process_pool(self) -> None:
+        '''
+        Tests hashing and checking in a process pool.
+        '''
+        with PasswordHasher(max_workers=2, rounds=4, use_processes=True) as hasher:
+            hasher.hash_password_future(self.user).result()
+            self.assertTrue(bcrypt.checkpw(b'GoodPassword12', self.user.user_password.encode('utf-8')))
+            self.assertTrue(hasher.check_password_future(self.user, 'GoodPassword12').result())
+
+    def test_invalid_rounds(self) -> None:
+        '''
+        Tests that an invalid cost factor raises a ValueError.
+        '''
+        with self.assertRaises(ValueError) as context:
+            PasswordHasher(rounds=3)
+        self.assertEqual(str(context.exception), 'Invalid bcrypt rounds: 3')
+
+
+if __name__ == '__main__':
+    unittest.main()
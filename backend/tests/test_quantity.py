@@ -0,0 +1,43 @@
+import unittest
+from app.models.quantity import Quantity, parse_prep_time, parse_quantity
+
+
+class TestQuantity(unittest.TestCase):
+    def test_parse_quantity(self) -> None:
+        '''
+        Tests parsing quantities into their base units.
+        '''
+        self.assertEqual(parse_quantity('100 gram'), Quantity(100.0, 'gram'))
+        self.assertEqual(parse_quantity('2.5kg'), Quantity(2500.0, 'gram'))
+        self.assertEqual(parse_quantity('2 cups'), Quantity(480.0, 'ml'))
+        self.assertEqual(parse_quantity('1 Tbs'), Quantity(15.0, 'ml'))
+        self.assertEqual(parse_quantity('1 1/2 tsp'), Quantity(7.5, 'ml'))
+        self.assertEqual(parse_quantity('1/2 cup'), Quantity(120.0, 'ml'))
+
+    def test_parse_other_units(self) -> None:
+        '''
+        Tests that unknown units are kept in the singular and plain counts have no unit.
+        '''
+        self.assertEqual(parse_quantity('2 Slices'), Quantity(2.0, 'slice'))
+        self.assertEqual(parse_quantity('3'), Quantity(3.0, ''))
+
+    def test_parse_invalid_quantity(self) -> None:
+        '''
+        Tests that quantities without an amount are not parsed.
+        '''
+        self.assertIsNone(parse_quantity('a pinch'))
+        self.assertIsNone(parse_quantity(''))
+        self.assertIsNone(parse_quantity('1/0 cup'))
+
+    def test_parse_prep_time(self) -> None:
+        '''
+        Tests parsing prep times into minutes.
+        '''
+        self.assertEqual(parse_prep_time('10 minutes'), 10.0)
+        self.assertEqual(parse_prep_time('1 1/2 hours'), 90.0)
+        self.assertIsNone(parse_prep_time('2 cups'))
+        self.assertIsNone(parse_prep_time(''))
+
+
+if __name__ == '__main__':
+    unittest.main()
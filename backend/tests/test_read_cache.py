@@ -0,0 +1,118 @@
+from datetime import date
+import unittest
+from bson import ObjectId
+import mongomock
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.repositories import MenuRepository, RecipeRepository
+from app.services.read_cache import ReadThroughCache
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestReadThroughCache(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up a cache over repositories on an in-memory database
+        '''
+        database = mongomock.MongoClient().db
+        self.recipes = RecipeRepository(database)
+        self.menus = MenuRepository(database)
+        self.timer = FakeTimer()
+        self.cache = ReadThroughCache(self.recipes, self.menus, maxsize=2, ttl=60, timer=self.timer)
+        self.user_id = ObjectId()
+        self.recipe1 = Recipe(user_id=self.user_id, title='Pasta', ingredients=[Ingredient(name='Pastsa', quantity='100 gram')])
+        self.recipe2 = Recipe(user_id=self.user_id, title='Soup', ingredients=[Ingredient(name='Water', quantity='2 cups')])
+        self.recipe_id = self.recipes.insert(self.recipe1)
+        self.menu = Menu(user_id=self.user_id, date=date(2024, 5, 1), recipes=[self.recipe1])
+        self.menus.save(self.menu)
+
+    def tearDown(self) -> None:
+        self.cache.close()
+
+    def test_read_through(self) -> None:
+        '''
+        Tests that the first read goes to storage and later reads are hits.
+        '''
+        first = self.cache.get_recipe(self.recipe_id)
+        self.assertEqual(first['title'], 'Pasta')
+        second = self.cache.get_recipe(str(self.recipe_id))
+        self.assertEqual(second, first)
+        # Every reader gets its own document
+        self.assertIsNot(second, first)
+        second['_id'] = str(second['_id'])
+        self.assertIsInstance(self.cache.get_recipe(self.recipe_id)['_id'], ObjectId)
+        self.assertIsNone(self.cache.get_recipe(ObjectId()))
+        self.assertEqual(self.cache.get_menu(self.user_id, self.menu.date)['recipes'], [self.recipe1.to_dict()])
+        self.assertEqual(self.cache.stats_dict(), {'hits': 2, 'misses': 3, 'evictions': 0, 'expirations': 0,
+                                                   'invalidations': 0, 'recipes': 1, 'menus': 1})
+
+    def test_invalidate_during_load(self) -> None:
+        '''
+        Tests that a read from storage that overlaps an invalidation is not cached.
+        '''
+        find_by_id = self.recipes.find_by_id
+
+        def find_then_update(recipe_id):
+            document = find_by_id(recipe_id)
+            self.recipes.collection.update_one({'_id': recipe_id}, {'$set': {'title': 'Penne'}})
+            self.cache.invalidate_recipe(recipe_id)
+            return document
+
+        self.recipes.find_by_id = find_then_update
+        self.assertEqual(self.cache.get_recipe(self.recipe_id)['title'], 'Pasta')
+        self.recipes.find_by_id = find_by_id
+        self.assertEqual(self.cache.get_recipe(self.recipe_id)['title'], 'Penne')
+        self.assertEqual(self.cache.stats.misses, 2)
+
+    def test_menu_mutation_invalidates(self) -> None:
+        '''
+        Tests that adding or removing recipes on a menu drops its cached entry.
+        '''
+        self.cache.get_menu(self.user_id, self.menu.date)
+        self.menu.add_recipe(self.recipe2)
+        self.assertEqual(self.cache.stats.invalidations, 1)
+        self.menus.save(self.menu)
+        self.assertEqual(len(self.cache.get_menu(self.user_id, self.menu.date)['recipes']), 2)
+        self.menu.remove_recipe('Pasta')
+        self.assertEqual(self.cache.stats.invalidations, 2)
+
+    def test_recipe_update_invalidates(self) -> None:
+        '''
+        Tests that updating a recipe through the repository drops its cached entry, by id or by title.
+        '''
+        self.cache.get_recipe(self.recipe_id)
+        self.recipe1.description = 'Updated'
+        self.recipes.update(self.recipe_id, self.recipe1)
+        self.assertEqual(self.cache.get_recipe(self.recipe_id)['description'], 'Updated')
+
+        self.recipe1.description = 'Upserted'
+        self.recipes.upsert_many([self.recipe1])
+        self.assertEqual(self.cache.get_recipe(self.recipe_id)['description'], 'Upserted')
+        self.recipes.delete(self.recipe_id)
+        self.assertIsNone(self.cache.get_recipe(self.recipe_id))
+        self.assertEqual(self.cache.stats.invalidations, 3)
+
+    def test_eviction_and_expiration(self) -> None:
+        '''
+        Tests that entries are evicted past the size limit and expire after the time to live.
+        '''
+        ids = [self.recipes.insert(self.recipe2) for _ in range(3)]
+        for recipe_id in ids:
+            self.cache.get_recipe(recipe_id)
+        self.assertEqual(self.cache.stats.evictions, 1)
+        self.timer.now += 61
+        self.cache.get_recipe(ids[-1])
+        self.assertEqual(self.cache.stats.expirations, 2)
+        self.assertEqual(self.cache.stats.misses, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
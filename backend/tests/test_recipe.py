@@ -1,7 +1,9 @@
+from dataclasses import FrozenInstanceError, replace
 import unittest
+import bson
 from bson import ObjectId
-from app.models.ingredient import Ingredient
-from app.models.recipe import Recipe
+from app.models.ingredient import FrozenIngredient, Ingredient
+from app.models.recipe import FrozenRecipe, LazyRecipe, Recipe
 
 class TestRecipeModel(unittest.TestCase):
     def setUp(self) -> None:
@@ -75,6 +77,82 @@ class TestRecipeModel(unittest.TestCase):
         self.assertEqual(len(recipe_dict['ingredients']), len(self.recipe.ingredients))
         self.assertEqual(len(recipe_dict['steps']), len(self.recipe.steps))
 
+    def test_hash(self) -> None:
+        '''
+        Tests that equal recipes hash the same and can be used as dictionary keys.
+        '''
+        same = Recipe(**self.recipe_data)
+        self.assertEqual(hash(same), hash(self.recipe))
+        self.assertEqual({self.recipe: 1}[same], 1)
+        self.assertFalse(hasattr(self.recipe, '__dict__'))
+
+    def test_freeze(self) -> None:
+        '''
+        Tests that a frozen recipe keeps its data, cannot be changed and thaws back.
+        '''
+        frozen = self.recipe.freeze()
+        self.assertIsInstance(frozen, FrozenRecipe)
+        self.assertIsInstance(frozen.ingredients[0], FrozenIngredient)
+        self.assertEqual(frozen.to_dict(), self.recipe.to_dict())
+        self.assertEqual(len({frozen, self.recipe.freeze()}), 1)
+        with self.assertRaises(FrozenInstanceError):
+            frozen.title = 'Soup'
+        self.assertEqual(frozen.thaw(), self.recipe)
+
+    def test_validate_frozen_recipe(self) -> None:
+        '''
+        Tests that a frozen recipe is validated with the same rules.
+        '''
+        frozen = Recipe(**{**self.recipe_data, 'ingredients': []}).freeze()
+        with self.assertRaises(ValueError) as context:
+            frozen.validate()
+        self.assertEqual(str(context.exception), 'Ingredients list cannot be empty.')
+
+    def test_from_dict(self) -> None:
+        '''
+        Tests that a recipe is recreated from its dictionary, parsing the user_id back to an ObjectId.
+        '''
+        recipe = Recipe.from_dict(self.recipe.to_dict())
+        self.assertIs(type(recipe), Recipe)
+        self.assertEqual(recipe, self.recipe)
+        self.assertIsInstance(recipe.user_id, ObjectId)
+
+    def test_from_dict_lazy(self) -> None:
+        '''
+        Tests that a lazy recipe only decodes its ingredients and steps when they are accessed.
+        '''
+        document = self.recipe.to_dict()
+        recipe = Recipe.from_dict(document, lazy=True)
+        self.assertIsInstance(recipe, LazyRecipe)
+        self.assertEqual(recipe.title, 'Pasta')
+        document['steps'] = ['Changed before access']
+        self.assertEqual(recipe.steps, ['Changed before access'])
+        self.assertEqual(recipe.ingredients, self.recipe.ingredients)
+        self.assertIs(recipe.ingredients, recipe.ingredients)
+        recipe.steps = self.recipe.steps
+        self.assertEqual(recipe, self.recipe)
+        self.assertEqual(self.recipe, recipe)
+        self.assertEqual(hash(recipe), hash(self.recipe))
+
+    def test_replace_lazy(self) -> None:
+        '''
+        Tests that dataclasses.replace copies a lazy recipe, as find_menu returns them by default.
+        '''
+        recipe = Recipe.from_dict(self.recipe.to_dict(), lazy=True)
+        renamed = replace(recipe, title='Spaghetti')
+        self.assertEqual(renamed.title, 'Spaghetti')
+        self.assertEqual((renamed.ingredients, renamed.steps), (self.recipe.ingredients, self.recipe.steps))
+        self.assertEqual(replace(renamed, title='Pasta'), self.recipe)
+        self.assertEqual(recipe.title, 'Pasta')
+
+    def test_from_bson(self) -> None:
+        '''
+        Tests that a recipe is recreated from raw BSON.
+        '''
+        recipe = Recipe.from_bson(bson.encode(self.recipe.to_dict()))
+        self.assertEqual(recipe, self.recipe)
+        self.assertEqual(recipe.to_dict(), self.recipe.to_dict())
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,72 @@
+import unittest
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.recipe import Recipe
+from app.services.recipe_dedup import NearDuplicateIndex, recipe_shingles
+
+
+class TestRecipeDedup(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up a recipe, a near-duplicate of it and a different recipe
+        '''
+        user_id = ObjectId()
+        steps = ['Boil the water', 'Add the pasta and salt', 'Cook for 10 minutes', 'Drain the pasta']
+
+        def recipe(title, names, steps):
+            return Recipe(user_id=user_id, title=title,
+                          ingredients=[Ingredient(name=name, quantity='1 cup') for name in names],
+                          steps=steps, prep_time='10 minutes', category='parve')
+
+        self.recipe = recipe('Pasta', ['Pasta', 'Salt', 'Water', 'Olive oil'], steps)
+        self.near_duplicate = recipe('pasta', ['pasta', 'salt', ' Water', 'Olive  oil', 'Pepper'], steps)
+        self.different = recipe('Pasta with ketchop', ['Pasta', 'Ketchup'], ['Cook the pasta', 'Add ketchup'])
+
+    def test_shingles_are_normalized(self) -> None:
+        '''
+        Tests that shingles ignore case and spacing.
+        '''
+        self.assertEqual(recipe_shingles('Green  Salad', ['Olive  Oil'], ['Mix well']),
+                         {'t:green', 't:salad', 'i:olive oil', 's:mix well'})
+
+    def test_add_many_groups_near_duplicates(self) -> None:
+        '''
+        Tests that near-duplicates in a batch are grouped under the earliest recipe.
+        '''
+        index = NearDuplicateIndex()
+        self.assertEqual(index.add_many(['a', 'b', 'c'], [self.recipe, self.near_duplicate, self.different]),
+                         [None, 'a', None])
+        self.assertEqual(index.groups(), [['a', 'b']])
+        self.assertEqual(len(index), 3)
+
+    def test_incremental_add(self) -> None:
+        '''
+        Tests adding recipes one at a time, and querying without adding.
+        '''
+        index = NearDuplicateIndex()
+        self.assertIsNone(index.add('a', self.recipe))
+        self.assertIsNone(index.add('c', self.different))
+        self.assertEqual(index.duplicates_of(self.near_duplicate), ['a'])
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.add('b', self.near_duplicate), 'a')
+        self.assertEqual(index.add('d', self.recipe), 'a')
+        self.assertEqual(index.groups(), [['a', 'b', 'd']])
+
+    def test_processes_match_single_process(self) -> None:
+        '''
+        Tests that signatures computed in a process pool match the ones computed here.
+        '''
+        index = NearDuplicateIndex()
+        recipes = [self.recipe, self.near_duplicate, self.different] * 3
+        self.assertTrue((index.signatures(recipes, processes=2, chunksize=2) == index.signatures(recipes)).all())
+
+    def test_invalid_bands(self) -> None:
+        '''
+        Tests that the signature must split evenly into bands.
+        '''
+        with self.assertRaises(ValueError):
+            NearDuplicateIndex(num_perm=100, bands=16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import tempfile
+import unittest
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.recipe import Recipe
+from app.services.recipe_search import RecipeSearchIndex, tokenize
+
+
+def make_recipe(title: str, description: str = '', steps=(), category: str = 'parve') -> Recipe:
+    return Recipe(user_id=ObjectId(), title=title, description=description, steps=list(steps),
+                  ingredients=[Ingredient(name='Water', quantity='1 cup')], category=category)
+
+
+class TestRecipeSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up a search index over a few recipes
+        '''
+        self.index = RecipeSearchIndex()
+        self.index.add('pasta', make_recipe('Pasta', 'Quick weeknight pasta',
+                                            ['Boil the water', 'Add pasta and let cook for 8 minutes']))
+        self.index.add('ketchup', make_recipe('Pasta with ketchop', steps=['Boil the water', 'add ketchop']))
+        self.index.add('lasagna', make_recipe('Cheese lasagna', 'Layers of pasta and cheese', ['Bake'], 'dairy'))
+        self.index.add('steak', make_recipe('Steak', 'Grilled steak', ['Grill the steak'], 'meat'))
+
+    def test_tokenize(self) -> None:
+        '''
+        Tests splitting text into lower-case words.
+        '''
+        self.assertEqual(tokenize('Boil the Water, then serve!'), ['boil', 'the', 'water', 'then', 'serve'])
+
+    def test_search_ranks_title_matches_first(self) -> None:
+        '''
+        Tests that recipes with the query in the title rank above recipes with it in the body.
+        '''
+        results = [recipe_id for recipe_id, _ in self.index.search('pasta')]
+        self.assertEqual(results[-1], 'lasagna')
+        self.assertEqual(set(results), {'pasta', 'ketchup', 'lasagna'})
+        self.assertEqual(self.index.search('ketchop')[0][0], 'ketchup')
+        self.assertEqual(self.index.search('sushi'), [])
+        self.assertEqual(len(self.index.search('pasta', limit=1)), 1)
+
+    def test_search_category(self) -> None:
+        '''
+        Tests filtering the results by category.
+        '''
+        self.assertEqual([recipe_id for recipe_id, _ in self.index.search('pasta', category='dairy')], ['lasagna'])
+        self.assertEqual(self.index.search('pasta', category=['meat']), [])
+
+    def test_prefix_search_and_autocomplete(self) -> None:
+        '''
+        Tests search as you type and completing words.
+        '''
+        self.assertEqual(self.index.search('grilled ste', prefix=True)[0][0], 'steak')
+        self.assertEqual(self.index.search('ste'), [])
+        self.assertEqual(self.index.autocomplete('pa'), ['pasta'])
+        self.assertEqual(self.index.autocomplete('b'), ['boil', 'bake'])
+
+    def test_update_and_remove(self) -> None:
+        '''
+        Tests that replacing and removing recipes updates the results.
+        '''
+        self.index.add('steak', make_recipe('Schnitzel', category='meat'))
+        self.assertEqual(self.index.search('steak'), [])
+        self.assertEqual(self.index.search('schnitzel')[0][0], 'steak')
+        self.index.remove('pasta')
+        self.assertNotIn('pasta', [recipe_id for recipe_id, _ in self.index.search('pasta')])
+        self.assertEqual(len(self.index), 3)
+
+    def test_save_and_load(self) -> None:
+        '''
+        Tests that a loaded index returns the same results and can still be updated.
+        '''
+        self.index.remove('steak')
+        with tempfile.TemporaryDirectory() as path:
+            self.index.save(path)
+            loaded = RecipeSearchIndex.load(path)
+            self.assertEqual(len(loaded), 3)
+            for query in ('pasta', 'boil water', 'cheese'):
+                self.assertEqual([recipe_id for recipe_id, _ in loaded.search(query)],
+                                 [recipe_id for recipe_id, _ in self.index.search(query)])
+            self.assertEqual(loaded.search('steak'), [])
+
+            loaded.add('soup', make_recipe('Pasta soup'))
+            loaded.remove('ketchup')
+            self.assertEqual({recipe_id for recipe_id, _ in loaded.search('pasta')}, {'pasta', 'lasagna', 'soup'})
+            self.assertEqual(loaded.autocomplete('so'), ['soup'])
+            del loaded
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+from datetime import date
+import unittest
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.services.recommender import CoPlanRecommender, RecipeRecommender
+
+
+class TestRecommender(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up recipes sharing some of their ingredients
+        '''
+        self.user_id = ObjectId()
+
+        def recipe(title, names, category='parve'):
+            return Recipe(user_id=self.user_id, title=title,
+                          ingredients=[Ingredient(name=name, quantity='1 cup') for name in names],
+                          steps=['Mix well'], prep_time='10 minutes', category=category)
+
+        self.recipe = recipe
+        self.recipes = {
+            'pasta': recipe('Pasta', ['Pasta', 'Tomato', 'Basil', 'Olive oil']),
+            'salad': recipe('Salad', ['Tomato', 'Basil', 'Olive  oil', 'Lettuce']),
+            'pizza': recipe('Pizza', ['Flour', 'Tomato', 'Cheese'], 'dairy'),
+            'cake': recipe('Cake', ['Flour', 'Sugar', 'Eggs'], 'dairy'),
+        }
+
+    def test_similar_recipes(self) -> None:
+        '''
+        Tests that recipes are ranked by shared ingredients, leaving out the recipe itself.
+        '''
+        recommender = RecipeRecommender()
+        recommender.add_many(self.recipes.items())
+        similar = recommender.similar('pasta')
+        self.assertEqual([key for key, _ in similar], ['salad', 'pizza'])
+        self.assertAlmostEqual(similar[0][1], 3.25 / 4.25, places=5)
+        self.assertEqual([key for key, _ in recommender.similar('pizza', k=1)], ['cake'])
+        # A recipe that is not indexed is encoded with the known ingredients only
+        query = self.recipe('Bruschetta', ['Bread', 'Tomato', 'Basil'])
+        self.assertEqual([key for key, _ in recommender.similar(query, k=2)], ['salad', 'pasta'])
+        with self.assertRaises(ValueError):
+            recommender.similar('soup')
+
+    def test_incremental_updates(self) -> None:
+        '''
+        Tests that added, replaced and removed recipes are found the same before and after a merge.
+        '''
+        recommender = RecipeRecommender(merge_threshold=2)
+        recommender.add_many(self.recipes.items())
+        recommender.add('soup', self.recipe('Soup', ['Tomato', 'Basil', 'Water']))
+        self.assertEqual(recommender.similar('soup', k=2)[0][0], 'salad')
+        recommender.remove('salad')
+        recommender.add('pizza', self.recipe('Pizza', ['Flour', 'Sugar', 'Eggs'], 'dairy'))
+        self.assertNotIn('salad', recommender)
+        self.assertEqual(len(recommender), 4)
+        for _ in range(2):
+            self.assertEqual([key for key, _ in recommender.similar('soup')], ['pasta'])
+            [(key, score)] = recommender.similar('cake')
+            self.assertEqual(key, 'pizza')
+            self.assertAlmostEqual(score, 1.0, places=5)
+            recommender.merge()
+        with self.assertRaises(KeyError):
+            recommender.remove('salad')
+
+    def test_also_planned(self) -> None:
+        '''
+        Tests that recipes planned by the same users are suggested, most shared first.
+        '''
+        recommender = CoPlanRecommender()
+        pasta, salad, pizza, cake = self.recipes.values()
+        recommender.add_menus('dana', [Menu(self.user_id, date(2024, 5, 1), [pasta, salad]),
+                                       Menu(self.user_id, date(2024, 5, 2), [cake])])
+        recommender.add_menus('noa', [Menu(self.user_id, date(2024, 5, 1), [pasta, salad, pizza])])
+        recommender.add_menus('eli', [Menu(self.user_id, date(2024, 5, 1), [pizza, cake])])
+        recommender.add_menus('tal', [Menu(self.user_id, date(2024, 5, 3), [cake, pasta])])
+        self.assertEqual([key for key, _ in recommender.also_planned(pasta)], ['salad', 'cake', 'pizza'])
+        self.assertAlmostEqual(recommender.also_planned('pasta')[0][1], 2 / 6 ** 0.5, places=5)
+        self.assertEqual(recommender.also_planned('soup'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,219 @@
+from datetime import date, timedelta
+import unittest
+from bson import ObjectId
+import mongomock
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.models.user import User
+from app.repositories import MenuRepository, RecipeRepository, UserRepository
+
+
+class TestRepositories(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up repositories on an in-memory database
+        '''
+        self.database = mongomock.MongoClient().db
+        self.users = UserRepository(self.database)
+        self.recipes = RecipeRepository(self.database)
+        self.menus = MenuRepository(self.database)
+        for repository in (self.users, self.recipes, self.menus):
+            repository.ensure_indexes()
+
+        self.user_id = ObjectId()
+        self.recipe1 = Recipe(user_id=self.user_id, title='Pasta',
+                              ingredients=[Ingredient(name='Pastsa', quantity='100 gram')],
+                              steps=['Boil the water', 'Add pasta'], prep_time='10 minutes', category='parve')
+        self.recipe2 = Recipe(user_id=self.user_id, title='Cheese toast',
+                              ingredients=[Ingredient(name='Cheese', quantity='2 slices')],
+                              steps=['Toast'], prep_time='5 minutes', category='dairy')
+
+    def test_user_password_projection(self) -> None:
+        '''
+        Tests that users are read without their password unless it is asked for.
+        '''
+        user = User(user_email='user@example.com', user_password='GoodPassword12', user_name='User Example')
+        self.users.insert_many([user])
+        self.assertNotIn('user_password', self.users.find_by_email('user@example.com'))
+        self.assertEqual(self.users.find_by_email('user@example.com', include_password=True)['user_password'],
+                         'GoodPassword12')
+        self.assertEqual(len(self.users.list_users()), 1)
+
+    def test_insert_many_recipes_in_batches(self) -> None:
+        '''
+        Tests inserting more recipes than fit in one batch.
+        '''
+        recipes = [Recipe(user_id=self.user_id, title=f'Recipe {i}', ingredients=self.recipe1.ingredients)
+                   for i in range(25)]
+        ids = self.recipes._insert_documents((recipe.to_dict() for recipe in recipes), batch_size=10)
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(self.recipes.find_by_id(ids[3])['title'], 'Recipe 3')
+
+    def test_recipe_summary_projection(self) -> None:
+        '''
+        Tests that listing recipes leaves out ingredients and steps.
+        '''
+        self.recipes.insert_many([self.recipe1, self.recipe2])
+        summaries = self.recipes.list_by_user(self.user_id)
+        self.assertEqual([summary['title'] for summary in summaries], ['Cheese toast', 'Pasta'])
+        self.assertNotIn('steps', summaries[0])
+        self.assertNotIn('ingredients', summaries[0])
+        self.assertEqual(self.recipes.find_by_title(self.user_id, 'Pasta')['steps'], self.recipe1.steps)
+        recipe_id = self.recipes.find_by_title(self.user_id, 'Pasta')['_id']
+        self.assertEqual(self.recipes.find_recipe(recipe_id), self.recipe1)
+        self.assertIsNone(self.recipes.find_recipe(ObjectId()))
+
+    def test_upsert_many_recipes(self) -> None:
+        '''
+        Tests that upserting replaces recipes with the same user and title.
+        '''
+        self.assertEqual(self.recipes.upsert_many([self.recipe1, self.recipe2]), 2)
+        self.recipe1.prep_time = '12 minutes'
+        self.recipes.upsert_many([self.recipe1])
+        self.assertEqual(self.recipes.collection.count_documents({}), 2)
+        self.assertEqual(self.recipes.find_by_title(self.user_id, 'Pasta')['prep_time'], '12 minutes')
+
+    def test_replace_many_recipes(self) -> None:
+        '''
+        Tests that replacing by id keeps recipes with the same title apart.
+        '''
+        first_id, second_id = ObjectId(), ObjectId()
+        self.assertEqual(self.recipes.replace_many([(first_id, self.recipe1), (second_id, self.recipe1)]), 2)
+        self.recipe1.prep_time = '12 minutes'
+        self.recipes.replace_many([(first_id, self.recipe1)])
+        self.assertEqual(self.recipes.collection.count_documents({'title': 'Pasta'}), 2)
+        self.assertEqual(self.recipes.find_recipe(first_id).prep_time, '12 minutes')
+        self.assertNotEqual(self.recipes.find_recipe(second_id).prep_time, '12 minutes')
+
+    def test_menus(self) -> None:
+        '''
+        Tests saving menus and listing a date range without recipe details.
+        '''
+        today = date.today()
+        menus = [Menu(user_id=self.user_id, date=today + timedelta(days=day), recipes=[self.recipe1, self.recipe2])
+                 for day in range(5)]
+        self.assertEqual(self.menus.save_many(menus), 5)
+        menus[0].remove_recipe('Pasta')
+        self.menus.save(menus[0])
+        self.assertEqual(self.menus.collection.count_documents({}), 5)
+        self.assertEqual(self.menus.find(self.user_id, today)['recipes'], [self.recipe2.to_dict()])
+        self.assertEqual(self.menus.find_menu(self.user_id, today), menus[0])
+
+        listed = self.menus.list_for_user(self.user_id, today + timedelta(days=1), today + timedelta(days=3))
+        self.assertEqual([menu['date'] for menu in listed],
+                         [(today + timedelta(days=day)).isoformat() for day in range(1, 4)])
+        self.assertEqual(listed[0]['recipes'][0], {'title': 'Pasta', 'category': 'parve', 'prep_time': '10 minutes'})
+
+
+    def test_menu_save_changes(self) -> None:
+        '''
+        Tests storing menu changes as patches with versions, and rejecting stale versions.
+        '''
+        today = date.today()
+        menu = Menu(user_id=self.user_id, date=today, recipes=[self.recipe1])
+        self.menus.save(menu)
+        self.assertEqual(menu.version, 1)
+        self.assertFalse(self.menus.save_changes(menu))
+
+        menu.add_recipe(self.recipe2)
+        self.assertTrue(self.menus.save_changes(menu))
+        menu.remove_recipe('Pasta')
+        self.assertTrue(self.menus.save_changes(menu))
+        stored = self.menus.find(self.user_id, today)
+        self.assertEqual((stored['version'], stored['recipes']), (3, [self.recipe2.to_dict()]))
+        self.assertNotIn('changes', stored)
+
+        stale = Menu(user_id=self.user_id, date=today, recipes=[self.recipe2], version=2)
+        stale.add_recipe(self.recipe1)
+        with self.assertRaises(ValueError):
+            self.menus.save_changes(stale)
+
+        self.assertEqual(self.menus.changes_since(self.user_id, today, 1), {'version': 3, 'patch': [
+            {'op': 'add', 'path': '/recipes/-', 'value': self.recipe2.to_dict()},
+            {'op': 'remove', 'path': '/recipes/0'},
+        ]})
+        self.assertEqual(self.menus.changes_since(self.user_id, today, 3), {'version': 3, 'patch': []})
+        self.assertEqual(self.menus.changes_since(self.user_id, today, 0)['menu']['recipes'], [self.recipe2.to_dict()])
+        self.assertIsNone(self.menus.changes_since(self.user_id, today + timedelta(days=1), 0))
+
+    def test_menu_save_changes_to_unversioned_menu(self) -> None:
+        '''
+        Tests that menus stored without a version accept changes made at version 0.
+        '''
+        unversioned = Menu(user_id=self.user_id, date=date.today(), recipes=[self.recipe1])
+        self.menus.collection.insert_one(unversioned.to_dict())
+        menu = self.menus.find_menu(self.user_id, date.today())
+        menu.add_recipe(self.recipe2)
+        self.assertTrue(self.menus.save_changes(menu))
+        self.assertEqual(self.menus.find(self.user_id, date.today())['version'], 1)
+
+    def test_menu_recipe_references(self) -> None:
+        '''
+        Tests storing menus with references to the stored recipes instead of copies.
+        '''
+        menus = MenuRepository(self.database, embed_recipes=False)
+        recipe_id = self.recipes.insert(self.recipe1)
+        self.recipes.insert(self.recipe2)
+        menu = Menu(user_id=self.user_id, date=date.today(), recipes=[self.recipe1])
+        menus.save(menu)
+        menu.add_recipe(self.recipe2)
+        menus.save_changes(menu)
+
+        stored = menus.collection.find_one()
+        self.assertEqual(stored['recipes'][0], {'recipe_id': str(recipe_id), 'title': 'Pasta'})
+        self.assertEqual(menus.find_menu(self.user_id, date.today()), menu)
+        self.assertEqual(menus.find_menus(self.user_id), [menu])
+
+        menu.add_recipe(Recipe(user_id=self.user_id, title='Unsaved', ingredients=self.recipe1.ingredients))
+        with self.assertRaises(ValueError):
+            menus.save_changes(menu)
+
+    def test_menu_recipe_references_changes(self) -> None:
+        '''
+        Tests that removing referenced recipes removes them by position, and that the patches
+        hold the recipes the menu is read with.
+        '''
+        menus = MenuRepository(self.database, embed_recipes=False)
+        self.recipes.insert(self.recipe1)
+        self.recipes.insert(self.recipe2)
+        # A second stored recipe with the same title, only referenced by the stored menu
+        other_id = self.recipes.insert(Recipe(user_id=self.user_id, title='Pasta', description='Other',
+                                              ingredients=self.recipe1.ingredients))
+        today = date.today()
+        menus.save(Menu(user_id=self.user_id, date=today, recipes=[self.recipe1, self.recipe2]))
+        menus.collection.update_one({}, {'$push': {'recipes': {'recipe_id': str(other_id), 'title': 'Pasta'},
+                                                   'changes': {'version': 2, 'patch': []}},
+                                         '$inc': {'version': 1}})
+
+        menu = menus.find_menu(self.user_id, today)
+        self.assertEqual([recipe.description for recipe in menu.recipes], ['', '', 'Other'])
+        menu.remove_recipe('Pasta')
+        self.assertTrue(menus.save_changes(menu))
+        stored = menus.collection.find_one()
+        self.assertEqual([reference['title'] for reference in stored['recipes']], ['Cheese toast', 'Pasta'])
+        self.assertEqual(stored['recipes'][1]['recipe_id'], str(other_id))
+        self.assertEqual(menus.find_menu(self.user_id, today), menu)
+
+        menu.add_recipe(self.recipe1)
+        self.assertTrue(menus.save_changes(menu))
+        self.assertEqual(menus.changes_since(self.user_id, today, 2), {'version': 4, 'patch': [
+            {'op': 'remove', 'path': '/recipes/0'},
+            {'op': 'add', 'path': '/recipes/-', 'value': self.recipe1.to_dict()},
+        ]})
+
+        stale = menus.find_menu(self.user_id, today)
+        stale.version = 3
+        stale.remove_recipe('Cheese toast')
+        with self.assertRaises(ValueError):
+            menus.save_changes(stale)
+        self.assertEqual(menus.collection.find_one()['version'], 4)
+
+        # Positions in the patch no longer match the menu once a referenced recipe is deleted
+        self.recipes.delete(other_id)
+        self.assertEqual(menus.changes_since(self.user_id, today, 2)['menu']['recipes'],
+                         [self.recipe2.to_dict(), self.recipe1.to_dict()])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+from dataclasses import fields
+from datetime import date, timedelta
+import io
+import json
+import unittest
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.models.serializer import dump_many, iter_json, serialize_many
+
+
+class TestSerializer(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up a week of menus sharing recipes and ingredients
+        '''
+        ingredient1 = Ingredient(name='Pastsa', quantity='100 gram')
+        ingredient2 = Ingredient(name='Water', quantity='2 cups')
+        ingredient3 = Ingredient(name='Ketchop', quantity='1 Tbs')
+        self.recipe1 = Recipe(user_id=ObjectId(), title='Pasta', ingredients=[ingredient1, ingredient2],
+                              steps=['Boil the water', 'Add pasta'], prep_time='10 minutes', category='parve')
+        self.recipe2 = Recipe(user_id=ObjectId(), title='Pasta with ketchop "special"',
+                              description='Crème', ingredients=[ingredient1, ingredient2, ingredient3],
+                              steps=['Boil the water', 'add ketchop'], category='parve')
+        user_id = ObjectId()
+        self.menus = [
+            Menu(user_id=user_id, date=date.today() + timedelta(days=day),
+                 recipes=[self.recipe1, self.recipe2][:day % 3])
+            for day in range(7)
+        ]
+
+    def test_serialize_many(self) -> None:
+        '''
+        Tests that the batch dictionaries equal the to_dict output.
+        '''
+        self.assertEqual(serialize_many(self.menus), [menu.to_dict() for menu in self.menus])
+
+    def test_serialize_many_frozen_recipes(self) -> None:
+        '''
+        Tests that frozen recipes serialize like editable ones.
+        '''
+        frozen_menu = Menu(user_id=ObjectId(), date=date.today(), recipes=[self.recipe1.freeze()])
+        expected = Menu(user_id=frozen_menu.user_id, date=frozen_menu.date, recipes=[self.recipe1]).to_dict()
+        self.assertEqual(serialize_many([frozen_menu]), [expected])
+
+    def test_every_recipe_field(self) -> None:
+        '''
+        Tests that every field of a recipe is serialized as Recipe.to_dict serializes it.
+        '''
+        menu = Menu(user_id=ObjectId(), date=date.today(), recipes=[self.recipe2, self.recipe1.freeze()])
+        serialized, = serialize_many([menu])
+        streamed, = json.loads(''.join(iter_json([menu])))
+        for recipe, converted, decoded in zip(menu.recipes, serialized['recipes'], streamed['recipes']):
+            expected = recipe.to_dict()
+            self.assertEqual(set(converted), {field.name for field in fields(Recipe)})
+            for name in expected:
+                self.assertEqual(converted[name], expected[name], name)
+                self.assertEqual(decoded[name], json.loads(json.dumps(expected[name])), name)
+
+    def test_iter_json(self) -> None:
+        '''
+        Tests that the streamed JSON is byte-identical to json.dumps of the to_dict output.
+        '''
+        expected = json.dumps([menu.to_dict() for menu in self.menus])
+        self.assertEqual(''.join(iter_json(self.menus)), expected)
+        self.assertEqual(''.join(iter_json([])), json.dumps([]))
+
+    def test_dump_many(self) -> None:
+        '''
+        Tests writing the menus to a file object.
+        '''
+        buffer = io.StringIO()
+        dump_many(iter(self.menus), buffer)
+        self.assertEqual(buffer.getvalue(), json.dumps([menu.to_dict() for menu in self.menus]))
+
+    def test_generated_menus(self) -> None:
+        '''
+        Tests that menus whose recipes are freed once written keep their own recipes.
+        '''
+        user_id = ObjectId()
+
+        def menus():
+            for day in range(50):
+                recipe = Recipe(user_id=user_id, title=f'Recipe {day}',
+                                ingredients=[Ingredient(name='Water', quantity=f'{day} cups')])
+                yield Menu(user_id=user_id, date=date(2024, 1, 1) + timedelta(days=day), recipes=[recipe])
+
+        expected = json.dumps([menu.to_dict() for menu in menus()])
+        self.assertEqual(''.join(iter_json(menus())), expected)
+        buffer = io.StringIO()
+        dump_many(menus(), buffer)
+        self.assertEqual(buffer.getvalue(), expected)
+        self.assertEqual(serialize_many(menus()), json.loads(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+from unittest import mock
+import bcrypt
+import mongomock
+from app import create_app
+from app.models.user import User
+from app.repositories import UserRepository
+from app.services.sessions import SessionManager
+
+
+def hashed_user() -> User:
+    # Few bcrypt rounds keep the tests fast, check_password reads the rounds from the hash
+    password = bcrypt.hashpw(b'GoodPassword12', bcrypt.gensalt(rounds=4)).decode('utf-8')
+    return User(user_email='user@example.com', user_password=password, user_name='User Example')
+
+
+class TestSessionManager(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up a session manager on a fake clock
+        '''
+        self.now = 1000.0
+        self.sessions = SessionManager('secret', max_age=60, cache_size=2, timer=lambda: self.now)
+        self.user = hashed_user()
+
+    def test_login_checks_password_once(self) -> None:
+        '''
+        Tests that only login runs bcrypt, and later requests are served from the cache.
+        '''
+        self.assertIsNone(self.sessions.login(self.user, 'WrongPassword1'))
+        token = self.sessions.login(self.user, 'GoodPassword12')
+        with mock.patch('bcrypt.checkpw') as checkpw:
+            for _ in range(3):
+                session = self.sessions.authenticate(token)
+            checkpw.assert_not_called()
+        self.assertEqual(session.user_email, 'user@example.com')
+        self.assertEqual((self.sessions.stats.misses, self.sessions.stats.hits), (1, 2))
+
+    def test_invalid_tokens(self) -> None:
+        '''
+        Tests that tampered tokens and tokens signed with another key are rejected.
+        '''
+        token = self.sessions.issue('user@example.com')
+        self.assertIsNone(self.sessions.authenticate(token[:-2] + 'xx'))
+        self.assertIsNone(self.sessions.authenticate(''))
+        self.assertIsNone(SessionManager('other secret').authenticate(token))
+        with self.assertRaises(ValueError):
+            SessionManager('')
+
+    def test_expiry(self) -> None:
+        '''
+        Tests that tokens expire after max_age, whether cached or not.
+        '''
+        cached, uncached = self.sessions.issue('a@example.com'), self.sessions.issue('b@example.com')
+        self.assertIsNotNone(self.sessions.authenticate(cached))
+        self.now += 60
+        self.assertIsNone(self.sessions.authenticate(cached))
+        self.assertIsNone(self.sessions.authenticate(uncached))
+        self.assertEqual(self.sessions.stats.expirations, 1)
+
+    def test_revocation(self) -> None:
+        '''
+        Tests revoking one session, and all sessions of a user issued before the revocation.
+        '''
+        first, second = self.sessions.issue('user@example.com'), self.sessions.issue('user@example.com')
+        self.assertTrue(self.sessions.revoke(first))
+        self.assertFalse(self.sessions.revoke(first))
+        self.assertIsNone(self.sessions.authenticate(first))
+        self.assertIsNotNone(self.sessions.authenticate(second))
+
+        self.sessions.revoke_user('user@example.com')
+        self.assertIsNone(self.sessions.authenticate(second))
+        self.assertEqual(self.sessions.stats.invalidations, 2)
+        self.now += 1
+        self.assertIsNotNone(self.sessions.authenticate(self.sessions.issue('user@example.com')))
+
+    def test_eviction(self) -> None:
+        '''
+        Tests that the cache keeps the most recently used tokens, evicted tokens are verified again.
+        '''
+        tokens = [self.sessions.issue(f'user{i}@example.com') for i in range(3)]
+        for token in tokens:
+            self.sessions.authenticate(token)
+        self.assertEqual(self.sessions.stats.evictions, 1)
+        self.assertIsNotNone(self.sessions.authenticate(tokens[0]))
+        self.assertEqual(self.sessions.stats.misses, 4)
+
+
+class TestSessionApi(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up an app with a stored user
+        '''
+        database = mongomock.MongoClient().db
+        UserRepository(database).insert_many([hashed_user()])
+        self.client = create_app({'MONGO_DATABASE': database, 'SECRET_KEY': 'secret'}).test_client()
+
+    def test_login_me_logout(self) -> None:
+        '''
+        Tests logging in, reading the user with the token, and logging out.
+        '''
+        credentials = {'user_email': 'user@example.com', 'user_password': 'WrongPassword1'}
+        self.assertEqual(self.client.post('/sessions', json=credentials).status_code, 401)
+        credentials['user_password'] = 'GoodPassword12'
+        response = self.client.post('/sessions', json=credentials)
+        self.assertEqual(response.status_code, 201)
+        headers = {'Authorization': f'Bearer {response.get_json()["token"]}'}
+
+        self.assertEqual(self.client.get('/me', headers=headers).get_json()['user_name'], 'User Example')
+        self.assertNotIn('user_password', self.client.get('/me', headers=headers).get_json())
+        self.assertEqual(self.client.delete('/sessions', headers=headers).status_code, 204)
+        self.assertEqual(self.client.get('/me', headers=headers).status_code, 401)
+        self.assertEqual(self.client.get('/me').status_code, 401)
+        self.assertEqual(self.client.post('/sessions', json={'user_email': 'nobody@example.com'}).status_code, 401)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+from datetime import date
+import unittest
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.services.shopping_list import ShoppingItem, build_shopping_list
+
+
+class TestShoppingList(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up menus over three days sharing a recipe
+        '''
+        user_id = ObjectId()
+        self.pasta = Recipe(user_id=user_id, title='Pasta', ingredients=[
+            Ingredient(name='Pastsa', quantity='100 gram'),
+            Ingredient(name='Water', quantity='2 cups'),
+            Ingredient(name='Salt', quantity='a pinch'),
+        ])
+        self.ketchup_pasta = Recipe(user_id=user_id, title='Pasta with ketchop', ingredients=[
+            Ingredient(name='pastsa', quantity='0.2 kg'),
+            Ingredient(name='Ketchop', quantity='1 Tbs'),
+            Ingredient(name='Ketchop', quantity='2 tsp'),
+            Ingredient(name='Bread', quantity='2 slices'),
+        ])
+        self.menus = [
+            Menu(user_id=user_id, date=date(2024, 5, 1), recipes=[self.pasta]),
+            Menu(user_id=user_id, date=date(2024, 5, 2), recipes=[self.pasta, self.ketchup_pasta]),
+            Menu(user_id=user_id, date=date(2024, 5, 3), recipes=[self.ketchup_pasta]),
+        ]
+
+    def test_build_shopping_list(self) -> None:
+        '''
+        Tests summing the ingredients of all menus by name and unit.
+        '''
+        shopping_list = build_shopping_list(self.menus)
+        self.assertEqual(shopping_list.items, [
+            ShoppingItem('Bread', 4.0, 'slice'),
+            ShoppingItem('Ketchop', 50.0, 'ml'),
+            ShoppingItem('Pastsa', 600.0, 'gram'),
+            ShoppingItem('Water', 960.0, 'ml'),
+        ])
+        self.assertEqual(shopping_list.unparsed, {'Salt': ['a pinch', 'a pinch']})
+
+    def test_build_shopping_list_date_range(self) -> None:
+        '''
+        Tests that only menus in the date range are included.
+        '''
+        shopping_list = build_shopping_list(self.menus, start=date(2024, 5, 3), end=date(2024, 5, 31))
+        self.assertEqual([(item.name, item.amount) for item in shopping_list.items],
+                         [('Bread', 2.0), ('Ketchop', 25.0), ('pastsa', 200.0)])
+        self.assertEqual(shopping_list.unparsed, {})
+        self.assertEqual(build_shopping_list(self.menus, end=date(2024, 4, 30)).items, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -92,6 +92,13 @@ class TestUserModel(unittest.TestCase):
         self.assertEqual(user_dict['user_name'], 'User Example')
         self.assertNotIn('user_password', user_dict)
 
+    def test_from_dict(self) -> None:
+        '''
+        Test that a User is recreated from its dictionary, with or without the password.
+        '''
+        self.assertEqual(User.from_dict(self.user.to_dict(exclude_password=False)), self.user)
+        self.assertEqual(User.from_dict(self.user.to_dict()).user_password, '')
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
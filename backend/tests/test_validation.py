@@ -0,0 +1,103 @@
+from dataclasses import asdict, fields
+from datetime import date
+import unittest
+from bson import ObjectId
+from app.models.ingredient import Ingredient
+from app.models.menu import Menu
+from app.models.recipe import Recipe
+from app.models.user import User
+from app.models.validation import is_valid_object_id, validate_many
+
+
+class TestValidation(unittest.TestCase):
+    def setUp(self) -> None:
+        '''
+        Set up a valid recipe, menu and user
+        '''
+        self.recipe = Recipe(user_id=ObjectId(), title='Pasta', ingredients=[Ingredient(name='Water', quantity='1 cup')])
+        self.menu = Menu(user_id=ObjectId(), date=date.today(), recipes=[self.recipe])
+        self.user = User(user_email='user@example.com', user_password='GoodPassword12', user_name='User Example')
+
+    def test_is_valid_object_id(self) -> None:
+        '''
+        Tests checking ObjectIds and ObjectId strings.
+        '''
+        self.assertTrue(is_valid_object_id(ObjectId()))
+        self.assertTrue(is_valid_object_id(str(ObjectId())))
+        self.assertFalse(is_valid_object_id('invalid'))
+        self.assertFalse(is_valid_object_id(['unhashable']))
+
+    def test_validate_many(self) -> None:
+        '''
+        Tests that a batch reports every error of every invalid item.
+        '''
+        invalid_recipe = Recipe(user_id='invalid', title='', category='vegan')
+        invalid_user = User(user_email='invalid', user_password='short', user_name='')
+        reports = validate_many([self.recipe, invalid_recipe, self.menu, invalid_user, Ingredient(name='', quantity='')])
+        self.assertEqual([report.index for report in reports], [1, 3, 4])
+        self.assertIs(reports[0].item, invalid_recipe)
+        self.assertEqual(reports[0].errors, ['Invalid ObjectId: invalid', 'Title cannot be empty.',
+                                             'Invalid category: vegan', 'Ingredients list cannot be empty.'])
+        self.assertEqual(reports[1].errors, ['Invalid email format.', 'Password must be at least 8 characters long.',
+                                             'Password must contain at least one number.'])
+        self.assertEqual(len(reports[2].errors), 2)
+        self.assertEqual(validate_many([]), [])
+
+    def test_revalidate_after_change(self) -> None:
+        '''
+        Tests that changing an attribute of a validated object validates it again.
+        '''
+        for item in (self.recipe, self.menu, self.user):
+            item.validate()
+        self.recipe.category = 'vegan'
+        self.menu.user_id = 'invalid'
+        self.user.user_password = 'password'
+        reports = validate_many([self.recipe, self.menu, self.user])
+        self.assertEqual([report.errors for report in reports], [
+            ['Invalid category: vegan'],
+            ['Invalid ObjectId: invalid'],
+            ['Password must contain at least one number.'],
+        ])
+
+    def test_lists_checked_after_change_in_place(self) -> None:
+        '''
+        Tests that emptying a validated object's list in place is still caught.
+        '''
+        self.recipe.validate()
+        self.menu.validate()
+        self.recipe.ingredients.clear()
+        self.menu.recipes.clear()
+        with self.assertRaises(ValueError):
+            self.recipe.validate()
+        with self.assertRaises(ValueError):
+            self.menu.validate()
+
+    def test_frozen_models(self) -> None:
+        '''
+        Tests that frozen models are validated in a batch too.
+        '''
+        frozen = Recipe(user_id=ObjectId(), title='', ingredients=[Ingredient(name='', quantity='1')]).freeze()
+        reports = validate_many([frozen, frozen.ingredients[0]])
+        self.assertEqual([report.errors for report in reports],
+                         [['Title cannot be empty.'], ['Ingredient name cannot be empty.']])
+
+    def test_models_keep_no_validation_state(self) -> None:
+        '''
+        Tests that validation leaves the models' fields and slots as they were.
+        '''
+        self.recipe.validate()
+        self.assertEqual([field.name for field in fields(Ingredient)], ['name', 'quantity'])
+        self.assertNotIn('_validated', Recipe.__slots__)
+        self.assertEqual(set(asdict(self.user)), {'user_email', 'user_password', 'user_name'})
+        self.assertNotIn('_validated', asdict(self.recipe))
+
+    def test_menu_without_user_id(self) -> None:
+        '''
+        Tests that a menu without a user_id is invalid.
+        '''
+        self.assertEqual(list(Menu(user_id=None, date=date.today(), recipes=[self.recipe]).iter_errors()),
+                         ['Invalid ObjectId: None'])
+
+
+if __name__ == '__main__':
+    unittest.main()